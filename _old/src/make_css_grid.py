@@ -5,12 +5,32 @@ The script takes a CellGrid and generates an HTML file where:
 1. Each node becomes a named grid area
 2. The grid layout matches the CellGrid structure
 3. Each node's content is displayed in its grid area
+
+Run without arguments to convert the simple example, or pass directories/globs of .canvas files
+to convert them all in parallel: `python make_css_grid.py canvases/ --workers 8`
 """
 
 from make_grid_from_json import make_grid_from_json
 from cell_grid import CellGrid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+import argparse
+import glob
 import re
 import os
+import signal
+import sys
+import time
+import traceback
+
+# The layout cache lives with the new classes, at the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.classes.layout_cache import LayoutCache
+
+# Part of the cache key: bump when the output of this pipeline changes
+CACHE_OPTIONS = {'pipeline': 'make_css_grid', 'version': 1}
+# Seconds one file of a batch may take before it is given up (the edge loop retries until it fits)
+DEFAULT_TIMEOUT = 300
 
 def sanitize_area_name(content: str) -> str:
     """Convert node content to a valid CSS grid area name.
@@ -97,18 +117,45 @@ def generate_html(grid: CellGrid) -> str:
     
     return html
 
-def main():
+def convert_canvas(grid_path: str, output_path: str, verbose: bool = False, cache: LayoutCache | None = None) -> bool:
+    """Convert one .canvas file to an HTML file at output_path.
+
+    With verbose, the grid is printed after placing nodes, adding edges and purging.
+    With a cache, an unchanged canvas gets the HTML of its first conversion without being laid out
+    again. Returns whether it came from the cache.
+    """
+    with open(grid_path, 'r') as f:
+        canvas_json = f.read()
+    key = None
+    if cache is not None:
+        key = LayoutCache.key(canvas_json, CACHE_OPTIONS)
+        cached = cache.get(key)
+        if cached is not None:
+            _write_html(output_path, cached.html)
+            return True
+
+    html = _layout_canvas(grid_path, canvas_json, verbose)
+    _write_html(output_path, html)
+    if cache is not None:
+        # This pipeline has no ObjectManager, so there is no layout JSON to keep
+        cache.put(key, None, html)
+    return False
+
+def _write_html(output_path: str, html: str):
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w") as f:
+        f.write(html)
+
+def _layout_canvas(grid_path: str, canvas_json: str, verbose: bool) -> str:
     from pyjsoncanvas import Canvas
-    import logging
     import random
 
-    grid_path = "data/json-diagrams/simple.canvas"
-    with open(grid_path, 'r') as f:
-        canvas = Canvas.from_json(f.read())
+    canvas = Canvas.from_json(canvas_json)
 
     grid = make_grid_from_json(grid_path)
-    print("Initial grid:")
-    print(grid.render_with_named_nodes())
+    if verbose:
+        print("Initial grid:")
+        print(grid.render_with_named_nodes())
 
     # Build a mapping from node id to GridNode
     id_to_gridnode = {}
@@ -145,22 +192,136 @@ def main():
         else:
             grid.logger.log_grid_operation(f"Could not find nodes for edge: {from_id} -> {to_id}", grid)
 
-    print("\nGrid after adding edges:")
-    print(grid.render_with_named_nodes())
+    if verbose:
+        print("\nGrid after adding edges:")
+        print(grid.render_with_named_nodes())
 
     # Now purge redundant rows/columns after all edges are drawn
     grid.purge_redundant_columns()
     grid.purge_redundant_rows()
     
-    print("\nFinal grid after purging:")
-    print(grid.render_with_named_nodes())
-
-    html = generate_html(grid)
-    output_dir = "html_output"
-    os.makedirs(output_dir, exist_ok=True)
-    grid_name = os.path.splitext(os.path.basename(grid_path))[0]
-    with open(os.path.join(output_dir, f"{grid_name}.html"), "w") as f:
-        f.write(html)
+    if verbose:
+        print("\nFinal grid after purging:")
+        print(grid.render_with_named_nodes())
+
+    return generate_html(grid)
+
+@dataclass
+class ConversionResult:
+    """Outcome of converting one canvas in a batch."""
+    canvas_path: str
+    output_path: str
+    seconds: float
+    error: str | None = None
+    cached: bool = False
+
+def find_canvas_files(inputs: list[str]) -> list[str]:
+    """All .canvas files in the given directories (recursively) and matching the given globs."""
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            paths.extend(glob.glob(os.path.join(pattern, "**", "*.canvas"), recursive=True))
+        else:
+            paths.extend(glob.glob(pattern, recursive=True))
+    return sorted(set(paths))
+
+def _output_paths(canvas_paths: list[str], output_dir: str) -> list[str]:
+    # Keep the directory structure below the common parent, so equal file names don't collide
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in canvas_paths])
+    return [
+        os.path.join(output_dir, os.path.splitext(os.path.relpath(os.path.abspath(p), root))[0] + ".html")
+        for p in canvas_paths
+    ]
+
+class ConversionTimeout(Exception):
+    """Raised in a worker when its file took longer than the batch timeout."""
+
+def _raise_timeout(signum, frame):
+    raise ConversionTimeout()
+
+def _convert_timed(canvas_path: str, output_path: str, cache_dir: str | None, timeout: float | None = None) -> ConversionResult:
+    # Runs in a worker process; failures are returned, not raised, so the batch goes on.
+    # The timeout interrupts the conversion with SIGALRM, which frees the worker for the next file.
+    start = time.perf_counter()
+    cached = False
+    if timeout is not None:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        cache = LayoutCache(cache_dir) if cache_dir is not None else None
+        cached = convert_canvas(canvas_path, output_path, cache=cache)
+        error = None
+    except ConversionTimeout:
+        error = f"Timed out after {timeout}s"
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        if timeout is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+    return ConversionResult(canvas_path, output_path, time.perf_counter() - start, error, cached)
+
+def batch_convert(inputs: list[str], output_dir: str = "html_output", workers: int | None = None, cache_dir: str | None = None, timeout: float | None = DEFAULT_TIMEOUT) -> list[ConversionResult]:
+    """Convert every .canvas file found in inputs (directories or globs) to HTML in output_dir.
+
+    Files are spread over a process pool of `workers` processes (default: one per CPU).
+    Each file is reported with its time when it is done; a failing file is reported with its
+    error and doesn't stop the others. A file still converting after `timeout` seconds is
+    stopped and reported as failed, its worker goes on with the next file (None: no limit;
+    needs SIGALRM, so not on Windows). With a cache_dir (see `LayoutCache`), unchanged canvases
+    are served from the cache. Returns the results in input order.
+    """
+    canvas_paths = find_canvas_files(inputs)
+    if not canvas_paths:
+        return []
+    output_paths = _output_paths(canvas_paths, output_dir)
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_convert_timed, canvas_path, output_path, cache_dir, timeout): (canvas_path, output_path)
+            for canvas_path, output_path in zip(canvas_paths, output_paths)
+        }
+        for future in as_completed(futures):
+            canvas_path, output_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. BrokenProcessPool), so there is no timing
+                result = ConversionResult(canvas_path, output_path, 0.0, repr(e))
+            results[canvas_path] = result
+            if result.error is None:
+                status = "cached" if result.cached else "ok"
+                print(f"{status:<6}{result.seconds:8.3f}s  {canvas_path} -> {output_path}")
+            else:
+                print(f"FAIL  {result.seconds:8.3f}s  {canvas_path}\n{result.error}", file=sys.stderr)
+    ordered = [results[path] for path in canvas_paths]
+    failed = sum(result.error is not None for result in ordered)
+    total = sum(result.seconds for result in ordered)
+    cached = sum(result.cached for result in ordered)
+    print(f"{len(ordered) - failed} converted ({cached} from cache), {failed} failed, {total:.3f}s of conversion time")
+    return ordered
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert Obsidian .canvas files to HTML with CSS grid.")
+    parser.add_argument("inputs", nargs="*", help="directories and/or glob patterns of .canvas files (default: the simple example, verbosely)")
+    parser.add_argument("--output-dir", default="html_output")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--cache-dir", default=None, help="serve unchanged canvases from this layout cache")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help=f"seconds per file before it is given up (default: {DEFAULT_TIMEOUT}, 0: no limit)")
+    args = parser.parse_args()
+
+    if not args.inputs:
+        grid_path = "data/json-diagrams/simple.canvas"
+        grid_name = os.path.splitext(os.path.basename(grid_path))[0]
+        cache = LayoutCache(args.cache_dir) if args.cache_dir is not None else None
+        convert_canvas(grid_path, os.path.join(args.output_dir, f"{grid_name}.html"), verbose=True, cache=cache)
+        return
+
+    results = batch_convert(args.inputs, args.output_dir, args.workers, args.cache_dir, args.timeout or None)
+    if not results:
+        sys.exit(f"No .canvas files found in {args.inputs}")
+    if any(result.error is not None for result in results):
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,57 @@
+import os
+import make_css_grid
+from make_css_grid import find_canvas_files, _output_paths, _convert_timed, batch_convert
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("{}")
+    return str(path)
+
+def fake_convert(canvas_path, output_path, verbose=False, cache=None):
+    # Stands in for the real layout: hangs, fails or writes a page depending on the file name
+    name = os.path.basename(canvas_path)
+    if name.startswith("stuck"):
+        while True:
+            pass
+    if name.startswith("broken"):
+        raise ValueError("broken canvas")
+    make_css_grid._write_html(output_path, "<html></html>")
+    return False
+
+def test_find_canvas_files(tmp_path):
+    a = touch(tmp_path / "a" / "x.canvas")
+    b = touch(tmp_path / "a" / "sub" / "y.canvas")
+    c = touch(tmp_path / "c" / "z.canvas")
+    touch(tmp_path / "a" / "notes.md")
+    # Directories are searched recursively, globs as given, and every file is listed once
+    found = find_canvas_files([str(tmp_path / "a"), str(tmp_path / "c" / "*.canvas"), a])
+    assert found == sorted([a, b, c])
+    assert find_canvas_files([str(tmp_path / "missing")]) == []
+
+def test_output_paths_keep_the_structure(tmp_path):
+    paths = [str(tmp_path / "a" / "x.canvas"), str(tmp_path / "b" / "x.canvas"), str(tmp_path / "b" / "deeper" / "y.canvas")]
+    assert _output_paths(paths, "out") == [
+        os.path.join("out", "a", "x.html"),
+        os.path.join("out", "b", "x.html"),
+        os.path.join("out", "b", "deeper", "y.html"),
+    ]
+
+def test_timeout_stops_a_stuck_conversion(tmp_path, monkeypatch):
+    monkeypatch.setattr(make_css_grid, "convert_canvas", fake_convert)
+    canvas_path = touch(tmp_path / "stuck.canvas")
+    result = _convert_timed(canvas_path, str(tmp_path / "stuck.html"), None, timeout=0.2)
+    assert result.error == "Timed out after 0.2s"
+    assert result.seconds < 5
+
+def test_failures_do_not_stop_the_batch(tmp_path, monkeypatch):
+    # The workers are forked, so they convert with fake_convert as well
+    monkeypatch.setattr(make_css_grid, "convert_canvas", fake_convert)
+    paths = [touch(tmp_path / "in" / f"{name}.canvas") for name in ("broken", "good", "stuck", "zz_good")]
+    results = batch_convert([str(tmp_path / "in")], str(tmp_path / "out"), workers=2, timeout=0.5)
+    assert [result.canvas_path for result in results] == paths
+    broken, good, stuck, last = results
+    assert "ValueError: broken canvas" in broken.error
+    assert stuck.error == "Timed out after 0.5s"
+    assert good.error is None and last.error is None
+    assert os.path.exists(good.output_path) and os.path.exists(last.output_path)
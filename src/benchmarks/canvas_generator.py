@@ -0,0 +1,102 @@
+"""Seeded generators for synthetic diagrams in the `src/tests/data` JSON format.
+
+Nodes are placed on a lattice (every `spacing` cells), which always leaves room for
+attachment points and breathing space between neighbors. Edges are then routed with
+`ObjectManager.draw_edges`, so the result is a valid diagram; edges that can't be
+routed are dropped.
+"""
+import os
+import sys
+import json
+import random
+import argparse
+
+# Same path setup as conftest.py, so this runs as a plain script
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+from src.classes.object_manager import ObjectManager
+from src.classes.node import Node
+from src.classes.edge import EdgeSpec
+
+# Lattice spacing: 3 is the tightest that leaves an attachment point plus breathing space
+LAYOUT_SPACING = {'dense': 3, 'sparse': 6}
+# How many lattice steps apart the two nodes of an edge may be
+EDGE_LENGTH_STEPS = {'short': (1, 2), 'mixed': (1, 8), 'long': (6, 20)}
+
+def node_id(index: int) -> str:
+    # a, b, ..., z, aa, ab, ... so ids stay compatible with the txt format
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('a') + remainder) + letters
+    return letters
+
+def generate_canvas(num_nodes: int, layout: str = 'sparse', edge_length: str = 'short', edges_per_node: float = 0.5, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    spacing = LAYOUT_SPACING[layout]
+    lattice_size = 1
+    while lattice_size * lattice_size < num_nodes:
+        lattice_size += 1
+
+    obj_manager = ObjectManager()
+    # Shuffle lattice slots, so dense/sparse refers to the spacing, not to which slots get used
+    slots = [(r, c) for r in range(lattice_size) for c in range(lattice_size)]
+    rng.shuffle(slots)
+    slots = sorted(slots[:num_nodes])
+    nodes_by_slot = {}
+    for index, (r, c) in enumerate(slots):
+        node = Node(id=node_id(index), row=1 + r * spacing, col=1 + c * spacing, width=1, height=1)
+        obj_manager.add_node(node)
+        nodes_by_slot[(r, c)] = node
+
+    min_steps, max_steps = EDGE_LENGTH_STEPS[edge_length]
+    specs = []
+    for _ in range(int(num_nodes * edges_per_node)):
+        sender_slot = rng.choice(slots)
+        dr = rng.randint(-max_steps, max_steps)
+        dc = rng.randint(-max_steps, max_steps)
+        if max(abs(dr), abs(dc)) < min_steps:
+            continue
+        receiver = nodes_by_slot.get((sender_slot[0] + dr, sender_slot[1] + dc))
+        if receiver is None:
+            continue
+        sender = nodes_by_slot[sender_slot]
+        specs.append(EdgeSpec(
+            sender_node=sender,
+            receiver_node=receiver,
+            sender_attachment_point=_attachment_point_towards(sender, receiver),
+            receiver_attachment_point=_attachment_point_towards(receiver, sender),
+            has_arrow_receiver=rng.random() < 0.5
+        ))
+    obj_manager.draw_edges(specs, order='shortest_first')
+    return obj_manager.export_to_JSON()
+
+def _attachment_point_towards(node: Node, other: Node) -> tuple[int, int]:
+    dr = other.row - node.row
+    dc = other.col - node.col
+    if abs(dr) >= abs(dc):
+        return (node.row + (1 if dr > 0 else -1), node.col)
+    return (node.row, node.col + (1 if dc > 0 else -1))
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic diagram as JSON")
+    parser.add_argument('num_nodes', type=int)
+    parser.add_argument('--layout', choices=sorted(LAYOUT_SPACING), default='sparse')
+    parser.add_argument('--edge-length', choices=sorted(EDGE_LENGTH_STEPS), default='short')
+    parser.add_argument('--edges-per-node', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='-')
+    args = parser.parse_args()
+
+    canvas = generate_canvas(args.num_nodes, args.layout, args.edge_length, args.edges_per_node, args.seed)
+    if args.output == '-':
+        json.dump(canvas, sys.stdout, indent=4)
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(canvas, f, indent=4)
+
+if __name__ == "__main__":
+    main()
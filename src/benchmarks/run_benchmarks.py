@@ -0,0 +1,172 @@
+"""Benchmarks for the `src/classes` pipeline on synthetic diagrams.
+
+For every size/layout/edge length combination a diagram is generated (seeded, see
+`canvas_generator.py`), then every stage is run once for wall time and once under
+tracemalloc for peak memory. Results are written as JSON, so runs on different
+commits can be compared.
+
+    python src/benchmarks/run_benchmarks.py --sizes 10 100 1000 --output bench.json
+"""
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import subprocess
+import tracemalloc
+from datetime import datetime
+from collections import deque
+
+from canvas_generator import generate_canvas, ROOT_DIR, LAYOUT_SPACING, EDGE_LENGTH_STEPS
+from src.classes.object_manager import ObjectManager
+from src.classes.grid import ROUTING_BACKENDS, ROUTING_DIRECTIONS, ROUTING_ORDER
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+# Number of routing queries timed per diagram
+ROUTING_QUERIES = 50
+# Extra cost of crossing an edge, for the routing stage that allows crossings
+ROUTING_CROSSING_COST = 3
+
+def route_with_bfs(grid, start: tuple[int, int], end: tuple[int, int], start_dir: str, end_dir: str) -> list[tuple[int, int]]:
+    # The breadth-first search find_manhattan_path_with_forced_ends used before A*, as the baseline
+    # for the routing stages (shortest path in steps, copying the path into every queued cell)
+    dr, dc = ROUTING_DIRECTIONS[start_dir]
+    first = (start[0] + dr, start[1] + dc)
+    if not (0 <= first[0] < grid.height and 0 <= first[1] < grid.width and grid.is_cell_empty(first[0], first[1])):
+        return []
+    dr, dc = ROUTING_DIRECTIONS[end_dir]
+    pre_end = (end[0] + dr, end[1] + dc)
+    if not (0 <= pre_end[0] < grid.height and 0 <= pre_end[1] < grid.width and grid.is_cell_empty(pre_end[0], pre_end[1])):
+        return []
+    queue = deque([(first, [start, first])])
+    visited = {first}
+    while queue:
+        (r, c), path = queue.popleft()
+        if (r, c) == pre_end:
+            return path + [end]
+        for dir_name in ROUTING_ORDER:
+            dr, dc = ROUTING_DIRECTIONS[dir_name]
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < grid.height and 0 <= nc < grid.width and grid.is_cell_empty(nr, nc) and (nr, nc) not in visited:
+                visited.add((nr, nc))
+                queue.append(((nr, nc), path + [(nr, nc)]))
+    return []
+
+def make_stages(canvas: dict, seed: int) -> list[tuple[str, callable]]:
+    obj_manager = ObjectManager.create_from_JSON(canvas)
+    grid = obj_manager.make_grid()
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(ROUTING_QUERIES if len(obj_manager.nodes) > 1 else 0):
+        sender, receiver = rng.sample(obj_manager.nodes, 2)
+        sender_points = obj_manager.get_valid_attachment_points(sender)
+        receiver_points = obj_manager.get_valid_attachment_points(receiver)
+        if sender_points and receiver_points:
+            sender_point = rng.choice(sender_points)
+            receiver_point = rng.choice(receiver_points)
+            queries.append((
+                sender_point, receiver_point,
+                obj_manager._get_direction_from_node_to_point(sender, sender_point),
+                obj_manager._get_direction_from_node_to_point(receiver, receiver_point)
+            ))
+
+    def get_all_attachment_points():
+        # Cold: computed for every node (later calls are answered from the cache)
+        obj_manager._attachment_points.clear()
+        return [obj_manager.get_valid_attachment_points(node) for node in obj_manager.nodes]
+
+    def route_all():
+        for start, end, start_dir, end_dir in queries:
+            grid.find_manhattan_path_with_forced_ends(start, end, start_dir, end_dir)
+
+    def route_all_with_bfs():
+        for start, end, start_dir, end_dir in queries:
+            route_with_bfs(grid, start, end, start_dir, end_dir)
+
+    def route_all_with_crossings():
+        for start, end, start_dir, end_dir in queries:
+            grid.find_manhattan_path_with_forced_ends(start, end, start_dir, end_dir, crossing_cost=ROUTING_CROSSING_COST)
+
+    def route_all_with(backend: str):
+        def route():
+            for start, end, start_dir, end_dir in queries:
+                grid.find_manhattan_path_with_forced_ends(start, end, start_dir, end_dir, backend=backend)
+        return route
+
+    return [
+        ('create_from_JSON', lambda: ObjectManager.create_from_JSON(canvas)),
+        ('make_grid', obj_manager.make_grid),
+        ('get_valid_attachment_points', get_all_attachment_points),
+        ('get_valid_attachment_points_cached', lambda: [obj_manager.get_valid_attachment_points(node) for node in obj_manager.nodes]),
+        ('find_manhattan_path_bfs_baseline', route_all_with_bfs),
+        ('find_manhattan_path_with_forced_ends', route_all),
+        ('find_manhattan_path_with_crossings', route_all_with_crossings),
+        *[(f'find_manhattan_path_{backend}', route_all_with(backend)) for backend in ROUTING_BACKENDS if backend != 'astar'],
+        ('export_to_txt', grid.export_to_txt),
+    ]
+
+def measure(stage: callable, with_memory: bool) -> dict:
+    start = time.perf_counter()
+    stage()
+    result = {'seconds': time.perf_counter() - start}
+    if with_memory:
+        tracemalloc.start()
+        stage()
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(sizes: list[int], layouts: list[str], edge_lengths: list[str], seed: int, with_memory: bool) -> dict:
+    results = []
+    for num_nodes in sizes:
+        for layout in layouts:
+            for edge_length in edge_lengths:
+                start = time.perf_counter()
+                canvas = generate_canvas(num_nodes, layout, edge_length, seed=seed)
+                generate_seconds = time.perf_counter() - start
+                case = {
+                    'nodes': num_nodes,
+                    'edges': len(canvas['edges']),
+                    'layout': layout,
+                    'edge_length': edge_length,
+                    'seed': seed,
+                }
+                results.append({**case, 'stage': 'generate', 'seconds': generate_seconds})
+                for name, stage in make_stages(canvas, seed):
+                    measurement = measure(stage, with_memory)
+                    results.append({**case, 'stage': name, **measurement})
+                    print(f"{num_nodes:>7} {layout:<6} {edge_length:<5} {name:<38} {measurement['seconds']:.4f}s", file=sys.stderr)
+    return {
+        'meta': {
+            'commit': get_commit(),
+            'python': platform.python_version(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the src/classes pipeline on synthetic diagrams")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--layouts', nargs='+', choices=sorted(LAYOUT_SPACING), default=sorted(LAYOUT_SPACING))
+    parser.add_argument('--edge-lengths', nargs='+', choices=sorted(EDGE_LENGTH_STEPS), default=['short', 'long'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc runs")
+    parser.add_argument('--output', default='bench_results.json')
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.layouts, args.edge_lengths, args.seed, not args.no_memory)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+
+if __name__ == "__main__":
+    main()
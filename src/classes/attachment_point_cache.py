@@ -0,0 +1,46 @@
+class AttachmentPointCache:
+    """Valid attachment points per node, computed on first use and kept until they can have changed.
+
+    Whether a cell is a valid attachment point only depends on the cells one and two steps out
+    from the node (the point and its breathing space). The `Grid` reports every changed rectangle
+    (see `Grid.add_change_listener`), and only the nodes with a cell within two cells of it are
+    dropped, found via the occupant raster. Inserting or deleting lines inside the grid moves
+    cells, so that drops everything.
+    """
+
+    # How far out from a node the cells its attachment points depend on reach
+    RING = 2
+
+    def __init__(self, grid, compute):
+        # compute(node) -> list of the node's valid attachment points on grid
+        self._grid = grid
+        self._compute = compute
+        # node id -> attachment points
+        self._points = {}
+        grid.add_change_listener(self)
+
+    def __contains__(self, node_id) -> bool:
+        return str(node_id) in self._points
+
+    def get(self, node) -> list[tuple[int, int]]:
+        key = str(node.id)
+        points = self._points.get(key)
+        if points is None:
+            points = self._points[key] = self._compute(node)
+        return list(points)
+
+    def invalidate(self, node_id):
+        self._points.pop(str(node_id), None)
+
+    def clear(self):
+        self._points.clear()
+
+    def on_cells_changed(self, row: int, col: int, height: int, width: int):
+        if not self._points:
+            return
+        ring = self.RING
+        for occupant_id in self._grid.get_occupant_ids_in_rect(row - ring, col - ring, height + 2 * ring, width + 2 * ring):
+            self._points.pop(str(occupant_id), None)
+
+    def on_layout_changed(self):
+        self._points.clear()
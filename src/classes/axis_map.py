@@ -0,0 +1,173 @@
+import random
+
+NIL = 0  # Sentinel line with size 0, so children/parents never need a None check
+
+class AxisMap:
+    """The lines (rows or cols) of one axis of the diagram, in order.
+
+    Nodes and edge cells store the id of their line instead of its position, so inserting or
+    deleting a line doesn't touch anything after it. Lines are kept in an implicit treap
+    (ordered by subtree sizes instead of keys, with parent pointers to find the position of
+    a line), so inserting, deleting and resolving a line is O(log n).
+
+    Bulk reads (`position_table`) build id <-> position tables in one O(n) pass. They are
+    kept, and make single lookups O(1), until a line is inserted or deleted before the end.
+    """
+
+    def __init__(self):
+        self._left = [NIL]
+        self._right = [NIL]
+        self._parent = [NIL]
+        self._size = [0]
+        self._priority = [0.0]
+        self._root = NIL
+        # Own generator, so drawing priorities doesn't change seeded draws of the random module
+        self._random = random.Random(0)
+        self._ids = []  # position -> line id
+        self._positions = [-1]  # line id -> position, -1 for deleted lines
+        self._tables_valid = True
+
+    def __len__(self):
+        return self._size[self._root]
+
+    def insert(self, position: int) -> int:
+        """Insert a new line at position (shifting the lines from there on) and return its id."""
+        if not 0 <= position <= len(self):
+            raise IndexError("line position out of range")
+        if position == len(self):
+            return self.append()
+        line = self._new_line()
+        before, after = self._split(self._root, position)
+        self._set_root(self._merge(self._merge(before, line), after))
+        self._tables_valid = False
+        return line
+
+    def append(self) -> int:
+        line = self._new_line()
+        self._set_root(self._merge(self._root, line))
+        if self._tables_valid:
+            self._positions[line] = len(self._ids)
+            self._ids.append(line)
+        return line
+
+    def ensure_length(self, length: int):
+        # Append empty lines until there are at least `length`
+        while len(self) < length:
+            self.append()
+
+    def delete(self, position: int) -> int:
+        """Remove the line at position and return its id, which must not be used anymore."""
+        if not 0 <= position < len(self):
+            raise IndexError("line position out of range")
+        before, rest = self._split(self._root, position)
+        line, after = self._split(rest, 1)
+        self._set_root(self._merge(before, after))
+        self._parent[line] = NIL
+        self._size[line] = 0
+        self._positions[line] = -1
+        self._tables_valid = False
+        return line
+
+    def id_at(self, position: int) -> int:
+        if not 0 <= position < len(self):
+            raise IndexError("line position out of range")
+        if self._tables_valid:
+            return self._ids[position]
+        node = self._root
+        while True:
+            left_size = self._size[self._left[node]]
+            if position < left_size:
+                node = self._left[node]
+            elif position == left_size:
+                return node
+            else:
+                position -= left_size + 1
+                node = self._right[node]
+
+    def position_of(self, line: int) -> int:
+        if self._tables_valid:
+            position = self._positions[line]
+            if position < 0:
+                raise KeyError(f"line {line} was deleted")
+            return position
+        if not self._size[line]:
+            raise KeyError(f"line {line} was deleted")
+        # Lines before this one: its left subtree, plus every ancestor (and its left
+        # subtree) that it is in the right subtree of
+        position = self._size[self._left[line]]
+        while line != self._root:
+            parent = self._parent[line]
+            if self._right[parent] == line:
+                position += self._size[self._left[parent]] + 1
+            line = parent
+        return position
+
+    def position_table(self) -> list[int]:
+        """Positions indexed by line id, for resolving many lines at once. Read only."""
+        self._refresh_tables()
+        return self._positions
+
+    def _refresh_tables(self):
+        if self._tables_valid:
+            return
+        # In-order walk
+        ids = []
+        stack = []
+        node = self._root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = self._left[node]
+            node = stack.pop()
+            ids.append(node)
+            node = self._right[node]
+        for position, line in enumerate(ids):
+            self._positions[line] = position
+        self._ids = ids
+        self._tables_valid = True
+
+    def _new_line(self) -> int:
+        line = len(self._size)
+        self._left.append(NIL)
+        self._right.append(NIL)
+        self._parent.append(NIL)
+        self._size.append(1)
+        self._priority.append(self._random.random())
+        self._positions.append(-1)
+        return line
+
+    def _set_root(self, node: int):
+        self._root = node
+        self._parent[node] = NIL
+
+    def _attach(self, node: int, left: int, right: int):
+        self._left[node] = left
+        self._right[node] = right
+        self._parent[left] = node
+        self._parent[right] = node
+        self._size[node] = self._size[left] + self._size[right] + 1
+
+    def _split(self, node: int, count: int) -> tuple[int, int]:
+        # Split the subtree into its first `count` lines and the rest.
+        # (Parent pointers of the returned roots are fixed up by whoever attaches them.)
+        if node == NIL:
+            return NIL, NIL
+        left = self._left[node]
+        if count <= self._size[left]:
+            before, after = self._split(left, count)
+            self._attach(node, after, self._right[node])
+            return before, node
+        before, after = self._split(self._right[node], count - self._size[left] - 1)
+        self._attach(node, left, before)
+        return node, after
+
+    def _merge(self, before: int, after: int) -> int:
+        if before == NIL:
+            return after
+        if after == NIL:
+            return before
+        if self._priority[before] > self._priority[after]:
+            self._attach(before, self._left[before], self._merge(self._right[before], after))
+            return before
+        self._attach(after, self._merge(before, self._left[after]), self._right[after])
+        return after
@@ -1,4 +1,5 @@
 from enum import Enum
+from itertools import product
 
 class Direction(Enum):
     N = "N"
@@ -11,8 +12,37 @@ class CellType(Enum):
     NODE = "NODE"
     EDGE = "EDGE"
 
+# Packed representation used by the compact `Grid` storage.
+# Cell types and directions are stored as small ints, the connection info of a cell as one byte:
+# bits 0-2 previous direction, bits 3-5 next direction, bit 6/7 arrow to previous/next.
+CELL_TYPES = [CellType.EMPTY, CellType.NODE, CellType.EDGE]
+CELL_TYPE_CODES = {cell_type: code for code, cell_type in enumerate(CELL_TYPES)}
+DIRECTIONS = [None, Direction.N, Direction.E, Direction.S, Direction.W]
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+ARROW_TO_PREVIOUS = 0x40
+ARROW_TO_NEXT = 0x80
+# Flags of an edge cell crossed by a second edge ("┼"): a straight N-S and a straight E-W edge without
+# arrows. Uses direction codes pack_connections never produces, as one cell holds no two edges' flags.
+CROSSING_FLAGS = 0x2D
+
+def pack_connections(connects_to_previous_in_direction: Direction, connects_to_next_in_direction: Direction, has_arrow_to_previous: bool, has_arrow_to_next: bool) -> int:
+    flags = DIRECTION_CODES[connects_to_previous_in_direction] | (DIRECTION_CODES[connects_to_next_in_direction] << 3)
+    if has_arrow_to_previous:
+        flags |= ARROW_TO_PREVIOUS
+    if has_arrow_to_next:
+        flags |= ARROW_TO_NEXT
+    return flags
+
+def unpack_connections(flags: int) -> tuple[Direction, Direction, bool, bool]:
+    return (
+        DIRECTIONS[flags & 0x07],
+        DIRECTIONS[(flags >> 3) & 0x07],
+        bool(flags & ARROW_TO_PREVIOUS),
+        bool(flags & ARROW_TO_NEXT)
+    )
+
 class Cell:
-    def __init__(self, row: int, col: int, cell_type: CellType, connects_to_previous_in_direction: Direction, connects_to_next_in_direction: Direction, has_arrow_to_previous: bool, has_arrow_to_next: bool, value: str = "·", occupant_id: str = None):
+    def __init__(self, row: int, col: int, cell_type: CellType, connects_to_previous_in_direction: Direction, connects_to_next_in_direction: Direction, has_arrow_to_previous: bool, has_arrow_to_next: bool, value: str = "·", occupant_id: str = None, is_crossing: bool = False):
         self.value = value
         self.occupant_id = occupant_id
         self.row = row
@@ -22,6 +52,8 @@ class Cell:
         self.connects_to_next_in_direction = connects_to_next_in_direction
         self.has_arrow_to_previous = has_arrow_to_previous
         self.has_arrow_to_next = has_arrow_to_next
+        # Edge cell where two edges cross (connections are then None, occupant is the edge drawn first)
+        self.is_crossing = is_crossing
 
     def is_empty(self) -> bool:
         return self.cell_type == CellType.EMPTY
@@ -53,59 +85,44 @@ class Cell:
         elif self.cell_type == CellType.NODE:
             return "O"
         elif self.cell_type == CellType.EDGE:
-            if self.has_arrow_to_previous:
-                if self.connects_to_previous_in_direction == Direction.N:
-                    return "↑"
-                elif self.connects_to_previous_in_direction == Direction.E:
-                    return "→"
-                elif self.connects_to_previous_in_direction == Direction.S:
-                    return "↓"
-                elif self.connects_to_previous_in_direction == Direction.W:
-                    return "←"
-            elif self.has_arrow_to_next:
-                if self.connects_to_next_in_direction == Direction.N:
-                    return "↑"
-                elif self.connects_to_next_in_direction == Direction.E:
-                    return "→"
-                elif self.connects_to_next_in_direction == Direction.S:
-                    return "↓"
-                elif self.connects_to_next_in_direction == Direction.W:
-                    return "←"
-            else:
-                # Straight edges
-                # E + W: —
-                if self.connects_to_previous_in_direction == Direction.E and self.connects_to_next_in_direction == Direction.W:
-                    return "─"
-                # N + S: │
-                elif self.connects_to_previous_in_direction == Direction.N and self.connects_to_next_in_direction == Direction.S:
-                    return "│"
-                # W + E: —
-                elif self.connects_to_previous_in_direction == Direction.W and self.connects_to_next_in_direction == Direction.E:
-                    return "─"
-                # S + N: │
-                elif self.connects_to_previous_in_direction == Direction.S and self.connects_to_next_in_direction == Direction.N:
-                    return "│"
-                # Elbow connectors
-                # N
-                elif self.connects_to_previous_in_direction == Direction.N and self.connects_to_next_in_direction == Direction.E:
-                    return "└"
-                elif self.connects_to_previous_in_direction == Direction.N and self.connects_to_next_in_direction == Direction.W:
-                    return "┘"
-                # S
-                elif self.connects_to_previous_in_direction == Direction.S and self.connects_to_next_in_direction == Direction.E:
-                    return "┌"
-                elif self.connects_to_previous_in_direction == Direction.S and self.connects_to_next_in_direction == Direction.W:
-                    return "┐"
-                # E
-                elif self.connects_to_previous_in_direction == Direction.E and self.connects_to_next_in_direction == Direction.N:
-                    return "└"
-                elif self.connects_to_previous_in_direction == Direction.E and self.connects_to_next_in_direction == Direction.S:
-                    return "┌"
-                # W
-                elif self.connects_to_previous_in_direction == Direction.W and self.connects_to_next_in_direction == Direction.N:
-                    return "┘"
-                elif self.connects_to_previous_in_direction == Direction.W and self.connects_to_next_in_direction == Direction.S:
-                    return "┐"
-                else:
-                    return "X"
-                    
+            if self.is_crossing:
+                return EDGE_FLOW_GLYPHS[CROSSING_FLAGS]
+            return EDGE_FLOW_GLYPHS[pack_connections(
+                self.connects_to_previous_in_direction, self.connects_to_next_in_direction,
+                self.has_arrow_to_previous, self.has_arrow_to_next
+            )]
+
+ARROW_GLYPHS = {Direction.N: "↑", Direction.E: "→", Direction.S: "↓", Direction.W: "←"}
+# Edge cells without arrows, by the two directions they connect (in either order)
+LINE_GLYPHS = {
+    frozenset({Direction.E, Direction.W}): "─",
+    frozenset({Direction.N, Direction.S}): "│",
+    frozenset({Direction.N, Direction.E}): "└",
+    frozenset({Direction.N, Direction.W}): "┘",
+    frozenset({Direction.S, Direction.E}): "┌",
+    frozenset({Direction.S, Direction.W}): "┐",
+}
+
+def _edge_flow_glyph(previous: Direction, next: Direction, arrow_to_previous: bool, arrow_to_next: bool) -> str:
+    # An arrow wins over the line, the arrow at the previous end over the one at the next end
+    if arrow_to_previous:
+        return ARROW_GLYPHS.get(previous, "X")
+    if arrow_to_next:
+        return ARROW_GLYPHS.get(next, "X")
+    return LINE_GLYPHS.get(frozenset({previous, next}), "X")
+
+# Flow glyph of an edge cell, indexed by its packed connection flags
+EDGE_FLOW_GLYPHS = ["X"] * 256
+for _previous, _next, _arrow_to_previous, _arrow_to_next in product(DIRECTIONS, DIRECTIONS, (False, True), (False, True)):
+    EDGE_FLOW_GLYPHS[pack_connections(_previous, _next, _arrow_to_previous, _arrow_to_next)] = _edge_flow_glyph(_previous, _next, _arrow_to_previous, _arrow_to_next)
+EDGE_FLOW_GLYPHS[CROSSING_FLAGS] = "┼"
+
+# Packed connection flags for each flow glyph, to read flow renderings back in. A glyph doesn't
+# say which way the edge runs, so lines connect the two directions in `DIRECTIONS` order, and
+# arrows come straight from the opposite side with the arrow at the next end.
+_OPPOSITE_DIRECTIONS = {Direction.N: Direction.S, Direction.S: Direction.N, Direction.E: Direction.W, Direction.W: Direction.E}
+FLOW_GLYPH_FLAGS = {"┼": CROSSING_FLAGS}
+for _directions, _glyph in LINE_GLYPHS.items():
+    FLOW_GLYPH_FLAGS[_glyph] = pack_connections(*sorted(_directions, key=DIRECTION_CODES.get), False, False)
+for _direction, _glyph in ARROW_GLYPHS.items():
+    FLOW_GLYPH_FLAGS[_glyph] = pack_connections(_OPPOSITE_DIRECTIONS[_direction], _direction, False, True)
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from typing import List
-from src.classes.coordinate import Coordinate
+from typing import Optional
+from src.classes.edge_path import EdgePath
+from src.classes.node import Node
 
 @dataclass
 class Attachment:
@@ -13,16 +14,38 @@ class Edge:
     id: str
     sender_attachment: Attachment
     receiver_attachment: Attachment
-    cells: List[Coordinate]  # List of coordinates
+    cells: EdgePath  # Packed coordinates, reads like a list of Coordinates
 
     def __init__(self, id, sender_attachment, receiver_attachment, cells):
         self.id = id
         self.sender_attachment = sender_attachment
         self.receiver_attachment = receiver_attachment
-        self.cells = cells
+        self.cells = cells if isinstance(cells, EdgePath) else EdgePath(cells)
 
 class Attachment:
     def __init__(self, node_id, has_arrow, node_in_direction):
         self.node_id = node_id
         self.has_arrow = has_arrow
         self.node_in_direction = node_in_direction
+
+@dataclass
+class EdgeSpec:
+    """Everything `ObjectManager.draw_edge` needs to route one edge, for batch routing.
+    Attachment points may be None, to let the route pick any valid one of the node."""
+    sender_node: Node
+    receiver_node: Node
+    sender_attachment_point: Optional[tuple[int, int]]
+    receiver_attachment_point: Optional[tuple[int, int]]
+    has_arrow_sender: bool = False
+    has_arrow_receiver: bool = False
+
+@dataclass
+class EdgeRoutingResult:
+    """Outcome of routing one `EdgeSpec`: either the drawn edge or why it failed."""
+    spec: EdgeSpec
+    edge: Optional[Edge] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.edge is not None
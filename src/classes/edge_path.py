@@ -0,0 +1,154 @@
+from array import array
+from src.classes.axis_map import AxisMap
+from src.classes.coordinate import Coordinate
+
+class EdgePath:
+    """The cells of an edge, packed into two int arrays instead of a list of `Coordinate`s.
+
+    Behaves like a list of `Coordinate`s (len, iteration, indexing, ==, index, insert, del),
+    but the `Coordinate`s are built on access, so changing one does not change the path.
+    Standalone, moving the whole path is an offset update via `shift`, not a walk over every cell.
+    Once attached to the row/col `AxisMap`s of an `ObjectManager`, the arrays hold line ids,
+    so inserting or deleting lines of the diagram moves the path without touching it.
+    """
+
+    __slots__ = ('_rows', '_cols', '_row_offset', '_col_offset', '_axes')
+
+    def __init__(self, cells=()):
+        self._rows = array('i')
+        self._cols = array('i')
+        self._row_offset = 0
+        self._col_offset = 0
+        self._axes = None
+        for cell in cells:
+            self._rows.append(cell.row)
+            self._cols.append(cell.col)
+
+    @staticmethod
+    def from_pairs(pairs) -> "EdgePath":
+        """Create from (row, col) pairs, e.g. the `cells` of an edge in JSON."""
+        path = EdgePath()
+        for row, col in pairs:
+            path._rows.append(row)
+            path._cols.append(col)
+        return path
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row, col = self._rows[index], self._cols[index]
+        if self._axes is None:
+            return Coordinate(row=row + self._row_offset, col=col + self._col_offset)
+        return Coordinate(row=self._axes[0].position_of(row), col=self._axes[1].position_of(col))
+
+    def __delitem__(self, index: int):
+        del self._rows[index]
+        del self._cols[index]
+
+    def __iter__(self):
+        for row, col in self.iter_pairs():
+            yield Coordinate(row=row, col=col)
+
+    def __eq__(self, other):
+        if isinstance(other, EdgePath):
+            return self.to_pairs() == other.to_pairs()
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"EdgePath({self.to_pairs()})"
+
+    def iter_pairs(self):
+        """Yield (row, col) tuples without building `Coordinate`s."""
+        if self._axes is None:
+            row_offset, col_offset = self._row_offset, self._col_offset
+            for row, col in zip(self._rows, self._cols):
+                yield (row + row_offset, col + col_offset)
+        else:
+            row_positions = self._axes[0].position_table()
+            col_positions = self._axes[1].position_table()
+            for row, col in zip(self._rows, self._cols):
+                yield (row_positions[row], col_positions[col])
+
+    def to_pairs(self) -> list[list[int]]:
+        return [[row, col] for row, col in self.iter_pairs()]
+
+    def max_row(self) -> int:
+        if self._axes is None:
+            return max(self._rows) + self._row_offset
+        return max(map(self._axes[0].position_table().__getitem__, self._rows))
+
+    def max_col(self) -> int:
+        if self._axes is None:
+            return max(self._cols) + self._col_offset
+        return max(map(self._axes[1].position_table().__getitem__, self._cols))
+
+    def shift(self, rows: int, cols: int):
+        """Move every cell of the path by rows/cols, in O(1) for standalone paths."""
+        if self._axes is None:
+            self._row_offset += rows
+            self._col_offset += cols
+            return
+        pairs = list(self.iter_pairs())
+        del self._rows[:], self._cols[:]
+        for row, col in pairs:
+            self._append_pair(row + rows, col + cols)
+
+    def index(self, cell: Coordinate) -> int:
+        """Position of cell in the path, like list.index."""
+        if self._axes is None:
+            row, col = cell.row - self._row_offset, cell.col - self._col_offset
+        elif 0 <= cell.row < len(self._axes[0]) and 0 <= cell.col < len(self._axes[1]):
+            row, col = self._axes[0].id_at(cell.row), self._axes[1].id_at(cell.col)
+        else:
+            raise ValueError(f"{cell} is not in EdgePath")
+        i = -1
+        while True:
+            try:
+                i = self._rows.index(row, i + 1)
+            except ValueError:
+                raise ValueError(f"{cell} is not in EdgePath") from None
+            if self._cols[i] == col:
+                return i
+
+    def insert(self, index: int, cell: Coordinate):
+        row, col = self._encode(cell.row, cell.col)
+        self._rows.insert(index, row)
+        self._cols.insert(index, col)
+
+    def remove_lines(self, rows: set[int] = frozenset(), cols: set[int] = frozenset()):
+        """Drop every cell on one of the given row/col lines (line ids of the attached axes)."""
+        if rows.isdisjoint(self._rows) and cols.isdisjoint(self._cols):
+            return
+        kept = [i for i, (row, col) in enumerate(zip(self._rows, self._cols)) if row not in rows and col not in cols]
+        self._rows = array('i', [self._rows[i] for i in kept])
+        self._cols = array('i', [self._cols[i] for i in kept])
+
+    def cells_on_lines(self, rows: set[int] = frozenset(), cols: set[int] = frozenset()) -> list[int]:
+        """Line ids of the given row/col lines (of the attached axes) the path has cells on, once per cell."""
+        return [row for row in self._rows if row in rows] + [col for col in self._cols if col in cols]
+
+    def attach_to_axes(self, rows: AxisMap, cols: AxisMap):
+        """Store cells as lines of the given axes from now on, keeping their current values."""
+        pairs = list(self.iter_pairs())
+        self._axes = (rows, cols)
+        del self._rows[:], self._cols[:]
+        for row, col in pairs:
+            self._append_pair(row, col)
+
+    def _append_pair(self, row: int, col: int):
+        row, col = self._encode(row, col)
+        self._rows.append(row)
+        self._cols.append(col)
+
+    def _encode(self, row: int, col: int) -> tuple[int, int]:
+        if self._axes is None:
+            return row - self._row_offset, col - self._col_offset
+        rows, cols = self._axes
+        rows.ensure_length(row + 1)
+        cols.ensure_length(col + 1)
+        return rows.id_at(row), cols.id_at(col)
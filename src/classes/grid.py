@@ -1,113 +1,751 @@
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import count, product
+import heapq
+import mmap
+import re
 from classes.coordinate import Coordinate
-from src.classes.cell import Cell, CellType
+from src.classes.cell import Cell, CellType, Direction, CELL_TYPES, CELL_TYPE_CODES, CROSSING_FLAGS, DIRECTIONS, EDGE_FLOW_GLYPHS, FLOW_GLYPH_FLAGS, pack_connections, unpack_connections
+from src.classes.placement_index import PlacementIndex
+from src.classes.line_writer import write_lines, DEFAULT_BUFFER_SIZE
 import random
 
+EMPTY = CELL_TYPE_CODES[CellType.EMPTY]
+NODE = CELL_TYPE_CODES[CellType.NODE]
+EDGE = CELL_TYPE_CODES[CellType.EDGE]
+NO_OCCUPANT = -1
+
+# Direction deltas for routing, and the order neighbors are tried in (prefer right and down)
+ROUTING_DIRECTIONS = {'N': (-1, 0), 'S': (1, 0), 'E': (0, 1), 'W': (0, -1)}
+ROUTING_ORDER = ['E', 'S', 'W', 'N']
+OPPOSITE_DIRECTIONS = {'N': 'S', 'S': 'N', 'E': 'W', 'W': 'E'}
+# Extra cost of a bend, relative to a step cost of 1
+DEFAULT_BEND_COST = 1
+# Search behind find_manhattan_path_with_forced_ends: A* pricing bends and crossings, or one of the
+# uniform-cost searches for long paths on large grids (shortest in steps, bends are not priced)
+ROUTING_BACKENDS = ('astar', 'bidirectional', 'jump_point')
+# Extra cost of inserting a row/col to make room for a path (see plan_line_insertions)
+DEFAULT_INSERTION_COST = 10
+# Line source of a gap that gets no virtual line, and of a virtual empty line
+_NO_LINE = -2
+_EMPTY_LINE = -1
+# Passed mask of the goal states in _find_path_astar
+_GOAL = -1
+
+@lru_cache(maxsize=None)
+def _min_bends(direction: str, row_sign: int, col_sign: int, last_dir: str) -> int:
+    """Fewest bends on an obstacle-free grid to go from heading `direction` to a target
+    in the given (sign only) row/col offset, arrive there and then move on in `last_dir`.
+
+    Tries heading sequences by increasing length. Every segment but the first has to be at
+    least one cell long, and segment lengths are otherwise free, so only the signs matter.
+    """
+    best = None
+    for bends in range(6):
+        if best is not None and bends >= best:
+            return best
+        for headings in product(ROUTING_ORDER, repeat=bends):
+            sequence = (direction,) + headings
+            if any(b in (a, OPPOSITE_DIRECTIONS[a]) for a, b in zip(sequence, sequence[1:])):
+                continue  # not a bend, or a U-turn back into the previous cell
+            arrival = sequence[-1]
+            if arrival == OPPOSITE_DIRECTIONS[last_dir]:
+                continue  # would have to arrive from the cell we move on into
+            if not (_axis_reachable(sequence, row_sign, 'S', 'N') and _axis_reachable(sequence, col_sign, 'E', 'W')):
+                continue
+            total = bends + (arrival != last_dir)
+            if best is None or total < best:
+                best = total
+    return best
+
+def _axis_reachable(sequence: tuple[str, ...], sign: int, positive: str, negative: str) -> bool:
+    moves = [(i, heading) for i, heading in enumerate(sequence) if heading in (positive, negative)]
+    if sign > 0:
+        return any(heading == positive for _, heading in moves)
+    if sign < 0:
+        return any(heading == negative for _, heading in moves)
+    # Net zero: no forced movement on this axis, or movement both ways to cancel out
+    forced = [heading for i, heading in moves if i > 0]
+    return not forced or len({heading for _, heading in moves}) == 2
+
+def _blocking_table(across: set[Direction]) -> bytes:
+    # Per flags byte: 1 if an edge cell with these flags has an arrow or doesn't run straight
+    # across the line (N-S for a row, E-W for a col). A row/col with such a cell can't be cloned.
+    table = bytearray([1]) * 256
+    for previous, next in product(DIRECTIONS, repeat=2):
+        for arrow_to_previous, arrow_to_next in product((False, True), repeat=2):
+            flags = pack_connections(previous, next, arrow_to_previous, arrow_to_next)
+            table[flags] = arrow_to_previous or arrow_to_next or {previous, next} != across
+    return bytes(table)
+
+_BLOCKS_ROW_CLONE = _blocking_table({Direction.N, Direction.S})
+_BLOCKS_COL_CLONE = _blocking_table({Direction.E, Direction.W})
+
+# Flow rendering codes: a cell's flags if it is an edge, otherwise one of two codes with invalid
+# direction bits (never produced by pack_connections), so both fit into one byte per cell
+_FLOW_EMPTY_CODE = 0x3F
+_FLOW_NODE_CODE = 0x3E
+_FLOW_EDGE_MASK = bytes([0xFF if code == EDGE else 0 for code in range(256)])
+_FLOW_BASE_CODES = bytes([_FLOW_EMPTY_CODE if code == EMPTY else _FLOW_NODE_CODE if code == NODE else 0 for code in range(256)])
+# Rows are rendered in blocks of about this many cells
+_FLOW_BLOCK_CELLS = 64 * 1024
+_FLOW_GLYPHS = list(EDGE_FLOW_GLYPHS)
+_FLOW_GLYPHS[_FLOW_EMPTY_CODE] = "·"
+_FLOW_GLYPHS[_FLOW_NODE_CODE] = "O"
+
+# Translation table turning a row of cell type codes into 1 (empty) and 0 (occupied), and the
+# runs of empty cells in such a row (see _route_components)
+_PASSABLE_CODES = bytes([1 if code == EMPTY else 0 for code in range(256)])
+_PASSABLE_RUN = re.compile(rb'\x01+')
+
+# Translation table turning a row of cell type codes into '0' (empty) and '1' (occupied) digits
+_OCCUPANCY_DIGITS = bytes([ord('0')] + [ord('1')] * 255)
+
+def _set_bits(mask: int):
+    # Yield the positions of all set bits, lowest first
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def _nth_set_bit(mask: int, n: int) -> int:
+    for i, position in enumerate(_set_bits(mask)):
+        if i == n:
+            return position
+    raise IndexError("mask has fewer set bits")
+
+class _TxtTokens(dict):
+    # Token -> index into the parallel types/occupants/flags arrays, classifying each new token once
+    def __init__(self, grid: "Grid"):
+        super().__init__()
+        self._grid = grid
+        self.types = bytearray()
+        self.occupants = array('i')
+        self.flags = bytearray()
+
+    def __missing__(self, token: str) -> int:
+        flags = 0
+        if token == "·":
+            cell_type, occupant = EMPTY, NO_OCCUPANT
+        elif token.isalpha():
+            cell_type, occupant = NODE, self._grid._occupant_code(token)
+        elif token in FLOW_GLYPH_FLAGS:
+            cell_type, occupant, flags = EDGE, NO_OCCUPANT, FLOW_GLYPH_FLAGS[token]
+        else:
+            cell_type, occupant = EDGE, self._grid._occupant_code(token)
+        index = self[token] = len(self.types)
+        self.types.append(cell_type)
+        self.occupants.append(occupant)
+        self.flags.append(flags)
+        return index
+
+def _iter_txt_lines(txt_data):
+    # Lines of a string, of UTF-8 bytes or of a text/binary file-like object
+    if isinstance(txt_data, str):
+        return iter(txt_data.split('\n'))
+    if isinstance(txt_data, (bytes, bytearray, memoryview, mmap.mmap)):
+        return iter(str(memoryview(txt_data), 'utf-8').split('\n'))
+    return (line.decode('utf-8') if isinstance(line, bytes) else line for line in txt_data)
+
 class Grid:
+    """Compact cell storage.
+
+    Cells are not stored as `Cell` objects but packed into flat, row-major typed arrays
+    (cell type, occupant index, connection flags). Rows are `_stride` cells apart, so columns
+    can be appended without relayouting every time. `grid.cells[r][c]` builds a `Cell` on demand,
+    and assigning a `Cell` to it packs it back into the arrays.
+    """
+
     def __init__(self, width, height):
         self.width = width
         self.height = height
-        self.cells = [[Cell(row, col, CellType.EMPTY, None, None, False, False, value="·") for col in range(width)] for row in range(height)]
+        self._stride = width
+        self._types = bytearray(width * height)
+        self._occupants = array('i', [NO_OCCUPANT]) * (width * height)
+        self._flags = bytearray(width * height)
+        # Occupant ids are interned, cells only store their index
+        self._occupant_ids = []
+        self._occupant_codes = {}
+        # Optional, see enable_placement_index()
+        self._placement_index = None
+        # See add_change_listener()
+        self._change_listeners = []
+        # crossings allowed -> connected areas routes can go through, see _route_components()
+        self._components = {}
+        # Number of cells per row/col that keep it from being cloned, kept up to date on every write
+        self._row_blockers = [0] * height
+        self._col_blockers = [0] * width
+
+    @property
+    def cells(self) -> "_CellRows":
+        return _CellRows(self)
+
+    def enable_placement_index(self) -> PlacementIndex:
+        """Maintain the valid node placement cells incrementally from now on.
+
+        Worth it for long-lived grids with many placements (e.g. the live grid of an
+        `ObjectManager`); every write then also updates the index around the written cells.
+        """
+        if self._placement_index is None:
+            self._placement_index = PlacementIndex(self)
+        return self._placement_index
+
+    def add_change_listener(self, listener):
+        """Report every change of cells to listener from now on.
+
+        listener.on_cells_changed(row, col, height, width) is called after the cells of that
+        rectangle were written, added at the end or deleted from the end of the grid,
+        listener.on_layout_changed() after lines were inserted or deleted anywhere else
+        (which moves cells, so the listener has to start over).
+        """
+        self._change_listeners.append(listener)
+
+    def _cells_changed(self, row: int, col: int, height: int, width: int, occupied_only: bool = False):
+        # occupied_only: all written cells were empty before. That can only split the areas of
+        # _route_components, so they are still good enough to rule routes out.
+        if not occupied_only:
+            self._components.clear()
+        for listener in self._change_listeners:
+            listener.on_cells_changed(row, col, height, width)
+
+    def _layout_changed(self):
+        self._components.clear()
+        for listener in self._change_listeners:
+            listener.on_layout_changed()
+
+    def _occupant_code(self, occupant_id: str) -> int:
+        if occupant_id is None:
+            return NO_OCCUPANT
+        code = self._occupant_codes.get(occupant_id)
+        if code is None:
+            code = len(self._occupant_ids)
+            self._occupant_ids.append(occupant_id)
+            self._occupant_codes[occupant_id] = code
+        return code
+
+    def get_cell(self, row: int, col: int) -> Cell:
+        i = row * self._stride + col
+        occupant = self._occupants[i]
+        flags = self._flags[i]
+        is_crossing = flags == CROSSING_FLAGS
+        return Cell(
+            row, col, CELL_TYPES[self._types[i]],
+            *(unpack_connections(flags) if not is_crossing else (None, None, False, False)),
+            value="·", occupant_id=self._occupant_ids[occupant] if occupant != NO_OCCUPANT else None,
+            is_crossing=is_crossing
+        )
+
+    def set_cell(self, row: int, col: int, cell_type: CellType, connects_to_previous_in_direction=None, connects_to_next_in_direction=None, has_arrow_to_previous=False, has_arrow_to_next=False, occupant_id: str = None, is_crossing: bool = False):
+        i = row * self._stride + col
+        was_empty = self._types[i] == EMPTY
+        self._count_blockers(row, col, -1)
+        self._types[i] = CELL_TYPE_CODES[cell_type]
+        self._occupants[i] = self._occupant_code(occupant_id)
+        if is_crossing:
+            self._flags[i] = CROSSING_FLAGS
+        else:
+            self._flags[i] = pack_connections(connects_to_previous_in_direction, connects_to_next_in_direction, has_arrow_to_previous, has_arrow_to_next)
+        self._count_blockers(row, col, 1)
+        if self._placement_index is not None:
+            self._placement_index.on_rect_written(row, col, 1, 1, occupied=cell_type != CellType.EMPTY)
+        self._cells_changed(row, col, 1, 1, occupied_only=was_empty)
+
+    def fill_rect(self, row: int, col: int, height: int, width: int, cell_type: CellType, occupant_id: str = None):
+        # Set a whole rectangle (e.g. a node) to the same unconnected state, row slice by row slice
+        type_code = CELL_TYPE_CODES[cell_type]
+        occupant = self._occupant_code(occupant_id)
+        was_empty = True
+        for r in range(row, row + height):
+            start = r * self._stride + col
+            was_empty = was_empty and self._types.count(EMPTY, start, start + width) == width
+            for c in self._edge_cols(r, col, col + width):
+                self._count_blockers(r, c, -1)
+            self._types[start:start + width] = bytes([type_code]) * width
+            self._occupants[start:start + width] = array('i', [occupant]) * width
+            self._flags[start:start + width] = bytes(width)
+            if type_code == EDGE:
+                for c in range(col, col + width):
+                    self._count_blockers(r, c, 1)
+        if self._placement_index is not None:
+            self._placement_index.on_rect_written(row, col, height, width, occupied=cell_type != CellType.EMPTY)
+        self._cells_changed(row, col, height, width, occupied_only=was_empty)
+
+    def _count_blockers(self, row: int, col: int, delta: int):
+        i = row * self._stride + col
+        if self._types[i] == EDGE:
+            flags = self._flags[i]
+            if _BLOCKS_ROW_CLONE[flags]:
+                self._row_blockers[row] += delta
+            if _BLOCKS_COL_CLONE[flags]:
+                self._col_blockers[col] += delta
+
+    def _edge_cols(self, row: int, start: int = 0, end: int = None) -> list[int]:
+        # Columns of the edge cells of a row (between start and end)
+        row_start = row * self._stride
+        end = self.width if end is None else end
+        cols = []
+        i = self._types.find(EDGE, row_start + start, row_start + end)
+        while i != -1:
+            cols.append(i - row_start)
+            i = self._types.find(EDGE, i + 1, row_start + end)
+        return cols
+
+    def is_row_clonable(self, row: int) -> bool:
+        """Whether every edge cell of row runs straight across it (N-S) without arrows. O(1)."""
+        return not self._row_blockers[row]
+
+    def is_col_clonable(self, col: int) -> bool:
+        return not self._col_blockers[col]
+
+    def get_clonable_rows(self) -> list[int]:
+        return [row for row, blockers in enumerate(self._row_blockers) if not blockers]
+
+    def get_clonable_cols(self) -> list[int]:
+        return [col for col, blockers in enumerate(self._col_blockers) if not blockers]
+
+    def get_redundant_rows(self) -> list[int]:
+        """Rows that are an exact copy of the row above (as if made by cloning it).
+
+        Every row gets a fingerprint of its packed cell types, occupants and connections
+        (occupants are interned, so equal ids have equal codes), and adjacent fingerprints are
+        compared in one pass. Rows with clone blockers are skipped, so removing the result can't
+        break an edge (apart from shortening it, see ObjectManager.purge_redundant_rows).
+        """
+        redundant = []
+        previous = None
+        for row in range(self.height):
+            fingerprint = self._row_fingerprint(row)
+            if fingerprint == previous and not self._row_blockers[row]:
+                redundant.append(row)
+            previous = fingerprint
+        return redundant
+
+    def get_redundant_cols(self) -> list[int]:
+        redundant = []
+        previous = None
+        for col in range(self.width):
+            fingerprint = self._col_fingerprint(col)
+            if fingerprint == previous and not self._col_blockers[col]:
+                redundant.append(col)
+            previous = fingerprint
+        return redundant
+
+    def _row_fingerprint(self, row: int) -> bytes:
+        start = row * self._stride
+        end = start + self.width
+        return bytes(self._types[start:end]) + self._occupants[start:end].tobytes() + bytes(self._flags[start:end])
+
+    def _col_fingerprint(self, col: int) -> bytes:
+        end = self.height * self._stride
+        return bytes(self._types[col:end:self._stride]) + self._occupants[col:end:self._stride].tobytes() + bytes(self._flags[col:end:self._stride])
+
+    def _set_cell_from_object(self, row: int, col: int, cell: Cell):
+        self.set_cell(
+            row, col, cell.cell_type,
+            cell.connects_to_previous_in_direction, cell.connects_to_next_in_direction,
+            cell.has_arrow_to_previous, cell.has_arrow_to_next,
+            occupant_id=cell.occupant_id, is_crossing=cell.is_crossing
+        )
+
+    def is_crossable(self, row: int, col: int, horizontal: bool) -> bool:
+        """Whether an edge moving horizontally (E/W) or vertically (N/S) can cross the cell:
+        a straight edge cell without arrows running the other way, not crossed yet,
+        and not the end of its edge (next to the node it attaches to)."""
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return False
+        i = row * self._stride + col
+        # A straight N-S cell without arrows is exactly what doesn't block cloning its row
+        table = _BLOCKS_ROW_CLONE if horizontal else _BLOCKS_COL_CLONE
+        return self._types[i] == EDGE and not table[self._flags[i]] and not self._is_edge_end(i, horizontal)
+
+    def _is_edge_end(self, i: int, horizontal: bool) -> bool:
+        # A straight cell crossed horizontally runs N-S: it is an end of its edge if it runs into a node
+        # (the middle cells of an edge only connect to edge cells). Crossing it would cut the edge off.
+        step = self._stride if horizontal else 1
+        types = self._types
+        return (i - step >= 0 and types[i - step] == NODE) or (i + step < len(types) and types[i + step] == NODE)
+
+    def is_row_empty(self, row: int) -> bool:
+        return self._row_types(row).count(EMPTY) == self.width
+
+    def is_col_empty(self, col: int) -> bool:
+        return self._types[col:self.height * self._stride:self._stride].count(EMPTY) == self.height
+
+    def get_occupant_id(self, row: int, col: int) -> str | None:
+        """Id of the node/edge occupying the cell, None if empty or out of bounds. O(1)."""
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return None
+        occupant = self._occupants[row * self._stride + col]
+        return self._occupant_ids[occupant] if occupant != NO_OCCUPANT else None
+
+    def get_occupant_ids_in_rect(self, row: int, col: int, height: int, width: int) -> list[str]:
+        """Ids of all nodes/edges with a cell in the rectangle (clipped to the grid), in row-major
+        order of their first cell. Reads the occupant raster row slice by row slice, O(area)."""
+        col_start, col_end = max(0, col), min(self.width, col + width)
+        occupants = {}
+        if col_start < col_end:
+            for r in range(max(0, row), min(self.height, row + height)):
+                start = r * self._stride
+                occupants.update(dict.fromkeys(self._occupants[start + col_start:start + col_end]))
+        occupants.pop(NO_OCCUPANT, None)
+        return [self._occupant_ids[occupant] for occupant in occupants]
+
+    def _row_types(self, row: int) -> bytearray:
+        start = row * self._stride
+        return self._types[start:start + self.width]
+
+    def _render_txt_token(self, row: int, col: int) -> str:
+        i = row * self._stride + col
+        cell_type = self._types[i]
+        if cell_type == EMPTY:
+            return "·"
+        occupant = self._occupants[i]
+        if occupant != NO_OCCUPANT:
+            return self._occupant_ids[occupant]
+        return self.get_cell(row, col).render_txt()
 
     @staticmethod
-    def create_from_txt(txt_data):
-        # Split the text into lines and remove any empty lines
-        lines = [line.strip() for line in txt_data.split('\n') if line.strip()]
-        
-        # Calculate dimensions
-        height = len(lines)
-        width = len(lines[0].split())  # Split on whitespace to get width
-        
-        # Create a new grid with these dimensions
-        grid = Grid(width, height)
-        
-        # Set cell values from the text
-        for row, line in enumerate(lines):
-            values = line.split()
-            for col, value in enumerate(values):
-                if value == "·":
-                    grid.cells[row][col] = Cell(row, col, CellType.EMPTY, None, None, False, False, value="·", occupant_id=None)
-                elif value.isalpha():
-                    grid.cells[row][col] = Cell(row, col, CellType.NODE, None, None, False, False, value="·", occupant_id=value)
-                else:
-                    grid.cells[row][col] = Cell(row, col, CellType.EDGE, None, None, False, False, value="·", occupant_id=value)
-        
+    def create_from_txt(txt_data) -> "Grid":
+        """Parse the text format (as written by export_to_txt or render_to_flow_txt).
+
+        txt_data is a string, UTF-8 bytes (bytes, bytearray, memoryview, mmap) or a text or binary
+        file-like object, which is read line by line. Blank lines are skipped. Per token:
+        "·" is an empty cell, alphabetic tokens are node cells of that id, flow glyphs are edge cells
+        without id with the connections of `FLOW_GLYPH_FLAGS`, anything else is an edge cell of that id.
+        Every distinct token is classified once, rows are then appended straight to the packed arrays.
+        """
+        grid = Grid(0, 0)
+        tokens = _TxtTokens(grid)
+        width = None
+        height = 0
+        for line in _iter_txt_lines(txt_data):
+            codes = list(map(tokens.__getitem__, line.split()))
+            if not codes:
+                continue
+            if width is None:
+                width = len(codes)
+            elif len(codes) != width:
+                raise ValueError(f"Row {height} has {len(codes)} cells, expected {width}")
+            grid._types.extend(map(tokens.types.__getitem__, codes))
+            grid._occupants.extend(map(tokens.occupants.__getitem__, codes))
+            grid._flags.extend(map(tokens.flags.__getitem__, codes))
+            height += 1
+
+        grid.width = grid._stride = width or 0
+        grid.height = height
+        grid._row_blockers = [0] * grid.height
+        grid._col_blockers = [0] * grid.width
+        if EDGE in tokens.types:
+            for row in range(height):
+                for col in grid._edge_cols(row):
+                    grid._count_blockers(row, col, 1)
         return grid
     
     def export_to_txt(self):
-        # Convert each row of cells to a space-separated string, with trailing space
-        lines = []
-        for row in self.cells:
-            line = ' '.join(cell.render_txt() for cell in row) + ' '  # Add trailing space
-            lines.append(line.rstrip())  # Remove trailing space from last line
-        return '\n'.join(lines)
-    
+        return '\n'.join(self.iter_txt_lines())
+
+    def iter_txt_lines(self):
+        # Each row of cells as a space-separated string
+        for row in range(self.height):
+            yield ' '.join(self._render_txt_token(row, col) for col in range(self.width))
+
+    def write_txt(self, target, buffer_size: int = DEFAULT_BUFFER_SIZE, compress: bool = False) -> None:
+        """Write what export_to_txt returns to a file-like object or socket, row by row (see write_lines)."""
+        write_lines(self.iter_txt_lines(), target, buffer_size, compress)
+
     def render_to_flow_txt(self):
-        # Render each cell using its render_flow method
-        lines = []
-        for row in self.cells:
-            line = ' '.join(cell.render_flow() for cell in row)
-            lines.append(line)
-        return '\n'.join(lines)
+        return '\n'.join(self.iter_flow_lines())
+
+    def iter_flow_lines(self):
+        # One flow code byte per cell: edge cells use their flags, empty/node cells a code no
+        # flags byte can have. Computed with big-int bit ops over blocks of rows, then mapped
+        # to glyphs with str.translate and joined row by row, so no per-cell Python work.
+        if not self.width:
+            yield from [''] * self.height
+            return
+        stride = self._stride
+        block = max(1, _FLOW_BLOCK_CELLS // stride) * stride
+        size = self.height * stride
+        for block_start in range(0, size, block):
+            block_end = min(block_start + block, size)
+            types = self._types[block_start:block_end]
+            flags = self._flags[block_start:block_end]
+            edge_mask = int.from_bytes(types.translate(_FLOW_EDGE_MASK), 'big')
+            codes = (int.from_bytes(flags, 'big') & edge_mask) | int.from_bytes(types.translate(_FLOW_BASE_CODES), 'big')
+            glyphs = codes.to_bytes(len(types), 'big').decode('latin-1').translate(_FLOW_GLYPHS)
+            for start in range(0, len(types), stride):
+                yield ' '.join(glyphs[start:start + self.width])
+
+    def write_flow_txt(self, target, buffer_size: int = DEFAULT_BUFFER_SIZE, compress: bool = False) -> None:
+        """Write what render_to_flow_txt returns to a file-like object or socket, row by row."""
+        write_lines(self.iter_flow_lines(), target, buffer_size, compress)
 
     # everything that fulfills get_is_cell_empty_and_all_neighbors_empty_or_out_of_bounds_at()
     def get_all_valid_node_placement_cells(self) -> list[Cell]:
         valid_cells = []
-        for row in range(self.height):
-            for col in range(self.width):
-                if not self.is_cell_empty(row, col):
-                    continue
-                # Check all 8 neighbors
-                all_neighbors_empty_or_oob = True
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if dr == 0 and dc == 0:
-                            continue
-                        nr, nc = row + dr, col + dc
-                        if not self.is_cell_empty_or_out_of_bounds(nr, nc):
-                            all_neighbors_empty_or_oob = False
-                            break
-                    if not all_neighbors_empty_or_oob:
-                        break
-                if all_neighbors_empty_or_oob:
-                    valid_cells.append(self.cells[row][col])
+        for row, mask in enumerate(self.get_valid_node_placement_masks()):
+            for col in _set_bits(mask):
+                valid_cells.append(self.get_cell(row, col))
         return valid_cells
+
+    def get_valid_node_placement_masks(self) -> list[int]:
+        """Bitmask per row (bit c = column c) of the cells where a node can be placed.
+
+        A cell is valid if it and all 8 neighbors are empty or out of bounds, i.e. if the
+        3x3 sliding max of the occupancy is 0. Rows are handled as Python ints, so the
+        horizontal max is two shifts and the vertical one an OR of adjacent rows.
+        """
+        full = (1 << self.width) - 1
+        occupied = [self._occupancy_mask(row) for row in range(self.height)]
+        spread = [(mask | (mask << 1) | (mask >> 1)) & full for mask in occupied]
+        masks = []
+        for row in range(self.height):
+            blocked = spread[row]
+            if row > 0:
+                blocked |= spread[row - 1]
+            if row + 1 < self.height:
+                blocked |= spread[row + 1]
+            masks.append(~blocked & full)
+        return masks
+
+    def _occupancy_mask(self, row: int) -> int:
+        if not self.width:
+            return 0
+        # Column 0 is the lowest bit, so reverse the row before reading it as a binary number
+        return int(self._row_types(row).translate(_OCCUPANCY_DIGITS)[::-1], 2)
     
     def is_cell_empty(self, row: int, col: int) -> bool:
         if not (0 <= row < self.height and 0 <= col < self.width):
             return False
-        return self.cells[row][col].is_empty()
+        return self._types[row * self._stride + col] == EMPTY
     
     def is_cell_empty_or_out_of_bounds(self, row: int, col: int) -> bool:
         if not (0 <= row < self.height and 0 <= col < self.width):
             return True
-        return self.cells[row][col].is_empty()
+        return self._types[row * self._stride + col] == EMPTY
     
     def get_all_empty_cells(self) -> list[tuple[int, int]]:
         empty_cells = []
         for row in range(self.height):
-            for col in range(self.width):
-                if self.cells[row][col].is_empty():
+            for col, cell_type in enumerate(self._row_types(row)):
+                if cell_type == EMPTY:
                     empty_cells.append((row, col))
         return empty_cells
 
     def get_random_valid_node_placement_cell(self) -> tuple[int, int] | None:
-        valid_cells = self.get_all_valid_node_placement_cells()
-        if not valid_cells:
+        if self._placement_index is not None:
+            return self._placement_index.get_random_cell()
+        masks = self.get_valid_node_placement_masks()
+        counts = [mask.bit_count() for mask in masks]
+        total = sum(counts)
+        if not total:
             return None
-        cell = random.choice(valid_cells)
-        return (cell.row, cell.col)
+        # Same single random draw as random.choice over the row-major list of valid cells
+        index = random.randrange(total)
+        for row, row_count in enumerate(counts):
+            if index < row_count:
+                return (row, _nth_set_bit(masks[row], index))
+            index -= row_count
+        return None
 
     def add_row_to_end(self):
-        # Create new row of empty cells
-        new_row = [Cell(self.height, col, CellType.EMPTY, None, None, False, False, value="·") for col in range(self.width)]
-        self.cells.append(new_row)
+        # Append a new row of empty cells
+        self._types.extend(bytes(self._stride))
+        self._occupants.extend(array('i', [NO_OCCUPANT]) * self._stride)
+        self._flags.extend(bytes(self._stride))
         self.height += 1
+        self._row_blockers.append(0)
+        if self._placement_index is not None:
+            self._placement_index.on_row_added_to_end()
+        self._cells_changed(self.height - 1, 0, 1, self.width)
 
     def add_col_to_end(self):
-        # Add a new empty cell to each row
+        # Columns past the width are always empty, so only relayout when the stride is used up
+        if self.width == self._stride:
+            self._relayout(max(1, self._stride * 2))
+        self.width += 1
+        self._col_blockers.append(0)
+        if self._placement_index is not None:
+            self._placement_index.on_col_added_to_end()
+        self._cells_changed(0, self.width - 1, self.height, 1)
+
+    def add_row_to_start(self):
+        # Insert a new row of empty cells on top, shifting existing cells down
+        # (one move of each whole array, so O(cells), not O(1) like adding at the end)
+        self._types[0:0] = bytes(self._stride)
+        self._occupants[0:0] = array('i', [NO_OCCUPANT]) * self._stride
+        self._flags[0:0] = bytes(self._stride)
+        self.height += 1
+        self._row_blockers.insert(0, 0)
+        if self._placement_index is not None:
+            self._placement_index.on_row_added_to_start()
+        self._layout_changed()
+
+    def add_col_to_start(self):
+        # Shift every row one cell to the right within its stride. As the cells past the width are
+        # empty, that is shifting each whole array by one: the last cell of a row's stride becomes
+        # the first of the next row. One move per array, so O(cells), not O(1) like adding at the end.
+        if self.width == self._stride:
+            self._relayout(max(1, self._stride * 2))
+        if self.height:
+            self._types.insert(0, EMPTY)
+            del self._types[-1]
+            self._occupants.insert(0, NO_OCCUPANT)
+            del self._occupants[-1]
+            self._flags.insert(0, 0)
+            del self._flags[-1]
+        self.width += 1
+        self._col_blockers.insert(0, 0)
+        if self._placement_index is not None:
+            self._placement_index.on_col_added_to_start()
+        self._layout_changed()
+
+    def clone_row(self, row: int):
+        # Insert a copy of row right below it
+        start = row * self._stride
+        end = start + self._stride
+        self._types[end:end] = self._types[start:end]
+        self._occupants[end:end] = self._occupants[start:end]
+        self._flags[end:end] = self._flags[start:end]
+        self.height += 1
+        self._row_blockers.insert(row + 1, self._row_blockers[row])
+        for col in self._edge_cols(row + 1):
+            if _BLOCKS_COL_CLONE[self._flags[end + col]]:
+                self._col_blockers[col] += 1
+        if self._placement_index is not None:
+            self._placement_index.on_layout_changed()
+        self._layout_changed()
+
+    def clone_col(self, col: int):
+        # Insert a copy of col right next to it, shifting the cells after it right within the stride
+        if self.width == self._stride:
+            self._relayout(max(1, self._stride * 2))
         for row in range(self.height):
-            self.cells[row].append(Cell(row, self.width, CellType.EMPTY, None, None, False, False, value="·"))
+            start = row * self._stride + col
+            end = row * self._stride + self.width
+            self._types[start + 1:end + 1] = self._types[start:end]
+            self._occupants[start + 1:end + 1] = self._occupants[start:end]
+            self._flags[start + 1:end + 1] = self._flags[start:end]
+            if self._types[start] == EDGE and _BLOCKS_ROW_CLONE[self._flags[start]]:
+                self._row_blockers[row] += 1
         self.width += 1
+        self._col_blockers.insert(col + 1, self._col_blockers[col])
+        if self._placement_index is not None:
+            self._placement_index.on_layout_changed()
+        self._layout_changed()
+
+    def delete_row(self, row: int):
+        start = row * self._stride
+        end = start + self._stride
+        for col in self._edge_cols(row):
+            if _BLOCKS_COL_CLONE[self._flags[start + col]]:
+                self._col_blockers[col] -= 1
+        del self._row_blockers[row]
+        del self._types[start:end]
+        del self._occupants[start:end]
+        del self._flags[start:end]
+        self.height -= 1
+        if self._placement_index is not None:
+            self._placement_index.on_layout_changed()
+        if row == self.height:
+            # The last row is gone, nothing moved
+            self._cells_changed(row, 0, 1, self.width)
+        else:
+            self._layout_changed()
+
+    def delete_col(self, col: int):
+        # Shift the cells after col left within the stride, the freed last cell becomes empty
+        for row in range(self.height):
+            start = row * self._stride + col
+            end = row * self._stride + self.width
+            if self._types[start] == EDGE and _BLOCKS_ROW_CLONE[self._flags[start]]:
+                self._row_blockers[row] -= 1
+            self._types[start:end - 1] = self._types[start + 1:end]
+            self._occupants[start:end - 1] = self._occupants[start + 1:end]
+            self._flags[start:end - 1] = self._flags[start + 1:end]
+            self._types[end - 1] = EMPTY
+            self._occupants[end - 1] = NO_OCCUPANT
+            self._flags[end - 1] = 0
+        self.width -= 1
+        del self._col_blockers[col]
+        if self._placement_index is not None:
+            self._placement_index.on_layout_changed()
+        if col == self.width:
+            # The last col is gone, nothing moved
+            self._cells_changed(0, col, self.height, 1)
+        else:
+            self._layout_changed()
+
+    def delete_rows(self, rows: list[int]):
+        """Remove several rows (sorted) in one pass over the arrays."""
+        removed = set(rows)
+        for row in rows:
+            start = row * self._stride
+            for col in self._edge_cols(row):
+                if _BLOCKS_COL_CLONE[self._flags[start + col]]:
+                    self._col_blockers[col] -= 1
+        kept = [row for row in range(self.height) if row not in removed]
+        stride = self._stride
+        self._types = bytearray().join(self._types[row * stride:(row + 1) * stride] for row in kept)
+        self._flags = bytearray().join(self._flags[row * stride:(row + 1) * stride] for row in kept)
+        occupants = array('i')
+        for row in kept:
+            occupants += self._occupants[row * stride:(row + 1) * stride]
+        self._occupants = occupants
+        self._row_blockers = [self._row_blockers[row] for row in kept]
+        self.height = len(kept)
+        if self._placement_index is not None:
+            self._placement_index.on_layout_changed()
+        self._layout_changed()
+
+    def delete_cols(self, cols: list[int]):
+        """Remove several cols (sorted) in one pass, copying the kept runs of each row to the left."""
+        removed = set(cols)
+        end = self.height * self._stride
+        for col in cols:
+            column_flags = self._flags[col:end:self._stride]
+            for row, cell_type in enumerate(self._types[col:end:self._stride]):
+                if cell_type == EDGE and _BLOCKS_ROW_CLONE[column_flags[row]]:
+                    self._row_blockers[row] -= 1
+        runs = []
+        for col in range(self.width):
+            if col in removed:
+                continue
+            if runs and runs[-1][1] == col:
+                runs[-1][1] = col + 1
+            else:
+                runs.append([col, col + 1])
+        new_width = self.width - len(removed)
+        for row in range(self.height):
+            start = row * self._stride
+            for arrays, empty in ((self._types, bytes(1)), (self._flags, bytes(1)), (self._occupants, array('i', [NO_OCCUPANT]))):
+                kept = [arrays[start + a:start + b] for a, b in runs]
+                target = start
+                for part in kept:
+                    arrays[target:target + len(part)] = part
+                    target += len(part)
+                arrays[start + new_width:start + self.width] = empty * len(removed)
+        self._col_blockers = [self._col_blockers[col] for col in range(self.width) if col not in removed]
+        self.width = new_width
+        if self._placement_index is not None:
+            self._placement_index.on_layout_changed()
+        self._layout_changed()
+
+    def _relayout(self, stride: int):
+        # Copy all rows into freshly allocated arrays with a wider stride
+        padding = stride - self._stride
+        types = bytearray()
+        occupants = array('i')
+        flags = bytearray()
+        for row in range(self.height):
+            start = row * self._stride
+            end = start + self._stride
+            types += self._types[start:end] + bytes(padding)
+            occupants += self._occupants[start:end] + array('i', [NO_OCCUPANT]) * padding
+            flags += self._flags[start:end] + bytes(padding)
+        self._types, self._occupants, self._flags = types, occupants, flags
+        self._stride = stride
 
     def find_manhattan_path(self, start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
         """Find a Manhattan path between two points using only empty cells.
@@ -149,48 +787,617 @@ class Grid:
         start: tuple[int, int],
         end: tuple[int, int],
         start_dir: str,  # 'N', 'S', 'E', 'W'
-        end_dir: str     # 'N', 'S', 'E', 'W'
+        end_dir: str,    # 'N', 'S', 'E', 'W'
+        bend_cost: int = DEFAULT_BEND_COST,
+        crossing_cost: int | None = None,
+        backend: str = 'astar'
     ) -> list[tuple[int, int]]:
         """
         Find a Manhattan path from start to end, where:
         - The first move from start is in start_dir (direction of breathing space)
         - The last move into end is from end_dir (direction of breathing space)
+        Every step costs 1, every change of direction (including the forced
+        first and last moves) costs an additional bend_cost.
+        With a crossing_cost, the path may also cross straight edge cells perpendicularly
+        (see is_crossable) at that extra cost, going straight on through them.
+        Without one, all occupied cells are walls.
+        backend (see ROUTING_BACKENDS) picks the search:
+        - 'astar': the above
+        - 'bidirectional': breadth-first from both ends at once, until the two searches meet
+        - 'jump_point': A* that jumps along straight corridors, only stopping where a side opens up
+        The latter two find a path with the fewest steps, but ignore bend_cost (and can't cross
+        edges), in exchange for visiting far fewer cells on long routes across large grids.
         Returns the path including start and end, or [] if not possible.
         """
-        # Direction deltas
-        DIRS = {'N': (-1, 0), 'S': (1, 0), 'E': (0, 1), 'W': (0, -1)}
-        
-        # First move from start must be in start_dir (breathing space direction)
-        dr, dc = DIRS[start_dir]
+        if backend == 'astar':
+            return self.find_manhattan_path_between_any([(start, start_dir)], [(end, end_dir)], bend_cost, crossing_cost)
+        if backend not in ROUTING_BACKENDS:
+            raise ValueError(f"Unknown routing backend {backend!r}, expected one of {ROUTING_BACKENDS}")
+        if crossing_cost is not None:
+            raise ValueError(f"Crossing edges needs the 'astar' backend, not {backend!r}")
+        dr, dc = ROUTING_DIRECTIONS[start_dir]
         first = (start[0] + dr, start[1] + dc)
-        if not (0 <= first[0] < self.height and 0 <= first[1] < self.width and self.is_cell_empty(first[0], first[1])):
+        dr, dc = ROUTING_DIRECTIONS[end_dir]
+        pre_end = (end[0] + dr, end[1] + dc)
+        if not self.is_cell_empty(first[0], first[1]) or not self.is_cell_empty(pre_end[0], pre_end[1]):
             return []
-            
-        # Last move into end must be from end_dir (breathing space direction)
-        dr_end, dc_end = DIRS[end_dir]
-        pre_end = (end[0] + dr_end, end[1] + dc_end)
-        if not (0 <= pre_end[0] < self.height and 0 <= pre_end[1] < self.width and self.is_cell_empty(pre_end[0], pre_end[1])):
+        if first == end:
+            return [start, end]
+        if first == start or pre_end in (start, end):
             return []
-            
-        # BFS from first to pre_end
-        from collections import deque
-        queue = deque()
-        queue.append((first, [start, first]))
-        visited = set()
-        visited.add(first)
-        
-        while queue:
-            (r, c), path = queue.popleft()
-            if (r, c) == pre_end:
-                return path + [end]
-                
-            # Try directions in order: E, S, W, N (prefer right and down)
-            for dir_name in ['E', 'S', 'W', 'N']:
-                dr, dc = DIRS[dir_name]
+        search = self._find_path_bidirectional if backend == 'bidirectional' else self._find_path_jump_point
+        middle = search(first, pre_end, (start, end))
+        return [start] + middle + [end] if middle else []
+
+    def find_manhattan_path_between_any(
+        self,
+        starts: list[tuple[tuple[int, int], str]],
+        ends: list[tuple[tuple[int, int], str]],
+        bend_cost: int = DEFAULT_BEND_COST,
+        crossing_cost: int | None = None
+    ) -> list[tuple[int, int]]:
+        """
+        Like find_manhattan_path_with_forced_ends, but from any of several (start, start_dir)
+        to any of several (end, end_dir), e.g. all attachment points of two nodes.
+        One search seeded with every start, which stops at the first end it reaches
+        (by the forced last move), so the result is the cheapest path over all pairs.
+        The path never passes through its own start or end, but may pass each of the other candidates once.
+        Returns the path including its start and end, or [] if no pair is connected.
+        """
+        sources = []
+        for start, start_dir in starts:
+            # First move from start must be in start_dir (breathing space direction)
+            dr, dc = ROUTING_DIRECTIONS[start_dir]
+            first = (start[0] + dr, start[1] + dc)
+            if self.is_cell_empty(first[0], first[1]):
+                sources.append((start, first, start_dir))
+        targets = []
+        for end, end_dir in ends:
+            # Last move into end must be from end_dir (breathing space direction)
+            dr, dc = ROUTING_DIRECTIONS[end_dir]
+            pre_end = (end[0] + dr, end[1] + dc)
+            if self.is_cell_empty(pre_end[0], pre_end[1]):
+                targets.append((end, pre_end, OPPOSITE_DIRECTIONS[end_dir]))
+        if not sources or not targets:
+            return []
+        # Without a connection, A* would search everything reachable (in every direction) first
+        components = self._route_components(crossing_cost is not None)
+        if not {components(*first) for _, first, _ in sources} & {components(*pre_end) for _, pre_end, _ in targets}:
+            return []
+        return self._find_path_astar(sources, targets, bend_cost, crossing_cost)
+
+    def _route_components(self, crossings: bool):
+        """Connected areas of the cells routes can go through, as a function (row, col) -> area id.
+
+        The empty cells, with crossings also the edge cells that can be crossed one way or the
+        other. Found once per version of the grid, in one pass over the runs of such cells per row,
+        joining the runs that touch in consecutive rows (union-find). If two cells are in different
+        areas, no route connects them; the same area doesn't guarantee one (the forced moves,
+        crossing only straight on and the edge ends aren't considered).
+        """
+        components = self._components.get(crossings)
+        if components is not None:
+            return components
+        stride, types, flags = self._stride, self._types, self._flags
+        parent = []
+
+        def find(run: int) -> int:
+            while parent[run] != run:
+                parent[run] = parent[parent[run]]
+                run = parent[run]
+            return run
+
+        row_starts, row_ends, row_runs = [], [], []
+        previous = []
+        for row in range(self.height):
+            row_start = row * stride
+            mask = types[row_start:row_start + self.width].translate(_PASSABLE_CODES)
+            if crossings:
+                for col in self._edge_cols(row):
+                    code = flags[row_start + col]
+                    if not (_BLOCKS_ROW_CLONE[code] and _BLOCKS_COL_CLONE[code]):
+                        mask[col] = 1
+            runs = [(match.start(), match.end(), len(parent) + k) for k, match in enumerate(_PASSABLE_RUN.finditer(mask))]
+            parent.extend(run for _, _, run in runs)
+            # Join the runs that share a column with one of the row above
+            i = j = 0
+            while i < len(previous) and j < len(runs):
+                above_start, above_end, above = previous[i]
+                start, end, run = runs[j]
+                if above_start < end and start < above_end:
+                    parent[find(run)] = find(above)
+                if above_end < end:
+                    i += 1
+                else:
+                    j += 1
+            row_starts.append([start for start, _, _ in runs])
+            row_ends.append([end for _, end, _ in runs])
+            row_runs.append([run for _, _, run in runs])
+            previous = runs
+        areas = [find(run) for run in range(len(parent))]
+
+        def components(row: int, col: int) -> int | None:
+            k = bisect_right(row_starts[row], col) - 1
+            if k < 0 or col >= row_ends[row][k]:
+                return None
+            return areas[row_runs[row][k]]
+
+        self._components[crossings] = components
+        return components
+
+    def _find_path_astar(
+        self,
+        sources: list[tuple[tuple[int, int], tuple[int, int], str]],
+        targets: list[tuple[tuple[int, int], tuple[int, int], str]],
+        bend_cost: int,
+        crossing_cost: int | None = None
+    ) -> list[tuple[int, int]]:
+        # A* over (cell, direction of the move into the cell, candidate ends passed) states, so bends
+        # can be priced. Sources are (start, first, first_dir), targets (end, pre_end, last_dir): the
+        # forced moves from start to first and from pre_end into end. A goal is (end, last_dir, _GOAL),
+        # which is only reached by that last move; it is queued with its final cost and never expanded.
+        # A path never goes through its own start (kept per state). With one target, its end is a
+        # wall too; with several, the other candidates may be passed, but only once each, and a path
+        # can't end at one it already passed. The passed ends are a bitmask in the state, so a path
+        # that passed an end doesn't hide a cheaper-to-continue one that can still end there.
+        # The heap is ordered by (f, -g, insertion order): on ties the deeper state wins, which
+        # avoids expanding whole plateaus, and equally deep ones keep the E, S, W, N preference.
+        # Only parent pointers are stored; the path is reconstructed once a goal is popped.
+        height, width, stride, types, flags = self.height, self.width, self._stride, self._types, self._flags
+        goal_states = {(end, last_dir) for end, _, last_dir in targets}
+        single_target = len(targets) == 1
+        walls = {targets[0][0]} if single_target else set()
+        # end -> its bit in the passed mask
+        end_bits = {} if single_target else {end: 1 << k for k, end in enumerate({end for end, _, _ in targets})}
+        tiebreak = count()
+        best_cost = {}
+        parent = {}
+        # state -> start of the path leading to it
+        start_of = {}
+
+        if single_target:
+            _, goal_cell, last_dir = targets[0]
+            goal_row, goal_col = goal_cell
+
+            def estimate_remaining(r: int, c: int, direction: str) -> int:
+                # Manhattan distance to pre_end, the forced step into end, and the bends
+                # the rest of the path needs even without obstacles
+                row_sign = (goal_row > r) - (goal_row < r)
+                col_sign = (goal_col > c) - (goal_col < c)
+                return abs(r - goal_row) + abs(c - goal_col) + 1 + bend_cost * _min_bends(direction, row_sign, col_sign, last_dir)
+        else:
+            top = min(pre_end[0] for _, pre_end, _ in targets)
+            bottom = max(pre_end[0] for _, pre_end, _ in targets)
+            left = min(pre_end[1] for _, pre_end, _ in targets)
+            right = max(pre_end[1] for _, pre_end, _ in targets)
+
+            def estimate_remaining(r: int, c: int, direction: str) -> int:
+                # Manhattan distance to the bounding box of all pre_ends, and the step into an end
+                return max(top - r, 0, r - bottom) + max(left - c, 0, c - right) + 1
+
+        ends = {end for end, _, _ in targets}
+        heap = []
+        for start, first, first_dir in sources:
+            if first in ends:
+                # Points right next to each other: the forced first move already ends the path
+                first_state = (first, first_dir, _GOAL)
+            else:
+                first_state = (first, first_dir, 0)
+            if first_state in best_cost:
+                continue
+            best_cost[first_state] = 0
+            parent[first_state] = None
+            start_of[first_state] = start
+            estimate = 0 if first in ends else estimate_remaining(first[0], first[1], first_dir)
+            heap.append((estimate, 0, next(tiebreak), 0, first_state))
+        heapq.heapify(heap)
+
+        while heap:
+            _, _, _, cost, state = heapq.heappop(heap)
+            if best_cost[state] != cost:
+                continue  # stale heap entry
+            cell, direction, passed = state
+            if passed == _GOAL:
+                path = []
+                while True:
+                    path.append(state[0])
+                    if parent[state] is None:
+                        break
+                    state = parent[state]
+                path.append(start_of[state])
+                path.reverse()
+                return path
+            if single_target and cell == goal_cell:
+                # Only the last move is left from pre_end (going on would have to come back to it)
+                next_dirs = [last_dir]
+            else:
+                next_dirs = ROUTING_ORDER
+            r, c = cell
+            own_start = start_of[state]
+            # On a crossing (an edge cell), the path has to go straight on
+            crossing = types[r * stride + c] != EMPTY
+            for dir_name in next_dirs:
+                if dir_name == OPPOSITE_DIRECTIONS[direction] or (crossing and dir_name != direction):
+                    continue  # never turn back into the previous cell
+                dr, dc = ROUTING_DIRECTIONS[dir_name]
                 nr, nc = r + dr, c + dc
-                if (0 <= nr < self.height and 0 <= nc < self.width and
-                    self.is_cell_empty(nr, nc) and (nr, nc) not in visited):
-                    visited.add((nr, nc))
-                    queue.append(((nr, nc), path + [(nr, nc)]))
-                    
-        return []
\ No newline at end of file
+                if not (0 <= nr < height and 0 <= nc < width):
+                    continue
+                neighbor = (nr, nc)
+                new_cost = cost + 1 + (bend_cost if dir_name != direction else 0)
+                end_bit = end_bits.get(neighbor, 0)
+                if (neighbor, dir_name) in goal_states:
+                    # The forced last move, queued with its final cost
+                    new_state = (neighbor, dir_name, _GOAL)
+                    if neighbor != own_start and not passed & end_bit and new_cost < best_cost.get(new_state, new_cost + 1):
+                        best_cost[new_state] = new_cost
+                        parent[new_state] = state
+                        start_of[new_state] = own_start
+                        heapq.heappush(heap, (new_cost, -new_cost, next(tiebreak), new_cost, new_state))
+                    continue
+                if neighbor == own_start or neighbor in walls or passed & end_bit:
+                    continue
+                i = nr * stride + nc
+                if types[i] != EMPTY:
+                    if crossing_cost is None or types[i] != EDGE:
+                        continue
+                    # Horizontal moves cross cells that don't block cloning their row (straight N-S)
+                    if (_BLOCKS_ROW_CLONE if dr == 0 else _BLOCKS_COL_CLONE)[flags[i]] or self._is_edge_end(i, dr == 0):
+                        continue
+                    new_cost += crossing_cost
+                new_state = (neighbor, dir_name, passed | end_bit)
+                if new_cost < best_cost.get(new_state, new_cost + 1):
+                    best_cost[new_state] = new_cost
+                    parent[new_state] = state
+                    start_of[new_state] = own_start
+                    estimate = new_cost + estimate_remaining(nr, nc, dir_name)
+                    heapq.heappush(heap, (estimate, -new_cost, next(tiebreak), new_cost, new_state))
+
+        return []
+
+    def _find_path_bidirectional(
+        self,
+        first: tuple[int, int],
+        last: tuple[int, int],
+        blocked: tuple[tuple[int, int], ...]
+    ) -> list[tuple[int, int]]:
+        # Breadth-first search from first and from last, always growing the smaller frontier by one
+        # whole layer. Once a layer reaches cells the other side has seen, the cheapest of those meeting
+        # points (both depths added up) is on a shortest path. Cells are flat indices into the arrays.
+        height, width, stride, types = self.height, self.width, self._stride, self._types
+        blocked_indices = {r * stride + c for r, c in blocked}
+        source, target = first[0] * stride + first[1], last[0] * stride + last[1]
+        if source == target:
+            return [first]
+        # Per side: cell -> (parent, depth)
+        seen = ({source: (-1, 0)}, {target: (-1, 0)})
+        frontiers = ([source], [target])
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own, other = seen[side], seen[1 - side]
+            frontier = []
+            meeting, meeting_length = -1, None
+            for i in frontiers[side]:
+                depth = own[i][1] + 1
+                c = i % stride
+                for n in (i + 1 if c + 1 < width else -1, i + stride, i - 1 if c else -1, i - stride):
+                    if n < 0 or n >= height * stride or n in own or types[n] != EMPTY or n in blocked_indices:
+                        continue
+                    own[n] = (i, depth)
+                    frontier.append(n)
+                    if n in other:
+                        length = depth + other[n][1]
+                        if meeting_length is None or length < meeting_length:
+                            meeting, meeting_length = n, length
+            if meeting_length is not None:
+                return self._join_halves(meeting, seen[0], seen[1])
+            frontiers = (frontier, frontiers[1]) if side == 0 else (frontiers[0], frontier)
+        return []
+
+    def _join_halves(self, meeting: int, forward: dict, backward: dict) -> list[tuple[int, int]]:
+        # Cells from the source of forward to the source of backward, through meeting
+        stride = self._stride
+        path = []
+        i = meeting
+        while i != -1:
+            path.append(divmod(i, stride))
+            i = forward[i][0]
+        path.reverse()
+        i = backward[meeting][0]
+        while i != -1:
+            path.append(divmod(i, stride))
+            i = backward[i][0]
+        return path
+
+    def _find_path_jump_point(
+        self,
+        first: tuple[int, int],
+        last: tuple[int, int],
+        blocked: tuple[tuple[int, int], ...]
+    ) -> list[tuple[int, int]]:
+        # Jump point search for 4-connected grids: A* whose successors are the next "jump points" in
+        # each direction, found by running straight on. A horizontal run stops where a cell above or below
+        # opens up after being blocked (a path may have to turn there), a vertical one also where a
+        # horizontal run from it would stop. Straight corridors are then crossed without queueing their
+        # cells. The moves between jump points are straight, so their cost is their length.
+        height, width, stride, types = self.height, self.width, self._stride, self._types
+        goal_row, goal_col = last
+
+        def walkable(r: int, c: int) -> bool:
+            return 0 <= r < height and 0 <= c < width and types[r * stride + c] == EMPTY and (r, c) not in blocked
+
+        # (r, c, dc) -> result of a horizontal jump from there. Every cell a run passes gives the same
+        # result, so each is stored, and the runs vertical jumps start from every step stay linear overall.
+        horizontal_jumps = {}
+
+        def jump_horizontally(r: int, c: int, dc: int) -> tuple[int, int] | None:
+            passed = []
+            found = None
+            while walkable(r, c):
+                key = (r, c, dc)
+                if key in horizontal_jumps:
+                    found = horizontal_jumps[key]
+                    break
+                passed.append(key)
+                if (r == goal_row and c == goal_col) or (walkable(r - 1, c) and not walkable(r - 1, c - dc)) or (walkable(r + 1, c) and not walkable(r + 1, c - dc)):
+                    found = (r, c)
+                    break
+                c += dc
+            for key in passed:
+                horizontal_jumps[key] = found
+            return found
+
+        def jump(r: int, c: int, dr: int, dc: int) -> tuple[int, int] | None:
+            # First jump point from (r, c) on, moving (dr, dc), or None if it runs into a wall
+            if dc:
+                return jump_horizontally(r, c, dc)
+            while walkable(r, c):
+                if (r == goal_row and c == goal_col) or (walkable(r, c - 1) and not walkable(r - dr, c - 1)) or (walkable(r, c + 1) and not walkable(r - dr, c + 1)):
+                    return (r, c)
+                if jump_horizontally(r, c + 1, 1) or jump_horizontally(r, c - 1, -1):
+                    return (r, c)
+                r += dr
+            return None
+
+        def estimate_remaining(r: int, c: int) -> int:
+            return abs(r - goal_row) + abs(c - goal_col)
+
+        tiebreak = count()
+        best_cost = {first: 0}
+        parent = {first: None}
+        heap = [(estimate_remaining(*first), next(tiebreak), 0, first)]
+        while heap:
+            _, _, cost, point = heapq.heappop(heap)
+            if cost > best_cost[point]:
+                continue  # stale heap entry
+            if point == last:
+                return self._expand_jump_points(point, parent)
+            r, c = point
+            previous = parent[point]
+            if previous is None:
+                directions = [ROUTING_DIRECTIONS[dir_name] for dir_name in ROUTING_ORDER]
+            else:
+                # Keep going, or turn to either side; turning back is never needed
+                dr = (r > previous[0]) - (r < previous[0])
+                dc = (c > previous[1]) - (c < previous[1])
+                directions = [(dr, dc), (dc, dr), (-dc, -dr)]
+            for dr, dc in directions:
+                found = jump(r + dr, c + dc, dr, dc)
+                if found is None:
+                    continue
+                new_cost = cost + abs(found[0] - r) + abs(found[1] - c)
+                if new_cost < best_cost.get(found, new_cost + 1):
+                    best_cost[found] = new_cost
+                    parent[found] = point
+                    heapq.heappush(heap, (new_cost + estimate_remaining(*found), next(tiebreak), new_cost, found))
+        return []
+
+    @staticmethod
+    def _expand_jump_points(point: tuple[int, int], parent: dict) -> list[tuple[int, int]]:
+        # Every cell on the straight runs between the jump points leading to point
+        path = [point]
+        while parent[point] is not None:
+            previous = parent[point]
+            dr = (previous[0] > point[0]) - (previous[0] < point[0])
+            dc = (previous[1] > point[1]) - (previous[1] < point[1])
+            r, c = point
+            while (r, c) != previous:
+                r += dr
+                c += dc
+                path.append((r, c))
+            point = previous
+        path.reverse()
+        return path
+
+    def plan_line_insertions(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        start_dir: str,
+        end_dir: str,
+        insertion_cost: int = DEFAULT_INSERTION_COST,
+        bend_cost: int = DEFAULT_BEND_COST,
+        crossing_cost: int | None = None,
+        fixed_row_gaps: set[int] = frozenset(),
+        fixed_col_gaps: set[int] = frozenset()
+    ) -> tuple[list[int], list[int]] | None:
+        """
+        Work out which rows/cols to insert so that find_manhattan_path_with_forced_ends
+        (same arguments) finds a path, in one search.
+        The search runs on the grid with a virtual line in every gap k (before row/col k):
+        - an empty line before the first and after the last line (added at the start/end)
+        - a copy of line k - 1 (what clone_row/clone_col(k - 1) inserts), if that line is clonable,
+          otherwise of line k (same cells as clone_row/clone_col(k)), if that one is
+        Gaps in fixed_row_gaps/fixed_col_gaps get none (e.g. between an attachment point and its node).
+        Entering a virtual line costs insertion_cost on top of the usual costs, so the path
+        uses as few of them as it can.
+        Returns the sorted gaps of the virtual rows and cols the path uses ([], [] if it needs
+        none), or None if there is no path even with insertions.
+        """
+        height, width, stride, types, flags = self.height, self.width, self._stride, self._types, self._flags
+        # Cells live at odd positions of the expanded grid (row r at 2r + 1), gaps at even ones.
+        # Per expanded position: the real line whose cells are shown there, or _EMPTY_LINE/_NO_LINE.
+        def line_sources(size: int, blockers: list[int], fixed: set[int]) -> list[int]:
+            sources = []
+            for gap in range(size + 1):
+                if gap in fixed:
+                    sources.append(_NO_LINE)
+                elif gap == 0 or gap == size:
+                    sources.append(_EMPTY_LINE)
+                elif not blockers[gap - 1]:
+                    sources.append(gap - 1)
+                else:
+                    # Cloning the line after the gap gives the same cells
+                    sources.append(gap if not blockers[gap] else _NO_LINE)
+                if gap < size:
+                    sources.append(gap)
+            return sources
+
+        row_sources = line_sources(height, self._row_blockers, fixed_row_gaps)
+        col_sources = line_sources(width, self._col_blockers, fixed_col_gaps)
+
+        def cell_index(er: int, ec: int) -> int | None:
+            # Index of the real cell shown at an expanded position, -1 if empty by construction
+            row, col = row_sources[er], col_sources[ec]
+            if row == _NO_LINE or col == _NO_LINE:
+                return None
+            if row == _EMPTY_LINE or col == _EMPTY_LINE:
+                return -1
+            return row * stride + col
+
+        start_cell = (2 * start[0] + 1, 2 * start[1] + 1)
+        end_cell = (2 * end[0] + 1, 2 * end[1] + 1)
+        last_dir = OPPOSITE_DIRECTIONS[end_dir]
+        tiebreak = count()
+        start_state = (start_cell, start_dir)
+        best_cost = {start_state: 0}
+        parent = {start_state: None}
+
+        def is_edge_end(er: int, ec: int, horizontal: bool) -> bool:
+            # Like _is_edge_end, but on the expanded grid: a cell is an end of its edge if the next
+            # line it runs into is a node. From a virtual line, that's the real line on either side
+            # (e.g. a clone of an end cell is a middle cell); from a real line, the next real one.
+            reach = 2 if (er if horizontal else ec) % 2 else 1
+            dr, dc = (reach, 0) if horizontal else (0, reach)
+            for nr, nc in ((er - dr, ec - dc), (er + dr, ec + dc)):
+                if 0 <= nr <= 2 * height and 0 <= nc <= 2 * width:
+                    index = cell_index(nr, nc)
+                    if index is not None and index >= 0 and types[index] == NODE:
+                        return True
+            return False
+
+        def estimate_remaining(er: int, ec: int) -> int:
+            # A step between real lines covers 2 expanded positions for a cost of 1
+            return (abs(er - end_cell[0]) + abs(ec - end_cell[1])) // 2
+
+        heap = [(estimate_remaining(*start_cell), 0, next(tiebreak), 0, start_state)]
+        while heap:
+            _, _, _, cost, state = heapq.heappop(heap)
+            if cost > best_cost[state]:
+                continue  # stale heap entry
+            cell, direction = state
+            if cell == end_cell:
+                row_gaps, col_gaps = set(), set()
+                while state is not None:
+                    (er, ec), _ = state
+                    if er % 2 == 0:
+                        row_gaps.add(er // 2)
+                    if ec % 2 == 0:
+                        col_gaps.add(ec // 2)
+                    state = parent[state]
+                return sorted(row_gaps), sorted(col_gaps)
+            er, ec = cell
+            index = cell_index(er, ec)
+            # The forced first move, and straight on through a crossing (an edge cell)
+            straight_only = cell == start_cell or (index is not None and index >= 0 and types[index] != EMPTY)
+            for dir_name in ROUTING_ORDER:
+                if dir_name == OPPOSITE_DIRECTIONS[direction] or (straight_only and dir_name != direction):
+                    continue
+                dr, dc = ROUTING_DIRECTIONS[dir_name]
+                # From a cell, the next one is either the next real line or the virtual line
+                # in the gap before it; from a virtual line, the next real line
+                steps = []
+                if dr:
+                    if er % 2:
+                        steps.append(((er + 2 * dr, ec), 0))
+                    steps.append(((er + dr, ec), insertion_cost if er % 2 else 0))
+                else:
+                    if ec % 2:
+                        steps.append(((er, ec + 2 * dc), 0))
+                    steps.append(((er, ec + dc), insertion_cost if ec % 2 else 0))
+                for neighbor, extra_cost in steps:
+                    nr, nc = neighbor
+                    if not (0 <= nr <= 2 * height and 0 <= nc <= 2 * width):
+                        continue
+                    if neighbor == start_cell:
+                        continue
+                    if neighbor == end_cell:
+                        if dir_name != last_dir:
+                            continue  # end is only entered by the forced last move
+                    else:
+                        neighbor_index = cell_index(nr, nc)
+                        if neighbor_index is None:
+                            continue
+                        if neighbor_index >= 0 and types[neighbor_index] != EMPTY:
+                            if crossing_cost is None or types[neighbor_index] != EDGE:
+                                continue
+                            if (_BLOCKS_ROW_CLONE if dr == 0 else _BLOCKS_COL_CLONE)[flags[neighbor_index]] or is_edge_end(nr, nc, dr == 0):
+                                continue
+                            extra_cost += crossing_cost
+                    new_cost = cost + 1 + extra_cost + (bend_cost if dir_name != direction else 0)
+                    new_state = (neighbor, dir_name)
+                    if new_cost < best_cost.get(new_state, new_cost + 1):
+                        best_cost[new_state] = new_cost
+                        parent[new_state] = state
+                        estimate = new_cost + estimate_remaining(nr, nc)
+                        heapq.heappush(heap, (estimate, -new_cost, next(tiebreak), new_cost, new_state))
+
+        return None
+
+class _CellRows:
+    """Row access for `grid.cells[r][c]`."""
+
+    def __init__(self, grid: Grid):
+        self._grid = grid
+
+    def __len__(self):
+        return self._grid.height
+
+    def __getitem__(self, row: int) -> "_CellRow":
+        if row < 0:
+            row += self._grid.height
+        if not 0 <= row < self._grid.height:
+            raise IndexError("row index out of range")
+        return _CellRow(self._grid, row)
+
+    def __iter__(self):
+        for row in range(self._grid.height):
+            yield _CellRow(self._grid, row)
+
+
+class _CellRow:
+    """A single grid row, building `Cell` objects on read and packing them on write."""
+
+    def __init__(self, grid: Grid, row: int):
+        self._grid = grid
+        self._row = row
+
+    def __len__(self):
+        return self._grid.width
+
+    def _check_col(self, col: int) -> int:
+        if col < 0:
+            col += self._grid.width
+        if not 0 <= col < self._grid.width:
+            raise IndexError("col index out of range")
+        return col
+
+    def __getitem__(self, col: int) -> Cell:
+        return self._grid.get_cell(self._row, self._check_col(col))
+
+    def __setitem__(self, col: int, cell: Cell):
+        self._grid._set_cell_from_object(self._row, self._check_col(col), cell)
+
+    def __iter__(self):
+        for col in range(self._grid.width):
+            yield self._grid.get_cell(self._row, col)
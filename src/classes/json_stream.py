@@ -0,0 +1,116 @@
+import re
+import json
+import codecs
+
+WHITESPACE = re.compile(r'\s*')
+# What may still follow a decoded number at the end of the buffer if the number goes on
+NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+CHUNK_SIZE = 64 * 1024
+
+class JSONStreamReader:
+    """Reads the items of top-level arrays of a JSON object one by one.
+
+    Only the item currently being decoded is held in memory (plus one read chunk),
+    so documents much larger than memory can be processed. Accepts text and binary
+    file-like objects (binary is decoded as UTF-8).
+    """
+
+    def __init__(self, stream, chunk_size: int = CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._bytes_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def iter_array_items(self, keys: set[str]):
+        """Yield (key, item) for every item of the top-level arrays under `keys`.
+
+        Values of all other top-level keys are decoded and dropped.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._decode_value()
+            if not isinstance(key, str):
+                raise ValueError("Expected an object key")
+            self._expect(':')
+            if key in keys and self._peek() == '[':
+                self._pos += 1
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        yield key, self._decode_value()
+                        if self._is_closed_by(']'):
+                            break
+            else:
+                self._decode_value()
+            if self._is_closed_by('}'):
+                return
+
+    def _read_more(self) -> bool:
+        if self._eof:
+            return False
+        chunk = ''
+        while not chunk:
+            raw = self._stream.read(self._chunk_size)
+            if not raw:
+                self._eof = True
+                return False
+            # A multi-byte character cut at the chunk border decodes to '' until completed
+            chunk = self._bytes_decoder.decode(raw) if isinstance(raw, bytes) else raw
+        # Drop what has been consumed already
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self):
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._read_more():
+                return
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            raise ValueError("Unexpected end of JSON stream")
+        return self._buffer[self._pos]
+
+    def _next_char(self) -> str:
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, char: str):
+        if self._next_char() != char:
+            raise ValueError(f"Expected '{char}' at position {self._pos - 1} of the current buffer")
+
+    def _is_closed_by(self, closing: str) -> bool:
+        # After a value there is either the closing bracket or a comma
+        char = self._next_char()
+        if char == closing:
+            return True
+        if char != ',':
+            raise ValueError(f"Expected ',' or '{closing}' at position {self._pos - 1} of the current buffer")
+        return False
+
+    def _decode_value(self):
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Most likely the value continues in the next chunk
+                if not self._read_more():
+                    raise
+                continue
+            if NUMBER_TAIL.match(self._buffer, end) and self._read_more():
+                # A number could be cut off at the chunk border, also right after its '.', 'e' or
+                # sign (then only the part before is decoded), decode again with more data
+                continue
+            self._pos = end
+            return value
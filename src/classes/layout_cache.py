@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Part of every key, bump when the layout pipeline changes its output for the same input
+CACHE_FORMAT_VERSION = 1
+
+@dataclass
+class CachedLayout:
+    layout: dict | None  # ObjectManager.export_to_JSON() of the laid out canvas
+    html: str
+
+class LayoutCache:
+    """On-disk cache of converted canvases, so unchanged diagrams skip the whole layout pipeline.
+
+    Entries are keyed by a hash of the canonicalized canvas JSON plus the layout options and seed
+    (see `key`), and stored as one JSON file each. Writes go through a temporary file and a rename,
+    so several processes can share one cache directory. Every hit touches the entry, and once the
+    entries exceed max_bytes the least recently used ones are deleted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(canvas, options: dict | None = None, seed=None) -> str:
+        """Hash of the canvas (JSON text, bytes or already parsed) and the layout options and seed.
+
+        The canvas is canonicalized first (sorted keys, no whitespace), so reformatting a file
+        doesn't change its key, while reordering nodes or edges does (the layout depends on it).
+        """
+        if isinstance(canvas, (str, bytes, bytearray)):
+            canvas = json.loads(canvas)
+        payload = {'version': CACHE_FORMAT_VERSION, 'canvas': canvas, 'options': options or {}, 'seed': seed}
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> CachedLayout | None:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Unreadable entry (e.g. from an older, crashed writer): drop it, treat as a miss
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted by another process in the meantime, the entry we read is still fine
+        return CachedLayout(layout=entry['layout'], html=entry['html'])
+
+    def put(self, key: str, layout: dict | None, html: str) -> None:
+        data = json.dumps({'layout': layout, 'html': html}, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return  # would evict everything, including itself
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        self._evict()
+
+    def get_or_create(self, key: str, create) -> CachedLayout:
+        """The cached entry for key, or create() -> (layout, html) stored under key."""
+        cached = self.get(key)
+        if cached is None:
+            layout, html = create()
+            self.put(key, layout, html)
+            cached = CachedLayout(layout=layout, html=html)
+        return cached
+
+    def size(self) -> int:
+        """Total size of all entries in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        # Least recently used (oldest mtime) first
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _entries(self) -> list[tuple[int, int, str]]:
+        # (mtime, size, path) of every entry
+        entries = []
+        with os.scandir(self.directory) as it:
+            for dir_entry in it:
+                if dir_entry.name.endswith('.json'):
+                    try:
+                        stat = dir_entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, dir_entry.path))
+        return entries
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
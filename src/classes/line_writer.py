@@ -0,0 +1,46 @@
+import gzip
+import io
+import socket
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+def write_lines(lines, target, buffer_size: int = DEFAULT_BUFFER_SIZE, compress: bool = False) -> None:
+    """Write lines to target, separated by newlines (no trailing newline, like '\\n'.join).
+
+    target can be a text or binary file-like object or a connected socket. Text targets get str,
+    all others UTF-8 bytes, gzip-compressed with compress=True (which needs a non-text target).
+    Lines are collected up to buffer_size characters before each write (0: write every line
+    on its own), so only the current line and the buffer are held in memory.
+    The target is flushed, but not closed.
+    """
+    is_text = isinstance(target, io.TextIOBase)
+    if is_text and compress:
+        raise ValueError("compress needs a binary target")
+    sink = target.makefile('wb') if isinstance(target, socket.socket) else target
+    compressor = gzip.GzipFile(fileobj=sink, mode='wb') if compress else None
+    write = (compressor or sink).write
+
+    buffer = []
+    buffered = 0
+    for i, line in enumerate(lines):
+        if i:
+            buffer.append('\n')
+        buffer.append(line)
+        buffered += len(line) + 1
+        if buffered >= buffer_size:
+            _flush(write, buffer, is_text)
+            buffered = 0
+    _flush(write, buffer, is_text)
+
+    if compressor is not None:
+        compressor.close()  # writes the gzip trailer, leaves sink open
+    if hasattr(sink, 'flush'):
+        sink.flush()
+    if sink is not target:
+        sink.close()  # the socket's file object, not the socket
+
+def _flush(write, buffer: list[str], is_text: bool):
+    if buffer:
+        chunk = ''.join(buffer)
+        write(chunk if is_text else chunk.encode('utf-8'))
+        buffer.clear()
@@ -1,9 +1,39 @@
 from dataclasses import dataclass
+from src.classes.axis_map import AxisMap
+
+class _LinePosition:
+    """Node coordinate. Once the node belongs to an `ObjectManager`, it is stored as the id of
+    its line on the manager's row/col `AxisMap`, so inserting lines before it doesn't touch the node."""
+
+    def __set_name__(self, owner, name):
+        self._name = name
+        self._storage = '_' + name
+        self._axis = '_' + name + 's'
+
+    def __get__(self, node, owner=None):
+        if node is None:
+            raise AttributeError(self._name)  # the dataclass field has no default
+        axis = node.__dict__.get(self._axis)
+        value = node.__dict__[self._storage]
+        return axis.position_of(value) if axis is not None else value
+
+    def __set__(self, node, value):
+        axis = node.__dict__.get(self._axis)
+        if axis is not None:
+            axis.ensure_length(value + 1)
+            value = axis.id_at(value)
+        node.__dict__[self._storage] = value
 
 @dataclass
 class Node:
     id: str
-    row: int
-    col: int
+    row: int = _LinePosition()
+    col: int = _LinePosition()
     width: int
     height: int
+
+    def attach_to_axes(self, rows: AxisMap, cols: AxisMap):
+        """Store row/col as lines of the given axes from now on, keeping their current values."""
+        row, col = self.row, self.col
+        self._rows, self._cols = rows, cols
+        self.row, self.col = row, col
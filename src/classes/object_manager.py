@@ -1,46 +1,168 @@
-from src.classes.grid import Grid
+from bisect import bisect_left, bisect_right
+from itertools import product
+from src.classes.grid import Grid, DEFAULT_INSERTION_COST
 from src.classes.node import Node
-from src.classes.edge import Edge, Attachment
+from src.classes.edge import Edge, Attachment, EdgeSpec, EdgeRoutingResult
+from src.classes.edge_path import EdgePath
 from src.classes.coordinate import Coordinate
-from src.classes.cell import Cell, CellType, Direction
+from src.classes.axis_map import AxisMap
+from src.classes.attachment_point_cache import AttachmentPointCache
+from src.classes.registry import Registry
+from src.classes.cell import CellType, Direction
+from src.classes.json_stream import JSONStreamReader
 
 class ObjectManager:
     def __init__(self):
-        self.nodes = []
-        self.edges = []
+        # Keyed by id, but read like lists
+        self.nodes = Registry()
+        self.edges = Registry()
+        # node id -> {edge id: edge} of the edges attached to it
+        self._edges_of_node = {}
+        # Edge ids drawn by this manager are numbers counting up, never reused after a removal
+        self._next_edge_id = 0
+        # Live occupancy grid, patched in place whenever nodes/edges are added
+        # or the diagram is shifted. Always sized like create_needed_grid_format().
+        self.grid = Grid(width=0, height=0)
+        self.grid.enable_placement_index()
+        # Node and edge coordinates are stored as lines of these axes and resolved on read,
+        # so inserting, cloning or deleting a row/col doesn't rewrite what comes after it
+        self.rows = AxisMap()
+        self.cols = AxisMap()
+        # (row line, col line) of every cell where two edges cross -> ids of the two edges
+        self._crossings = {}
+        # Valid attachment points per node, dropped when the live grid changes around the node
+        self._attachment_points = AttachmentPointCache(self.grid, self._find_valid_attachment_points)
 
     @staticmethod
     def create_from_JSON(json_data):
         obj_manager = ObjectManager()
         for node_data in json_data.get('nodes', []):
-            node = Node(**node_data)
-            obj_manager.add_node(node)
+            obj_manager._add_node_from_JSON(node_data)
         for edge_data in json_data.get('edges', []):
-            cells = [Coordinate(row=cell[0], col=cell[1]) for cell in edge_data['cells']]
-            sender_attachment = Attachment(
-                node_id=edge_data['senderAttachment']['nodeId'],
-                has_arrow=edge_data['senderAttachment']['hasArrow'],
-                node_in_direction=edge_data['senderAttachment']['nodeInDirection']
-            )
-            receiver_attachment = Attachment(
-                node_id=edge_data['receiverAttachment']['nodeId'],
-                has_arrow=edge_data['receiverAttachment']['hasArrow'],
-                node_in_direction=edge_data['receiverAttachment']['nodeInDirection']
-            )
-            edge = Edge(
-                id=edge_data['id'],
-                sender_attachment=sender_attachment,
-                receiver_attachment=receiver_attachment,
-                cells=cells
-            )
-            obj_manager.add_edge(edge)
+            obj_manager._add_edge_from_JSON(edge_data)
+        return obj_manager
+
+    @staticmethod
+    def create_from_JSON_stream(stream):
+        """Like create_from_JSON, but reads the nodes and edges one by one from a
+        text or binary file-like object instead of needing the whole parsed document.
+        """
+        obj_manager = ObjectManager()
+        for key, data in JSONStreamReader(stream).iter_array_items({'nodes', 'edges'}):
+            if key == 'nodes':
+                obj_manager._add_node_from_JSON(data)
+            else:
+                obj_manager._add_edge_from_JSON(data)
         return obj_manager
+
+    def _add_node_from_JSON(self, node_data):
+        self.add_node(Node(**node_data))
+
+    def _add_edge_from_JSON(self, edge_data):
+        cells = EdgePath.from_pairs(edge_data['cells'])
+        sender_attachment = Attachment(
+            node_id=edge_data['senderAttachment']['nodeId'],
+            has_arrow=edge_data['senderAttachment']['hasArrow'],
+            node_in_direction=edge_data['senderAttachment']['nodeInDirection']
+        )
+        receiver_attachment = Attachment(
+            node_id=edge_data['receiverAttachment']['nodeId'],
+            has_arrow=edge_data['receiverAttachment']['hasArrow'],
+            node_in_direction=edge_data['receiverAttachment']['nodeInDirection']
+        )
+        edge = Edge(
+            id=edge_data['id'],
+            sender_attachment=sender_attachment,
+            receiver_attachment=receiver_attachment,
+            cells=cells
+        )
+        self.add_edge(edge)
     
     def add_node(self, node):
-        self.nodes.append(node)
+        self.nodes.add(node)
+        node.attach_to_axes(self.rows, self.cols)
+        self._grow_grid_to(node.row + node.height, node.col + node.width)
+        self._paint_node(self.grid, node)
     
     def add_edge(self, edge):
-        self.edges.append(edge)
+        self.edges.add(edge)
+        edge.cells.attach_to_axes(self.rows, self.cols)
+        for attachment in (edge.sender_attachment, edge.receiver_attachment):
+            self._edges_of_node.setdefault(attachment.node_id, {})[str(edge.id)] = edge
+        if str(edge.id).isdigit():
+            self._next_edge_id = max(self._next_edge_id, int(edge.id) + 1)
+        if edge.cells:
+            self._grow_grid_to(edge.cells.max_row() + 1, edge.cells.max_col() + 1)
+        self._paint_edge(self.grid, edge)
+
+    def get_node(self, id: str) -> Node | None:
+        return self.nodes.get(id)
+
+    def get_edge(self, id: str) -> Edge | None:
+        return self.edges.get(id)
+
+    def get_edges_of_node(self, node_id: str) -> list[Edge]:
+        """All edges attached to the node (as sender or receiver), without going through all edges."""
+        return list(self._edges_of_node.get(node_id, {}).values())
+
+    def remove_edge(self, edge_id: str) -> Edge:
+        """Remove the edge and free its cells on the live grid. Returns the removed edge."""
+        edge = self.edges.remove(edge_id)
+        for attachment in (edge.sender_attachment, edge.receiver_attachment):
+            self._edges_of_node.get(attachment.node_id, {}).pop(str(edge.id), None)
+        for r, c in list(edge.cells.iter_pairs()):
+            crossing = self._crossings.pop((self.rows.id_at(r), self.cols.id_at(c)), None)
+            if crossing is None:
+                self.grid.set_cell(r, c, CellType.EMPTY)
+            else:
+                # Give the cell back to the edge crossed here (its cell there is straight)
+                other = self.edges.get(crossing[0] if crossing[1] == str(edge.id) else crossing[1])
+                i = other.cells.index(Coordinate(row=r, col=c))
+                if i == 0:
+                    previous_direction = Direction[other.sender_attachment.node_in_direction]
+                else:
+                    previous_direction = self._compute_direction(r, c, other.cells[i - 1].row, other.cells[i - 1].col)
+                if i == len(other.cells) - 1:
+                    next_direction = Direction[other.receiver_attachment.node_in_direction]
+                else:
+                    next_direction = self._compute_direction(r, c, other.cells[i + 1].row, other.cells[i + 1].col)
+                self.grid.set_cell(
+                    r, c, CellType.EDGE,
+                    previous_direction, next_direction,
+                    has_arrow_to_previous=i == 0 and other.sender_attachment.has_arrow,
+                    has_arrow_to_next=i == len(other.cells) - 1 and other.receiver_attachment.has_arrow,
+                    occupant_id=str(other.id)
+                )
+        self._shrink_grid_to_content()
+        return edge
+
+    def remove_node(self, node_id: str) -> Node:
+        """Remove the node together with all edges attached to it. Returns the removed node."""
+        for edge in self.get_edges_of_node(node_id):
+            self.remove_edge(edge.id)
+        node = self.nodes.remove(node_id)
+        self._edges_of_node.pop(node_id, None)
+        self._attachment_points.invalidate(node_id)
+        self.grid.fill_rect(node.row, node.col, node.height, node.width, CellType.EMPTY)
+        self._shrink_grid_to_content()
+        return node
+
+    def _shrink_grid_to_content(self) -> None:
+        # After a removal, drop empty rows/cols at the end, so the live grid stays
+        # sized like create_needed_grid_format()
+        while self.grid.height and self.grid.is_row_empty(self.grid.height - 1):
+            self.grid.delete_row(self.grid.height - 1)
+        while self.grid.width and self.grid.is_col_empty(self.grid.width - 1):
+            self.grid.delete_col(self.grid.width - 1)
+
+    def _grow_grid_to(self, height: int, width: int) -> None:
+        # Grow the live grid so it covers at least height x width
+        self.rows.ensure_length(height)
+        self.cols.ensure_length(width)
+        while self.grid.height < height:
+            self.grid.add_row_to_end()
+        while self.grid.width < width:
+            self.grid.add_col_to_end()
     
     def create_needed_grid_format(self) -> tuple[int, int]:
         max_row = 0
@@ -51,9 +173,9 @@ class ObjectManager:
             max_col = max(max_col, node.col + node.width)
         # Check edge cells
         for edge in self.edges:
-            for cell in edge.cells:
-                max_row = max(max_row, cell.row + 1)
-                max_col = max(max_col, cell.col + 1)
+            if edge.cells:
+                max_row = max(max_row, edge.cells.max_row() + 1)
+                max_col = max(max_col, edge.cells.max_col() + 1)
         return (max_row, max_col)
 
     def export_to_JSON(self):
@@ -80,9 +202,7 @@ class ObjectManager:
                     'hasArrow': edge.receiver_attachment.has_arrow,
                     'nodeInDirection': edge.receiver_attachment.node_in_direction
                 },
-                'cells': [
-                    [cell.row, cell.col] for cell in edge.cells
-                ]
+                'cells': edge.cells.to_pairs()
             }
             for edge in self.edges
         ]
@@ -91,49 +211,65 @@ class ObjectManager:
     def make_grid(self) -> Grid:
         height, width = self.create_needed_grid_format()
         grid = Grid(width=width, height=height)
-        # Fill nodes
         for node in self.nodes:
-            for r in range(node.row, node.row + node.height):
-                for c in range(node.col, node.col + node.width):
-                    cell = Cell(r, c, CellType.NODE, None, None, False, False, value="·", occupant_id=node.id)
-                    grid.cells[r][c] = cell
-        # Fill edges
+            self._paint_node(grid, node)
         for edge in self.edges:
-            for i, cell in enumerate(edge.cells):
-                r, c = cell.row, cell.col
-                if i == 0:
-                    # First cell: connects to sender node
-                    connects_to_previous_in_direction = Direction[edge.sender_attachment.node_in_direction]
-                    has_arrow_to_previous = edge.sender_attachment.has_arrow
-                    # Connect to next cell in edge
-                    next_cell = edge.cells[i + 1]
-                    connects_to_next_in_direction = self._compute_direction(r, c, next_cell.row, next_cell.col)
-                    has_arrow_to_next = False
-                elif i == len(edge.cells) - 1:
-                    # Last cell: connects to receiver node
-                    connects_to_next_in_direction = Direction[edge.receiver_attachment.node_in_direction]
-                    has_arrow_to_next = edge.receiver_attachment.has_arrow
-                    # Connect to previous cell in edge
-                    prev_cell = edge.cells[i - 1]
-                    connects_to_previous_in_direction = self._compute_direction(r, c, prev_cell.row, prev_cell.col)
-                    has_arrow_to_previous = False
-                else:
-                    # Middle cell: connects to both previous and next cells
-                    prev_cell = edge.cells[i - 1]
-                    next_cell = edge.cells[i + 1]
-                    connects_to_previous_in_direction = self._compute_direction(r, c, prev_cell.row, prev_cell.col)
-                    connects_to_next_in_direction = self._compute_direction(r, c, next_cell.row, next_cell.col)
-                    has_arrow_to_previous = False
-                    has_arrow_to_next = False
-                edge_cell = Cell(
-                    r, c, CellType.EDGE,
-                    connects_to_previous_in_direction, connects_to_next_in_direction,
-                    has_arrow_to_previous, has_arrow_to_next,
-                    value="·", occupant_id=str(edge.id)
-                )
-                grid.cells[r][c] = edge_cell
+            self._paint_edge(grid, edge)
         return grid
 
+    def _paint_node(self, grid: Grid, node: Node) -> None:
+        grid.fill_rect(node.row, node.col, node.height, node.width, CellType.NODE, occupant_id=node.id)
+
+    def _paint_edge(self, grid: Grid, edge: Edge) -> None:
+        cells = list(edge.cells.iter_pairs())
+        for i, (r, c) in enumerate(cells):
+            if i == 0:
+                # First cell: connects to sender node
+                connects_to_previous_in_direction = Direction[edge.sender_attachment.node_in_direction]
+                has_arrow_to_previous = edge.sender_attachment.has_arrow
+                # Connect to next cell in edge
+                connects_to_next_in_direction = self._compute_direction(r, c, *cells[i + 1])
+                has_arrow_to_next = False
+            elif i == len(cells) - 1:
+                # Last cell: connects to receiver node
+                connects_to_next_in_direction = Direction[edge.receiver_attachment.node_in_direction]
+                has_arrow_to_next = edge.receiver_attachment.has_arrow
+                # Connect to previous cell in edge
+                connects_to_previous_in_direction = self._compute_direction(r, c, *cells[i - 1])
+                has_arrow_to_previous = False
+            else:
+                # Middle cell: connects to both previous and next cells
+                connects_to_previous_in_direction = self._compute_direction(r, c, *cells[i - 1])
+                connects_to_next_in_direction = self._compute_direction(r, c, *cells[i + 1])
+                has_arrow_to_previous = False
+                has_arrow_to_next = False
+                if self._paint_crossing(grid, r, c, str(edge.id), connects_to_previous_in_direction, connects_to_next_in_direction):
+                    continue
+            grid.set_cell(
+                r, c, CellType.EDGE,
+                connects_to_previous_in_direction, connects_to_next_in_direction,
+                has_arrow_to_previous, has_arrow_to_next,
+                occupant_id=str(edge.id)
+            )
+
+    def _paint_crossing(self, grid: Grid, r: int, c: int, edge_id: str, previous: Direction, next: Direction) -> bool:
+        # If a straight middle cell goes perpendicularly across a straight cell of another edge,
+        # turn that cell into a crossing (keeping the other edge as occupant) and return True
+        occupant = grid.get_occupant_id(r, c)
+        if occupant is None or occupant == edge_id:
+            return False
+        if {previous, next} == {Direction.E, Direction.W}:
+            horizontal = True
+        elif {previous, next} == {Direction.N, Direction.S}:
+            horizontal = False
+        else:
+            return False
+        if not grid.is_crossable(r, c, horizontal):
+            return False
+        grid.set_cell(r, c, CellType.EDGE, occupant_id=occupant, is_crossing=True)
+        self._crossings[(self.rows.id_at(r), self.cols.id_at(c))] = (occupant, edge_id)
+        return True
+
     def _compute_direction(self, r1: int, c1: int, r2: int, c2: int) -> Direction:
         if r1 < r2:
             return Direction.S
@@ -151,32 +287,196 @@ class ObjectManager:
         self.add_node(Node(id=id, row=row, col=col, width=1, height=1))
 
     def add_node_at_valid_spot(self, id):
-        grid = self.make_grid()
-        coord = grid.get_random_valid_node_placement_cell()
+        coord = self.grid.get_random_valid_node_placement_cell()
         if coord is None:
             raise ValueError("No valid placement for new node")
         row, col = coord
         self.add_node_at_coordinate(id, row, col)
 
     def add_row_to_start(self):
-        # Increment row of all nodes
-        for node in self.nodes:
-            node.row += 1
-        
-        # Increment row of all edge cells
-        for edge in self.edges:
-            for cell in edge.cells:
-                cell.row += 1
+        # Moves every node and edge cell down by one. They keep their line ids, so only the live
+        # grid is touched, which moves its arrays (O(cells), see Grid.add_row_to_start)
+        self.rows.insert(0)
+        if self.grid.height:
+            self.grid.add_row_to_start()
 
     def add_col_to_start(self):
-        # Increment column of all nodes
-        for node in self.nodes:
-            node.col += 1
-        
-        # Increment column of all edge cells
+        # Moves every node and edge cell right by one, like add_row_to_start
+        self.cols.insert(0)
+        if self.grid.width:
+            self.grid.add_col_to_start()
+
+    def clone_row(self, row: int):
+        """Insert a copy of row below it.
+
+        Nodes on the row get one row taller, edges crossing it one cell longer. Only rows whose
+        edge cells all run straight across (N-S) without arrows can be cloned. Nothing below the
+        row is rewritten, it moves along with its lines in `self.rows`.
+        """
+        nodes, crossings = self._get_line_occupants(self.grid.height, row, self._get_row_cells(row), {Direction.N, Direction.S}, "clone row")
+        self.rows.insert(row + 1)
+        for node in nodes:
+            node.height += 1
+        for edge, cell, next_direction in crossings:
+            index = edge.cells.index(cell)
+            # The copy goes between the cell and its neighbor below
+            edge.cells.insert(index + 1 if next_direction == Direction.S else index, Coordinate(row=row + 1, col=cell.col))
+        self.grid.clone_row(row)
+
+    def clone_column(self, col: int):
+        """Insert a copy of col right of it, like clone_row. Edge cells have to run E-W."""
+        nodes, crossings = self._get_line_occupants(self.grid.width, col, self._get_col_cells(col), {Direction.E, Direction.W}, "clone column")
+        self.cols.insert(col + 1)
+        for node in nodes:
+            node.width += 1
+        for edge, cell, next_direction in crossings:
+            index = edge.cells.index(cell)
+            edge.cells.insert(index + 1 if next_direction == Direction.E else index, Coordinate(row=cell.row, col=col + 1))
+        self.grid.clone_col(col)
+
+    def delete_row(self, row: int):
+        """Remove row, the inverse of clone_row.
+
+        Nodes on the row get one row shorter, edges crossing it one cell shorter. Besides the
+        clone_row conditions, no node may lose its last row, and no edge may be left with fewer than 2 cells
+        or with a crossing as its first or last cell.
+        """
+        nodes, crossings = self._get_line_occupants(self.grid.height, row, self._get_row_cells(row), {Direction.N, Direction.S}, "delete row")
+        self._check_line_deletable(nodes, crossings, "height", "delete row")
+        for edge, cell, _ in crossings:
+            del edge.cells[edge.cells.index(cell)]
+        starting_here = [node for node in nodes if node.row == row]
+        self.rows.delete(row)
+        for node in nodes:
+            node.height -= 1
+        for node in starting_here:
+            node.row = row  # now the line that was below
+        self.grid.delete_row(row)
+
+    def delete_column(self, col: int):
+        """Remove col, the inverse of clone_column."""
+        nodes, crossings = self._get_line_occupants(self.grid.width, col, self._get_col_cells(col), {Direction.E, Direction.W}, "delete column")
+        self._check_line_deletable(nodes, crossings, "width", "delete column")
+        for edge, cell, _ in crossings:
+            del edge.cells[edge.cells.index(cell)]
+        starting_here = [node for node in nodes if node.col == col]
+        self.cols.delete(col)
+        for node in nodes:
+            node.width -= 1
+        for node in starting_here:
+            node.col = col
+        self.grid.delete_col(col)
+
+    def get_clonable_rows(self) -> list[int]:
+        """Rows clone_row accepts, from counters the live grid keeps up to date on every write."""
+        return self.grid.get_clonable_rows()
+
+    def get_clonable_columns(self) -> list[int]:
+        return self.grid.get_clonable_cols()
+
+    def purge_redundant_rows(self) -> int:
+        """Remove every row that is an exact copy of the row above it, returns how many.
+
+        The rows are found in one pass over the live grid (see Grid.get_redundant_rows), then
+        nodes are shrunk and edge cells dropped in one pass each, instead of per removed row.
+        Rows an edge needs to keep 2 cells (one per end) stay.
+        """
+        lines = self._spare_edge_ends({self.rows.id_at(row): row for row in self.grid.get_redundant_rows()}, 'rows')
+        rows = sorted(lines.values())
+        if rows:
+            line_ids = set(lines)
+            for node in self.nodes:
+                node.height -= bisect_left(rows, node.row + node.height) - bisect_left(rows, node.row)
+            for edge in self.edges:
+                edge.cells.remove_lines(rows=line_ids)
+            for row in reversed(rows):
+                self.rows.delete(row)
+            self.grid.delete_rows(rows)
+        return len(rows)
+
+    def purge_redundant_columns(self) -> int:
+        """Like purge_redundant_rows, for columns that are a copy of the column left of them."""
+        lines = self._spare_edge_ends({self.cols.id_at(col): col for col in self.grid.get_redundant_cols()}, 'cols')
+        cols = sorted(lines.values())
+        if cols:
+            line_ids = set(lines)
+            for node in self.nodes:
+                node.width -= bisect_left(cols, node.col + node.width) - bisect_left(cols, node.col)
+            for edge in self.edges:
+                edge.cells.remove_lines(cols=line_ids)
+            for col in reversed(cols):
+                self.cols.delete(col)
+            self.grid.delete_cols(cols)
+        return len(cols)
+
+    def _spare_edge_ends(self, lines: dict[int, int], axis: str) -> dict[int, int]:
+        # Drop lines (line id -> position) from the ones to remove until no edge would be left
+        # with fewer than 2 cells. Any subset of redundant lines can be removed, and keeping a line
+        # for one edge never hurts another.
         for edge in self.edges:
-            for cell in edge.cells:
-                cell.col += 1
+            hits = edge.cells.cells_on_lines(**{axis: lines.keys()})
+            while hits and len(edge.cells) - len(hits) < 2:
+                kept = hits[-1]
+                del lines[kept]
+                hits = [line for line in hits if line != kept]
+        return lines
+
+    def _get_row_cells(self, row: int):
+        return ((row, col) for col in range(self.grid.width))
+
+    def _get_col_cells(self, col: int):
+        return ((row, col) for row in range(self.grid.height))
+
+    def _get_line_occupants(self, length: int, index: int, cells, across: set[Direction], action: str):
+        # Nodes on a row/col, and (edge, cell, next direction) for every edge cell on it,
+        # checking that all edge cells cross the line straight and without arrows
+        if not 0 <= index < length:
+            raise IndexError(f"Cannot {action}: index {index} out of range")
+        nodes = {}
+        crossings = []
+        for r, c in cells:
+            cell = self.grid.get_cell(r, c)
+            if cell.cell_type == CellType.NODE:
+                nodes[cell.occupant_id] = self.nodes.get(cell.occupant_id)
+            elif cell.cell_type == CellType.EDGE:
+                if cell.has_arrow_to_previous or cell.has_arrow_to_next:
+                    raise ValueError(f"Cannot {action}: contains edge cell with arrow")
+                if {cell.connects_to_previous_in_direction, cell.connects_to_next_in_direction} != across:
+                    raise ValueError(f"Cannot {action}: contains edge cell running along it")
+                crossings.append((self.edges.get(cell.occupant_id), Coordinate(row=r, col=c), cell.connects_to_next_in_direction))
+        return list(nodes.values()), crossings
+
+    def _check_line_deletable(self, nodes, crossings, size: str, action: str):
+        for node in nodes:
+            if getattr(node, size) == 1:
+                raise ValueError(f"Cannot {action}: node {node.id} would be removed")
+        cells_removed = {}
+        for edge, cell, _ in crossings:
+            cells_removed.setdefault(id(edge), (edge, []))[1].append(cell)
+        for edge, cells in cells_removed.values():
+            # An edge needs a cell at each end to connect its two nodes
+            if len(edge.cells) - len(cells) < 2:
+                raise ValueError(f"Cannot {action}: edge {edge.id} would have fewer than 2 cells left")
+            # ...which can't be a crossing, that goes straight through. The cells removed from
+            # one line are never next to each other, so the new ends are at most one cell in.
+            first = edge.cells[1] if edge.cells[0] in cells else edge.cells[0]
+            last = edge.cells[-2] if edge.cells[-1] in cells else edge.cells[-1]
+            for end in (first, last):
+                if (self.rows.id_at(end.row), self.cols.id_at(end.col)) in self._crossings:
+                    raise ValueError(f"Cannot {action}: edge {edge.id} would end in a crossing")
+
+    def get_node_at(self, row: int, col: int) -> Node | None:
+        """The node owning the cell, looked up in the occupant raster of the live grid."""
+        return self.nodes.get(self.grid.get_occupant_id(row, col))
+
+    def get_edge_at(self, row: int, col: int) -> Edge | None:
+        return self.edges.get(self.grid.get_occupant_id(row, col))
+
+    def get_nodes_in_rect(self, row: int, col: int, height: int, width: int) -> list[Node]:
+        """Nodes overlapping the rectangle, without going through all nodes."""
+        occupant_ids = self.grid.get_occupant_ids_in_rect(row, col, height, width)
+        nodes = (self.nodes.get(id) for id in occupant_ids)
+        return [node for node in nodes if node is not None]
 
     def get_neighboring_cell_coords(self, node) -> list[tuple[int, int]]:
         """Return all orthogonal (N, S, E, W) coordinates around the node (may be out of bounds)."""
@@ -197,7 +497,7 @@ class ObjectManager:
 
     def find_all_empty_neighbors(self, node) -> list[tuple[int, int]]:
         """Find all empty cells that are direct neighbors of a node."""
-        grid = self.make_grid()
+        grid = self.grid
         neighbors = self.get_neighboring_cell_coords(node)
         return [coord for coord in neighbors if 0 <= coord[0] < grid.height and 0 <= coord[1] < grid.width and grid.is_cell_empty(coord[0], coord[1])]
 
@@ -207,8 +507,12 @@ class ObjectManager:
         A valid attachment point must:
         1. Be an empty cell adjacent to the node (orthogonal only)
         2. Have another empty cell in the same direction for "breathing space"
+        Cached per node until the live grid changes within two cells of it (see AttachmentPointCache).
         """
-        grid = self.make_grid()
+        return self._attachment_points.get(node)
+
+    def _find_valid_attachment_points(self, node) -> list[tuple[int, int]]:
+        grid = self.grid
         valid_points = []
         for (row, col) in self.get_neighboring_cell_coords(node):
             # Only consider in-bounds
@@ -236,27 +540,52 @@ class ObjectManager:
         self,
         sender_node: Node,
         receiver_node: Node,
-        sender_attachment_point: tuple[int, int],
-        receiver_attachment_point: tuple[int, int],
+        sender_attachment_point: tuple[int, int] | None = None,
+        receiver_attachment_point: tuple[int, int] | None = None,
         has_arrow_sender: bool = False,
-        has_arrow_receiver: bool = False
+        has_arrow_receiver: bool = False,
+        crossing_cost: int | None = None,
+        make_space: bool = False
     ) -> None:
         """Draw an edge between two nodes using Manhattan path with forced first/last move directions.
+        sender/receiver_attachment_point: None to let the route pick any of the node's valid
+        attachment points (one search over all of them, see Grid.find_manhattan_path_between_any)
         has_arrow_sender/receiver: whether to draw an arrow at the sender/receiver attachment point
+        crossing_cost: if given, the edge may cross straight cells of other edges at this extra cost
+        (see Grid.find_manhattan_path_with_forced_ends), which become "┼" crossings
+        make_space: if there is no path, insert the rows/cols it needs (see make_space_for_edge,
+        for the closest pair of distinct points) and route again, so at most three searches instead of failing.
+        Without a given point, any empty cell next to the node is a candidate then, inserted lines
+        can give it its breathing space (e.g. for a node boxed in by others).
+        Inserted lines the final route doesn't go through are deleted again.
         """
-        grid = self.make_grid()
-        # Get directions: from node TO attachment point (direction of breathing space)
-        sender_dir = self._get_direction_from_node_to_point(sender_node, sender_attachment_point)
-        receiver_dir = self._get_direction_from_node_to_point(receiver_node, receiver_attachment_point)
-        # Find path with forced ends
-        path = grid.find_manhattan_path_with_forced_ends(
-            sender_attachment_point, receiver_attachment_point, sender_dir, receiver_dir
-        )
+        sender_points = self._get_candidate_attachment_points(sender_node, sender_attachment_point)
+        receiver_points = self._get_candidate_attachment_points(receiver_node, receiver_attachment_point)
+        path = self._route_between_points(sender_node, receiver_node, sender_points, receiver_points, crossing_cost)
+        if not path and make_space:
+            # Inserted lines can give the breathing space, so any empty cell next to a node will do
+            if sender_attachment_point is None:
+                sender_points = self.find_all_empty_neighbors(sender_node)
+            if receiver_attachment_point is None:
+                receiver_points = self.find_all_empty_neighbors(receiver_node)
+        # A cell both nodes could attach to can't hold an edge between them
+        pairs = [(sender_point, receiver_point) for sender_point, receiver_point in product(sender_points, receiver_points) if sender_point != receiver_point]
+        if not path and make_space and pairs:
+            sender_point, receiver_point = min(
+                pairs, key=lambda pair: abs(pair[0][0] - pair[1][0]) + abs(pair[0][1] - pair[1][1])
+            )
+            sender_point, receiver_point, inserted_rows, inserted_cols = self._make_space_for_edge(
+                sender_node, receiver_node, sender_point, receiver_point, crossing_cost=crossing_cost
+            )
+            path = self._route_between_points(sender_node, receiver_node, [sender_point], [receiver_point], crossing_cost)
+            if path:
+                path = self._delete_unused_lines(path, inserted_rows, inserted_cols)
         if not path:
             raise ValueError("No valid path exists between attachment points with required breathing space moves")
+        sender_attachment_point, receiver_attachment_point = path[0], path[-1]
         # Create edge
         edge = Edge(
-            id=str(len(self.edges)),
+            id=str(self._next_edge_id),
             sender_attachment=Attachment(
                 node_id=sender_node.id,
                 has_arrow=has_arrow_sender,
@@ -267,10 +596,177 @@ class ObjectManager:
                 has_arrow=has_arrow_receiver,
                 node_in_direction=self._get_direction_from_point_to_node(receiver_attachment_point, receiver_node)
             ),
-            cells=[Coordinate(row=r, col=c) for r, c in path]
+            cells=EdgePath.from_pairs(path)
         )
         self.add_edge(edge)
 
+    def _get_candidate_attachment_points(self, node: Node, point: tuple[int, int] | None) -> list[tuple[int, int]]:
+        return [point] if point is not None else self.get_valid_attachment_points(node)
+
+    def _route_between_points(self, sender_node: Node, receiver_node: Node, sender_points, receiver_points, crossing_cost: int | None) -> list[tuple[int, int]]:
+        # Directions: from node TO attachment point (direction of breathing space)
+        return self.grid.find_manhattan_path_between_any(
+            [(point, self._get_direction_from_node_to_point(sender_node, point)) for point in sender_points],
+            [(point, self._get_direction_from_node_to_point(receiver_node, point)) for point in receiver_points],
+            crossing_cost=crossing_cost
+        )
+
+    def make_space_for_edge(
+        self,
+        sender_node: Node,
+        receiver_node: Node,
+        sender_attachment_point: tuple[int, int],
+        receiver_attachment_point: tuple[int, int],
+        insertion_cost: int = DEFAULT_INSERTION_COST,
+        crossing_cost: int | None = None
+    ) -> tuple[tuple[int, int], tuple[int, int]]:
+        """Insert exactly the rows/cols an edge between the attachment points needs to be routable.
+
+        Where is worked out in one search (see Grid.plan_line_insertions), never between an
+        attachment point and its node. Then empty lines are added at the start/end, and everywhere
+        else the line before (or after) the gap is cloned. A point's breathing space may still be
+        occupied, a line inserted in front of the point then provides it. Returns the attachment points, moved
+        along with their lines. Raises ValueError if no insertions make the edge routable
+        (e.g. if it is enclosed by other edges and may not cross them).
+        """
+        sender_point, receiver_point, _, _ = self._make_space_for_edge(
+            sender_node, receiver_node, sender_attachment_point, receiver_attachment_point, insertion_cost, crossing_cost
+        )
+        return sender_point, receiver_point
+
+    def _make_space_for_edge(
+        self,
+        sender_node: Node,
+        receiver_node: Node,
+        sender_attachment_point: tuple[int, int],
+        receiver_attachment_point: tuple[int, int],
+        insertion_cost: int = DEFAULT_INSERTION_COST,
+        crossing_cost: int | None = None
+    ) -> tuple[tuple[int, int], tuple[int, int], list[int], list[int]]:
+        # make_space_for_edge, also returning where the inserted rows and cols are now
+        sender_dir = self._get_direction_from_node_to_point(sender_node, sender_attachment_point)
+        receiver_dir = self._get_direction_from_node_to_point(receiver_node, receiver_attachment_point)
+        fixed_row_gaps, fixed_col_gaps = set(), set()
+        for (r, c), direction in ((sender_attachment_point, sender_dir), (receiver_attachment_point, receiver_dir)):
+            # The gap between the point and its node (gap k is before line k)
+            if direction == "N":
+                fixed_row_gaps.add(r + 1)
+            elif direction == "S":
+                fixed_row_gaps.add(r)
+            elif direction == "W":
+                fixed_col_gaps.add(c + 1)
+            else:
+                fixed_col_gaps.add(c)
+        plan = self.grid.plan_line_insertions(
+            sender_attachment_point, receiver_attachment_point, sender_dir, receiver_dir,
+            insertion_cost=insertion_cost, crossing_cost=crossing_cost,
+            fixed_row_gaps=fixed_row_gaps, fixed_col_gaps=fixed_col_gaps
+        )
+        if plan is None:
+            raise ValueError("No valid path exists between attachment points, even with inserted rows/cols")
+        row_gaps, col_gaps = plan
+        # Back to front, so the gaps still to do keep their positions
+        for gap in reversed(row_gaps):
+            if gap == 0:
+                self.add_row_to_start()
+            elif gap == self.grid.height:
+                self._grow_grid_to(self.grid.height + 1, self.grid.width)
+            else:
+                # Same line the plan copied into the gap (lines before the gap haven't changed yet)
+                self.clone_row(gap - 1 if self.grid.is_row_clonable(gap - 1) else gap)
+        for gap in reversed(col_gaps):
+            if gap == 0:
+                self.add_col_to_start()
+            elif gap == self.grid.width:
+                self._grow_grid_to(self.grid.height, self.grid.width + 1)
+            else:
+                self.clone_column(gap - 1 if self.grid.is_col_clonable(gap - 1) else gap)
+
+        def moved(point: tuple[int, int]) -> tuple[int, int]:
+            # Every line inserted in a gap at or before the point's line pushes it on by one
+            r, c = point
+            return (r + bisect_right(row_gaps, r), c + bisect_right(col_gaps, c))
+
+        # The line put into gap k is pushed on by the ones put into the gaps before it
+        inserted_rows = [gap + i for i, gap in enumerate(row_gaps)]
+        inserted_cols = [gap + i for i, gap in enumerate(col_gaps)]
+        return moved(sender_attachment_point), moved(receiver_attachment_point), inserted_rows, inserted_cols
+
+    def _delete_unused_lines(self, path: list[tuple[int, int]], inserted_rows: list[int], inserted_cols: list[int]) -> list[tuple[int, int]]:
+        # Delete the inserted lines the final route doesn't go through (it may differ from the
+        # planned one), so only lines the edge needs stay. Returns the path, moved along.
+        # An inserted line is empty or a copy of its neighbor, so deleting it is the inverse of inserting it.
+        unused_rows = sorted(set(inserted_rows) - {r for r, _ in path})
+        unused_cols = sorted(set(inserted_cols) - {c for _, c in path})
+        for row in reversed(unused_rows):
+            self.delete_row(row)
+        for col in reversed(unused_cols):
+            self.delete_column(col)
+        return [(r - bisect_left(unused_rows, r), c - bisect_left(unused_cols, c)) for r, c in path]
+
+    def draw_edges(self, specs: list[EdgeSpec], order: str = "given", crossing_cost: int | None = None) -> list[EdgeRoutingResult]:
+        """Route many edges against the shared live grid, one after another.
+
+        order: "given", "shortest_first" (by Manhattan distance between the attachment points)
+        or "most_constrained_first" (fewest free cells around the attachment points, measured
+        before routing starts). Edges routed earlier block later ones, so the order matters.
+        A failing edge does not stop the batch; results are returned in the order of specs.
+        With a crossing_cost, edges may cross earlier ones (see draw_edge), so far fewer fail.
+        """
+        if order == "given":
+            ordered = list(specs)
+        elif order == "shortest_first":
+            ordered = sorted(specs, key=self._get_attachment_distance)
+        elif order == "most_constrained_first":
+            free_cells = {id(spec): self._count_free_cells_around_attachments(spec) for spec in specs}
+            ordered = sorted(specs, key=lambda spec: free_cells[id(spec)])
+        else:
+            raise ValueError(f"Unknown edge ordering: {order}")
+
+        results = {}
+        for spec in ordered:
+            result = EdgeRoutingResult(spec=spec)
+            try:
+                for point in (spec.sender_attachment_point, spec.receiver_attachment_point):
+                    if point is not None and not self.grid.is_cell_empty(*point):
+                        raise ValueError(f"Attachment point {point} is not an empty cell")
+                self.draw_edge(
+                    sender_node=spec.sender_node,
+                    receiver_node=spec.receiver_node,
+                    sender_attachment_point=spec.sender_attachment_point,
+                    receiver_attachment_point=spec.receiver_attachment_point,
+                    has_arrow_sender=spec.has_arrow_sender,
+                    has_arrow_receiver=spec.has_arrow_receiver,
+                    crossing_cost=crossing_cost
+                )
+                result.edge = self.edges[-1]
+            except ValueError as e:
+                result.error = str(e)
+            results[id(spec)] = result
+        return [results[id(spec)] for spec in specs]
+
+    def _get_attachment_distance(self, spec: EdgeSpec) -> int:
+        # Of the closest pair, if the points are left to the route
+        sender_points, receiver_points = self._get_spec_points(spec)
+        if not sender_points or not receiver_points:
+            return 0  # can't be routed, fails right away
+        return min(abs(r1 - r2) + abs(c1 - c2) for (r1, c1), (r2, c2) in product(sender_points, receiver_points))
+
+    def _count_free_cells_around_attachments(self, spec: EdgeSpec) -> int:
+        free = 0
+        for points in self._get_spec_points(spec):
+            for r, c in points:
+                for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                    if self.grid.is_cell_empty(r + dr, c + dc):
+                        free += 1
+        return free
+
+    def _get_spec_points(self, spec: EdgeSpec) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+        return (
+            self._get_candidate_attachment_points(spec.sender_node, spec.sender_attachment_point),
+            self._get_candidate_attachment_points(spec.receiver_node, spec.receiver_attachment_point)
+        )
+
     def _get_direction_from_node_to_point(self, node: Node, point: tuple[int, int]) -> str:
         # Returns the direction from the nearest part of the node to the attachment point
         r, c = point
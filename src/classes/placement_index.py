@@ -0,0 +1,133 @@
+import random
+
+class PlacementIndex:
+    """Maintained set of the cells of a `Grid` where a node can be placed.
+
+    A cell is a valid placement if it and all 8 neighbors are empty or out of bounds.
+    Writing a cell can only change the validity of its 3x3 neighborhood, so the `Grid`
+    reports every write and growth step and only those cells are re-checked.
+
+    Cells are kept in a list plus a position dict, so adding, removing and picking a random
+    cell are O(1). Inserting rows/cols at the start shifts every coordinate, so cells are
+    stored relative to the number of rows/cols inserted at the start so far.
+    Other layout changes (cloning or deleting rows/cols) mark the index stale, and it is
+    rebuilt on the next query, so a series of them costs one rebuild.
+    """
+
+    def __init__(self, grid):
+        self._grid = grid
+        self._rebuild()
+
+    def _rebuild(self):
+        self._row_shift = 0
+        self._col_shift = 0
+        self._cells = []
+        self._positions = {}
+        self._stale = False
+        for row, mask in enumerate(self._grid.get_valid_node_placement_masks()):
+            col = 0
+            while mask:
+                if mask & 1:
+                    self._add(row, col)
+                mask >>= 1
+                col += 1
+
+    def _refresh(self):
+        if self._stale:
+            self._rebuild()
+
+    def __len__(self):
+        self._refresh()
+        return len(self._cells)
+
+    def __contains__(self, coord: tuple[int, int]) -> bool:
+        self._refresh()
+        return (coord[0] - self._row_shift, coord[1] - self._col_shift) in self._positions
+
+    def get_all_cells(self) -> list[tuple[int, int]]:
+        """All valid placement cells in row-major order."""
+        self._refresh()
+        return sorted((row + self._row_shift, col + self._col_shift) for row, col in self._cells)
+
+    def get_random_cell(self) -> tuple[int, int] | None:
+        self._refresh()
+        if not self._cells:
+            return None
+        row, col = random.choice(self._cells)
+        return (row + self._row_shift, col + self._col_shift)
+
+    def _add(self, row: int, col: int):
+        key = (row - self._row_shift, col - self._col_shift)
+        if key not in self._positions:
+            self._positions[key] = len(self._cells)
+            self._cells.append(key)
+
+    def _remove(self, row: int, col: int):
+        key = (row - self._row_shift, col - self._col_shift)
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        # Swap the last cell into the freed slot
+        last = self._cells.pop()
+        if position < len(self._cells):
+            self._cells[position] = last
+            self._positions[last] = position
+
+    def _is_valid(self, row: int, col: int) -> bool:
+        grid = self._grid
+        if not grid.is_cell_empty(row, col):
+            return False
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if not grid.is_cell_empty_or_out_of_bounds(row + dr, col + dc):
+                    return False
+        return True
+
+    def _recheck(self, row: int, col: int):
+        if self._is_valid(row, col):
+            self._add(row, col)
+        else:
+            self._remove(row, col)
+
+    def on_layout_changed(self):
+        self._stale = True
+
+    def on_rect_written(self, row: int, col: int, height: int, width: int, occupied: bool):
+        """Update after the cells of a rectangle were all set to occupied or all emptied."""
+        if self._stale:
+            return
+        for r in range(max(0, row - 1), min(self._grid.height, row + height + 1)):
+            for c in range(max(0, col - 1), min(self._grid.width, col + width + 1)):
+                if occupied:
+                    self._remove(r, c)
+                else:
+                    self._recheck(r, c)
+
+    def on_row_added_to_end(self):
+        if self._stale:
+            return
+        # Only the new row can contain new valid cells; the old last row stays as it was
+        row = self._grid.height - 1
+        for col in range(self._grid.width):
+            self._recheck(row, col)
+
+    def on_col_added_to_end(self):
+        if self._stale:
+            return
+        col = self._grid.width - 1
+        for row in range(self._grid.height):
+            self._recheck(row, col)
+
+    def on_row_added_to_start(self):
+        if self._stale:
+            return
+        self._row_shift += 1
+        for col in range(self._grid.width):
+            self._recheck(0, col)
+
+    def on_col_added_to_start(self):
+        if self._stale:
+            return
+        self._col_shift += 1
+        for row in range(self._grid.height):
+            self._recheck(row, 0)
@@ -0,0 +1,47 @@
+from collections.abc import Sequence
+
+class Registry(Sequence):
+    """Objects with an `id` (nodes, edges), in the order they were added.
+
+    Reads like a list of the objects (len, iteration, indexing by position), but is keyed by
+    `str(obj.id)`, so looking up and removing an object by id are O(1).
+    """
+
+    def __init__(self):
+        self._by_id = {}
+        # Positional access goes through a list, rebuilt after removals
+        self._list = []
+        self._list_valid = True
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __getitem__(self, index):
+        if not self._list_valid:
+            self._list = list(self._by_id.values())
+            self._list_valid = True
+        return self._list[index]
+
+    def __repr__(self):
+        return f"Registry({list(self._by_id.values())})"
+
+    def get(self, id, default=None):
+        return self._by_id.get(str(id), default)
+
+    def add(self, obj):
+        key = str(obj.id)
+        if key in self._by_id:
+            raise ValueError(f"Id {key} is already taken")
+        self._by_id[key] = obj
+        if self._list_valid:
+            self._list.append(obj)
+
+    def remove(self, id):
+        """Remove and return the object with this id (KeyError if there is none)."""
+        obj = self._by_id.pop(str(id))
+        self._list_valid = False
+        self._list = []
+        return obj
@@ -0,0 +1,115 @@
+import pytest
+from src.classes.object_manager import ObjectManager
+from src.classes.grid import Grid
+from src.classes.cell import CellType, Direction
+
+def make_walled_diagram():
+    # A vertical edge from "top" to "bottom" splits the grid, "a" and "b" are on either side of it
+    return ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "top", "row": 0, "col": 3, "width": 3, "height": 1},
+            {"id": "bottom", "row": 8, "col": 3, "width": 3, "height": 1},
+            {"id": "a", "row": 4, "col": 0, "width": 1, "height": 1},
+            {"id": "b", "row": 4, "col": 8, "width": 1, "height": 1},
+        ],
+        "edges": [{
+            "id": "0",
+            "senderAttachment": {"nodeId": "top", "hasArrow": False, "nodeInDirection": "N"},
+            "receiverAttachment": {"nodeId": "bottom", "hasArrow": False, "nodeInDirection": "S"},
+            "cells": [[row, 4] for row in range(1, 8)],
+        }],
+    })
+
+def draw_across(obj_manager, crossing_cost):
+    obj_manager.draw_edge(
+        obj_manager.get_node("a"), obj_manager.get_node("b"), (4, 1), (4, 7),
+        has_arrow_receiver=True, crossing_cost=crossing_cost
+    )
+    return obj_manager.edges[-1]
+
+def test_edges_are_walls_by_default():
+    with pytest.raises(ValueError):
+        draw_across(make_walled_diagram(), None)
+
+def test_crossing_is_routed_and_rendered():
+    obj_manager = make_walled_diagram()
+    edge = draw_across(obj_manager, crossing_cost=5)
+    assert [[4, col] for col in range(1, 8)] == edge.cells.to_pairs()
+    assert obj_manager.grid.render_to_flow_txt().split('\n')[4] == "O ─ ─ ─ ┼ ─ ─ → O"
+    cell = obj_manager.grid.get_cell(4, 4)
+    assert cell.is_crossing and cell.render_flow() == "┼"
+    assert obj_manager.get_edge_at(4, 4).id == "0"
+    # Crossed once, never again, and the row/col can't be cloned anymore
+    assert not obj_manager.grid.is_crossable(4, 4, horizontal=True)
+    assert not obj_manager.grid.is_crossable(4, 4, horizontal=False)
+    assert 4 not in obj_manager.get_clonable_rows() and 4 not in obj_manager.get_clonable_columns()
+    # Same grid when rebuilt from the (shared) cells of both edges
+    rebuilt = ObjectManager.create_from_JSON(obj_manager.export_to_JSON())
+    assert rebuilt.grid.render_to_flow_txt() == obj_manager.grid.render_to_flow_txt()
+    assert obj_manager.make_grid().render_to_flow_txt() == obj_manager.grid.render_to_flow_txt()
+    assert Grid.create_from_txt(obj_manager.grid.render_to_flow_txt()).get_cell(4, 4).is_crossing
+
+def test_removing_either_edge_restores_the_other():
+    obj_manager = make_walled_diagram()
+    edge = draw_across(obj_manager, crossing_cost=5)
+    obj_manager.remove_edge(edge.id)
+    cell = obj_manager.grid.get_cell(4, 4)
+    assert (cell.occupant_id, cell.connects_to_previous_in_direction, cell.connects_to_next_in_direction) == ("0", Direction.N, Direction.S)
+
+    obj_manager = make_walled_diagram()
+    edge = draw_across(obj_manager, crossing_cost=5)
+    obj_manager.remove_edge("0")
+    cell = obj_manager.grid.get_cell(4, 4)
+    assert (cell.occupant_id, cell.connects_to_previous_in_direction, cell.connects_to_next_in_direction) == (edge.id, Direction.W, Direction.E)
+    assert obj_manager.grid.get_cell(3, 4).cell_type == CellType.EMPTY
+
+def test_detour_beats_expensive_crossing():
+    # The same diagram with a free row below it, so the wall can be gone around
+    flow = make_walled_diagram().grid.render_to_flow_txt()
+    grid = Grid.create_from_txt(flow + "\n" + " ".join(["·"] * 9))
+    cheap = grid.find_manhattan_path_with_forced_ends((4, 1), (4, 7), 'E', 'W', crossing_cost=1)
+    expensive = grid.find_manhattan_path_with_forced_ends((4, 1), (4, 7), 'E', 'W', crossing_cost=100)
+    assert (4, 4) in cheap
+    assert (4, 4) not in expensive and len(expensive) > len(cheap)
+
+def test_edge_ends_are_not_crossed():
+    # Only the end cells (1, 4) and (7, 4) of the vertical edge are left between the nodes and the walls
+    obj_manager = make_walled_diagram()
+    grid = obj_manager.grid
+    assert not grid.is_crossable(1, 4, horizontal=True)
+    assert not grid.is_crossable(7, 4, horizontal=True)
+    assert grid.is_crossable(4, 4, horizontal=True)
+    path = grid.find_manhattan_path_with_forced_ends((1, 2), (1, 6), 'W', 'E', crossing_cost=1)
+    assert (1, 4) not in path
+
+def test_deleting_lines_never_leaves_a_crossing_at_an_edge_end():
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 3, "col": 0, "width": 1, "height": 1},
+            {"id": "b", "row": 3, "col": 8, "width": 1, "height": 1},
+            {"id": "c", "row": 0, "col": 4, "width": 1, "height": 1},
+            {"id": "d", "row": 7, "col": 4, "width": 1, "height": 1},
+        ],
+        "edges": [],
+    })
+    obj_manager.draw_edge(obj_manager.get_node("a"), obj_manager.get_node("b"), (3, 1), (3, 7))
+    obj_manager.draw_edge(obj_manager.get_node("c"), obj_manager.get_node("d"), (1, 4), (6, 4), crossing_cost=3)
+    obj_manager.delete_column(1)
+    obj_manager.delete_column(1)
+    # The crossing is now right behind the first cell of a -> b
+    with pytest.raises(ValueError):
+        obj_manager.delete_column(1)
+    assert obj_manager.grid.render_to_flow_txt().split('\n')[3] == "O ─ ┼ ─ ─ ─ O"
+    assert obj_manager.make_grid().render_to_flow_txt() == obj_manager.grid.render_to_flow_txt()
+    # Same for rows, from either side of the vertical edge
+    obj_manager.delete_row(1)
+    with pytest.raises(ValueError):
+        obj_manager.delete_row(1)
+    obj_manager.delete_row(3)
+    obj_manager.delete_row(3)
+    with pytest.raises(ValueError):
+        obj_manager.delete_row(3)
+    assert [row.split()[2] for row in obj_manager.grid.render_to_flow_txt().split('\n')] == ["O", "│", "┼", "│", "O"]
+    assert obj_manager.make_grid().render_to_flow_txt() == obj_manager.grid.render_to_flow_txt()
+    obj_manager.remove_edge(obj_manager.edges[0].id)
+    assert obj_manager.make_grid().render_to_flow_txt() == obj_manager.grid.render_to_flow_txt()
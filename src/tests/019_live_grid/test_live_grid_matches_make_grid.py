@@ -0,0 +1,24 @@
+import os
+import json
+from src.classes.object_manager import ObjectManager
+
+def load_obj_manager():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(os.path.dirname(current_dir), 'data')
+    with open(os.path.join(data_dir, 'simplegrid.json'), 'r') as f:
+        return ObjectManager.create_from_JSON(json.load(f))
+
+def test_live_grid_matches_make_grid_after_loading():
+    obj_manager = load_obj_manager()
+    assert obj_manager.grid.export_to_txt() == obj_manager.make_grid().export_to_txt()
+
+def test_live_grid_matches_make_grid_after_shifting():
+    obj_manager = load_obj_manager()
+    obj_manager.add_row_to_start()
+    obj_manager.add_col_to_start()
+    obj_manager.add_node_at_coordinate("d", 6, 7)
+
+    fresh_grid = obj_manager.make_grid()
+    assert (obj_manager.grid.height, obj_manager.grid.width) == (fresh_grid.height, fresh_grid.width)
+    assert obj_manager.grid.export_to_txt() == fresh_grid.export_to_txt()
+    assert obj_manager.grid.render_to_flow_txt() == fresh_grid.render_to_flow_txt()
@@ -0,0 +1,41 @@
+import os
+import pytest
+from src.classes.grid import Grid
+from src.classes.cell import Cell, CellType, Direction
+
+def test_assigned_cell_reads_back_identical():
+    grid = Grid(width=3, height=2)
+    grid.cells[1][2] = Cell(1, 2, CellType.EDGE, Direction.W, Direction.N, False, True, value="·", occupant_id="7")
+
+    cell = grid.cells[1][2]
+    assert cell.row == 1 and cell.col == 2
+    assert cell.cell_type == CellType.EDGE
+    assert cell.connects_to_previous_in_direction == Direction.W
+    assert cell.connects_to_next_in_direction == Direction.N
+    assert cell.has_arrow_to_previous is False
+    assert cell.has_arrow_to_next is True
+    assert cell.occupant_id == "7"
+    assert grid.cells[0][0].is_empty()
+
+    with pytest.raises(IndexError):
+        grid.cells[2][0]
+
+def test_content_survives_growing_in_all_directions():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(os.path.dirname(current_dir), 'data')
+    with open(os.path.join(data_dir, 'simplegrid.txt'), 'r') as f:
+        original_txt = f.read().strip()
+
+    grid = Grid.create_from_txt(original_txt)
+    for _ in range(3):
+        grid.add_col_to_end()
+        grid.add_col_to_start()
+        grid.add_row_to_end()
+        grid.add_row_to_start()
+
+    assert (grid.height, grid.width) == (11, 12)
+    lines = grid.export_to_txt().split('\n')
+    inner = [' '.join(line.split()[3:-3]) for line in lines[3:-3]]
+    assert '\n'.join(inner) == original_txt
+    assert all(set(line.split()) == {"·"} for line in lines[:3] + lines[-3:])
+    assert len(grid.get_all_empty_cells()) == 11 * 12 - (5 * 6 - 10)
@@ -0,0 +1,47 @@
+import pytest
+from src.classes.grid import Grid
+from src.classes.cell import CellType
+
+def count_bends(path):
+    directions = [(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:])]
+    return sum(1 for d1, d2 in zip(directions, directions[1:]) if d1 != d2)
+
+def test_straight_corridor_is_used():
+    grid = Grid(width=7, height=5)
+    path = grid.find_manhattan_path_with_forced_ends((0, 0), (0, 6), 'S', 'S')
+    assert path == [(0, 0)] + [(1, col) for col in range(7)] + [(0, 6)]
+
+@pytest.mark.parametrize("bend_cost, expected_bends", [(1, 2), (5, 2)])
+def test_path_is_shortest_with_fewest_bends(bend_cost, expected_bends):
+    grid = Grid(width=6, height=6)
+    path = grid.find_manhattan_path_with_forced_ends((0, 0), (5, 5), 'E', 'W', bend_cost=bend_cost)
+    assert path[0] == (0, 0) and path[1] == (0, 1)
+    assert path[-2] == (5, 4) and path[-1] == (5, 5)
+    assert len(path) == 11  # Manhattan distance + 1
+    assert count_bends(path) == expected_bends
+
+def test_no_path_when_walled_off():
+    grid = Grid.create_from_txt("""
+        · · x · ·
+        · · x · ·
+        · · x · ·
+    """)
+    assert grid.find_manhattan_path_with_forced_ends((0, 0), (0, 4), 'S', 'S') == []
+
+def test_areas_follow_the_grid():
+    grid = Grid.create_from_txt("""
+        · · · · ·
+        · · · · ·
+        · · · · ·
+    """)
+    assert grid.find_manhattan_path_with_forced_ends((0, 0), (0, 4), 'S', 'S')
+    areas = grid._route_components(False)
+    # Walling off only splits areas, so the ones found before are kept (they never rule out a route)
+    for row in range(3):
+        grid.set_cell(row, 2, CellType.NODE, occupant_id="x")
+    assert grid._route_components(False) is areas
+    assert grid.find_manhattan_path_with_forced_ends((0, 0), (0, 4), 'S', 'S') == []
+    # Freeing a cell can join areas, they are found again
+    grid.set_cell(2, 2, CellType.EMPTY)
+    assert grid._route_components(False) is not areas
+    assert grid.find_manhattan_path_with_forced_ends((0, 0), (0, 4), 'S', 'S') == [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (1, 4), (0, 4)]
@@ -0,0 +1,45 @@
+import random
+from src.classes.grid import Grid
+from src.classes.cell import CellType
+
+def make_random_grid(seed, width=23, height=17, density=0.08):
+    rng = random.Random(seed)
+    grid = Grid(width=width, height=height)
+    for row in range(height):
+        for col in range(width):
+            if rng.random() < density:
+                grid.set_cell(row, col, CellType.NODE, occupant_id="x")
+    return grid
+
+def valid_cells_by_neighbor_scan(grid):
+    return [
+        (row, col)
+        for row in range(grid.height)
+        for col in range(grid.width)
+        if all(
+            grid.is_cell_empty_or_out_of_bounds(row + dr, col + dc)
+            for dr in (-1, 0, 1)
+            for dc in (-1, 0, 1)
+        )
+    ]
+
+def test_mask_matches_neighbor_scan():
+    for seed in range(5):
+        grid = make_random_grid(seed)
+        expected = valid_cells_by_neighbor_scan(grid)
+        actual = [(cell.row, cell.col) for cell in grid.get_all_valid_node_placement_cells()]
+        assert actual == expected
+
+def test_random_pick_matches_choice_over_candidates():
+    grid = make_random_grid(1)
+    expected_candidates = valid_cells_by_neighbor_scan(grid)
+    for seed in range(10):
+        random.seed(seed)
+        expected = random.choice(expected_candidates)
+        random.seed(seed)
+        assert grid.get_random_valid_node_placement_cell() == expected
+
+def test_no_pick_on_full_grid():
+    grid = Grid.create_from_txt("a b\nc d")
+    assert grid.get_random_valid_node_placement_cell() is None
+    assert Grid(width=0, height=0).get_all_valid_node_placement_cells() == []
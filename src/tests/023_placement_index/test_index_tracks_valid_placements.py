@@ -0,0 +1,40 @@
+import os
+import json
+import random
+from src.classes.object_manager import ObjectManager
+
+def load_obj_manager():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(os.path.dirname(current_dir), 'data')
+    with open(os.path.join(data_dir, 'simplegrid.json'), 'r') as f:
+        return ObjectManager.create_from_JSON(json.load(f))
+
+def candidates_from_scratch(obj_manager):
+    return [(cell.row, cell.col) for cell in obj_manager.make_grid().get_all_valid_node_placement_cells()]
+
+def test_index_matches_full_recompute_while_editing():
+    obj_manager = load_obj_manager()
+    index = obj_manager.grid.enable_placement_index()
+    assert index.get_all_cells() == candidates_from_scratch(obj_manager)
+
+    obj_manager.add_node_at_coordinate("d", 7, 8)
+    assert index.get_all_cells() == candidates_from_scratch(obj_manager)
+    obj_manager.add_row_to_start()
+    obj_manager.add_col_to_start()
+    assert index.get_all_cells() == candidates_from_scratch(obj_manager)
+
+    random.seed(3)
+    for i in range(4):
+        obj_manager.add_node_at_valid_spot(id=f"n{i}")
+        assert index.get_all_cells() == candidates_from_scratch(obj_manager)
+
+def test_seeded_placement_is_deterministic():
+    placements = []
+    for _ in range(2):
+        obj_manager = load_obj_manager()
+        obj_manager.add_node_at_coordinate("d", 9, 9)
+        random.seed(42)
+        for i in range(3):
+            obj_manager.add_node_at_valid_spot(id=f"n{i}")
+        placements.append([(node.row, node.col) for node in obj_manager.nodes])
+    assert placements[0] == placements[1]
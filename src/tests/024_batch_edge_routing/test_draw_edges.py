@@ -0,0 +1,58 @@
+import pytest
+from src.classes.object_manager import ObjectManager
+from src.classes.node import Node
+from src.classes.edge import EdgeSpec
+
+def make_obj_manager():
+    # a · · · · · b
+    # · · · · · · ·
+    # · · · · · · ·
+    # c · · · · · ·
+    # · · · · · · ·
+    # · · · · · · d
+    obj_manager = ObjectManager()
+    for node in [
+        Node(id="a", row=0, col=0, width=1, height=1),
+        Node(id="b", row=0, col=6, width=1, height=1),
+        Node(id="c", row=3, col=0, width=1, height=1),
+        Node(id="d", row=5, col=6, width=1, height=1),
+    ]:
+        obj_manager.add_node(node)
+    return obj_manager
+
+def get_node(obj_manager, id):
+    return next(node for node in obj_manager.nodes if node.id == id)
+
+def test_failures_are_reported_per_edge():
+    obj_manager = make_obj_manager()
+    a, b, c, d = (get_node(obj_manager, id) for id in "abcd")
+    specs = [
+        EdgeSpec(a, b, (1, 0), (1, 6)),
+        EdgeSpec(c, d, (3, 0), (4, 6)),  # attachment point inside c
+        EdgeSpec(c, d, (3, 1), (4, 6), has_arrow_receiver=True),
+    ]
+    results = obj_manager.draw_edges(specs)
+
+    assert [result.spec for result in results] == specs
+    assert [result.success for result in results] == [True, False, True]
+    assert results[1].error
+    assert len(obj_manager.edges) == 2
+    assert results[2].edge.receiver_attachment.has_arrow is True
+    assert obj_manager.grid.export_to_txt() == obj_manager.make_grid().export_to_txt()
+
+def test_shortest_first_routes_short_edges_first():
+    obj_manager = make_obj_manager()
+    a, b, c, d = (get_node(obj_manager, id) for id in "abcd")
+    specs = [
+        EdgeSpec(a, d, (0, 1), (5, 5)),
+        EdgeSpec(a, c, (1, 0), (2, 0)),
+    ]
+    results = obj_manager.draw_edges(specs, order="shortest_first")
+
+    assert all(result.success for result in results)
+    assert results[1].edge.id == "0"
+    assert results[0].edge.id == "1"
+
+def test_unknown_order_raises():
+    with pytest.raises(ValueError, match="Unknown edge ordering"):
+        make_obj_manager().draw_edges([], order="random")
@@ -0,0 +1,26 @@
+import pytest
+from src.benchmarks.canvas_generator import generate_canvas, node_id
+from src.classes.object_manager import ObjectManager
+
+def test_node_ids_are_alphabetic_and_unique():
+    ids = [node_id(i) for i in range(1000)]
+    assert ids[:3] == ["a", "b", "c"] and ids[26] == "aa"
+    assert len(set(ids)) == 1000
+    assert all(id.isalpha() for id in ids)
+
+@pytest.mark.parametrize("layout", ["dense", "sparse"])
+def test_generated_canvas_round_trips(layout):
+    canvas = generate_canvas(60, layout=layout, edge_length="mixed", seed=7)
+    assert len(canvas["nodes"]) == 60
+    assert canvas["edges"]
+
+    obj_manager = ObjectManager.create_from_JSON(canvas)
+    assert obj_manager.export_to_JSON() == canvas
+    # No two edges/nodes share a cell
+    cells = [tuple(cell) for edge in canvas["edges"] for cell in edge["cells"]]
+    assert len(cells) == len(set(cells))
+    assert all(obj_manager.make_grid().cells[r][c].occupant_id is not None for r, c in cells)
+
+def test_generation_is_seeded():
+    assert generate_canvas(40, seed=3) == generate_canvas(40, seed=3)
+    assert generate_canvas(40, seed=3) != generate_canvas(40, seed=4)
@@ -0,0 +1,45 @@
+import io
+import os
+import json
+import pytest
+from src.classes.object_manager import ObjectManager
+from src.classes.json_stream import JSONStreamReader
+
+def test_stream_matches_dict_loading_for_all_test_data():
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+    for name in sorted(os.listdir(data_dir)):
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(data_dir, name)
+        with open(path, 'r') as f:
+            expected = ObjectManager.create_from_JSON(json.load(f))
+        with open(path, 'rb') as f:
+            actual = ObjectManager.create_from_JSON_stream(f)
+        assert actual.export_to_JSON() == expected.export_to_JSON()
+        assert actual.make_grid().export_to_txt() == expected.make_grid().export_to_txt()
+
+def test_items_split_over_tiny_chunks():
+    document = {
+        "meta": {"ignored": [1, 2, {"nested": "ü"}]},
+        "edges": [],
+        "nodes": [{"id": "ä", "row": 12345, "col": 0, "width": 1, "height": 1}, {"id": "b", "row": 0, "col": 3, "width": 1, "height": 1}],
+    }
+    encoded = json.dumps(document, ensure_ascii=False, indent=2).encode('utf-8')
+    for chunk_size in (1, 2, 3, 7):
+        reader = JSONStreamReader(io.BytesIO(encoded), chunk_size=chunk_size)
+        items = list(reader.iter_array_items({'nodes', 'edges'}))
+        assert items == [('nodes', node) for node in document['nodes']]
+
+def test_malformed_document_raises():
+    with pytest.raises(ValueError):
+        ObjectManager.create_from_JSON_stream(io.StringIO('{"nodes": [{"id": "a", "row": 0, "col": 0, "width": 1, "height": 1} {"id": "b"}]}'))
+    with pytest.raises(ValueError):
+        ObjectManager.create_from_JSON_stream(io.StringIO('{"nodes": ['))
+
+def test_numbers_split_over_chunks():
+    document = '{"a": 1.5, "b": -2.25e+3, "c": 7E-2, "nodes": [1.5, 10, -0.125, 3e2, 4.0E+1]}'
+    for chunk_size in (1, 2, 3, 4, 5):
+        reader = JSONStreamReader(io.StringIO(document), chunk_size=chunk_size)
+        assert list(reader.iter_array_items({'nodes'})) == [('nodes', value) for value in (1.5, 10, -0.125, 300.0, 40.0)]
+        reader = JSONStreamReader(io.StringIO(document), chunk_size=chunk_size)
+        assert [value for _, value in reader.iter_array_items({'a', 'b', 'c'})] == []
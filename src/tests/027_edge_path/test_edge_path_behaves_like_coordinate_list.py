@@ -0,0 +1,36 @@
+from src.classes.edge import Edge, Attachment
+from src.classes.edge_path import EdgePath
+from src.classes.coordinate import Coordinate
+
+def make_coordinates():
+    return [Coordinate(row=2, col=1), Coordinate(row=3, col=1), Coordinate(row=3, col=2)]
+
+def test_reads_like_list_of_coordinates():
+    coordinates = make_coordinates()
+    path = EdgePath(coordinates)
+    assert len(path) == 3
+    assert list(path) == coordinates
+    assert path == coordinates
+    assert path[0] == Coordinate(row=2, col=1)
+    assert path[-1] == Coordinate(row=3, col=2)
+    assert path[1:] == coordinates[1:]
+    assert path == EdgePath.from_pairs([[2, 1], [3, 1], [3, 2]])
+
+def test_shift_moves_all_cells():
+    path = EdgePath(make_coordinates())
+    path.shift(1, 0)
+    path.shift(0, 2)
+    assert path.to_pairs() == [[3, 3], [4, 3], [4, 4]]
+    assert (path.max_row(), path.max_col()) == (4, 4)
+    path.insert(1, Coordinate(row=4, col=2))
+    assert path.to_pairs() == [[3, 3], [4, 2], [4, 3], [4, 4]]
+
+def test_edge_packs_given_coordinates():
+    edge = Edge(
+        id="0",
+        sender_attachment=Attachment(node_id="a", has_arrow=False, node_in_direction="N"),
+        receiver_attachment=Attachment(node_id="b", has_arrow=True, node_in_direction="W"),
+        cells=make_coordinates()
+    )
+    assert isinstance(edge.cells, EdgePath)
+    assert edge.cells == make_coordinates()
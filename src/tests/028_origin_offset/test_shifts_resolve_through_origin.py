@@ -0,0 +1,45 @@
+from src.classes.object_manager import ObjectManager
+from src.classes.node import Node
+from src.classes.coordinate import Coordinate
+
+def make_manager():
+    return ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 0, "col": 0, "width": 2, "height": 2},
+            {"id": "b", "row": 0, "col": 5, "width": 2, "height": 2}
+        ],
+        "edges": [{
+            "id": "0",
+            "senderAttachment": {"nodeId": "a", "hasArrow": False, "nodeInDirection": "W"},
+            "receiverAttachment": {"nodeId": "b", "hasArrow": True, "nodeInDirection": "E"},
+            "cells": [[0, 2], [0, 3], [0, 4]]
+        }]
+    })
+
+def test_shift_resolves_on_read_and_export():
+    manager = make_manager()
+    node_a = manager.nodes[0]
+    manager.add_row_to_start()
+    manager.add_col_to_start()
+    manager.add_col_to_start()
+    assert (node_a.row, node_a.col) == (1, 2)
+    assert manager.edges[0].cells[0] == Coordinate(row=1, col=4)
+    exported = manager.export_to_JSON()
+    assert exported["nodes"][1] == {"id": "b", "row": 1, "col": 7, "width": 2, "height": 2}
+    assert exported["edges"][0]["cells"] == [[1, 4], [1, 5], [1, 6]]
+    assert manager.grid.export_to_txt() == manager.make_grid().export_to_txt()
+
+def test_writes_after_shift_are_absolute():
+    manager = make_manager()
+    manager.add_row_to_start()
+    node_b = manager.nodes[1]
+    node_b.row += 2
+    manager.add_node(Node(id="c", row=5, col=0, width=1, height=1))
+    manager.add_row_to_start()
+    assert node_b.row == 4
+    assert manager.nodes[2].row == 6
+
+def test_standalone_node_keeps_its_values():
+    node = Node(id="a", row=3, col=4, width=1, height=1)
+    assert (node.row, node.col) == (3, 4)
+    assert node == Node(id="a", row=3, col=4, width=1, height=1)
@@ -0,0 +1,96 @@
+import random
+import pytest
+from src.classes.object_manager import ObjectManager
+from src.classes.axis_map import AxisMap
+
+def make_manager(has_arrow_receiver=False):
+    # a a · · ·
+    # a a · · ·
+    # 0 · · · ·
+    # 0 · · · ·
+    # 0 0 0 0 ·
+    # · · · b b
+    return ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 0, "col": 0, "width": 2, "height": 2},
+            {"id": "b", "row": 5, "col": 3, "width": 2, "height": 1}
+        ],
+        "edges": [{
+            "id": "0",
+            "senderAttachment": {"nodeId": "a", "hasArrow": False, "nodeInDirection": "N"},
+            "receiverAttachment": {"nodeId": "b", "hasArrow": has_arrow_receiver, "nodeInDirection": "S"},
+            "cells": [[2, 0], [3, 0], [4, 0], [4, 1], [4, 2], [4, 3]]
+        }]
+    })
+
+def test_axis_map_matches_list():
+    rng = random.Random(1)
+    axis = AxisMap()
+    lines = []
+    for _ in range(500):
+        if lines and rng.random() < 0.3:
+            position = rng.randrange(len(lines))
+            assert axis.delete(position) == lines.pop(position)
+        else:
+            position = rng.randint(0, len(lines))
+            lines.insert(position, axis.insert(position))
+        if rng.random() < 0.1:
+            table = axis.position_table()
+            assert [table[line] for line in lines] == list(range(len(lines)))
+    assert [axis.id_at(i) for i in range(len(axis))] == lines
+    assert [axis.position_of(line) for line in lines] == list(range(len(lines)))
+
+def test_clone_row_stretches_crossing_nodes_and_edges():
+    manager = make_manager()
+    manager.clone_row(2)
+    manager.clone_row(1)
+    exported = manager.export_to_JSON()
+    assert exported["nodes"][0] == {"id": "a", "row": 0, "col": 0, "width": 2, "height": 3}
+    assert exported["nodes"][1] == {"id": "b", "row": 7, "col": 3, "width": 2, "height": 1}
+    assert exported["edges"][0]["cells"] == [[3, 0], [4, 0], [5, 0], [6, 0], [6, 1], [6, 2], [6, 3]]
+    assert manager.grid.render_to_flow_txt() == manager.make_grid().render_to_flow_txt()
+
+def test_clone_column_stretches_crossing_nodes_and_edges():
+    manager = make_manager()
+    manager.clone_column(1)
+    exported = manager.export_to_JSON()
+    assert exported["nodes"][0]["width"] == 3
+    assert exported["nodes"][1]["col"] == 4
+    assert exported["edges"][0]["cells"] == [[2, 0], [3, 0], [4, 0], [4, 1], [4, 2], [4, 3], [4, 4]]
+    assert manager.grid.render_to_flow_txt() == manager.make_grid().render_to_flow_txt()
+
+def test_delete_undoes_clone():
+    manager = make_manager()
+    original = manager.export_to_JSON()
+    manager.clone_row(1)
+    manager.clone_column(2)
+    manager.delete_column(2)
+    manager.delete_row(2)
+    assert manager.export_to_JSON() == original
+    assert manager.grid.export_to_txt() == manager.make_grid().export_to_txt()
+
+def test_lines_that_cannot_be_cloned_or_deleted():
+    with pytest.raises(ValueError, match="contains edge cell running along it"):
+        make_manager().clone_row(4)
+    with pytest.raises(ValueError, match="Cannot clone column: contains edge cell with arrow"):
+        make_manager(has_arrow_receiver=True).clone_column(3)
+    with pytest.raises(ValueError, match="node b would be removed"):
+        make_manager().delete_row(5)
+
+def test_edges_keep_two_cells():
+    # a
+    # 0
+    # 0
+    # b
+    manager = ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 0, "col": 0, "width": 1, "height": 1},
+            {"id": "b", "row": 3, "col": 0, "width": 1, "height": 1}
+        ],
+        "edges": []
+    })
+    manager.draw_edge(manager.get_node("a"), manager.get_node("b"), (1, 0), (2, 0))
+    with pytest.raises(ValueError, match="edge 0 would have fewer than 2 cells left"):
+        manager.delete_row(2)
+    assert manager.edges[0].cells.to_pairs() == [[1, 0], [2, 0]]
+    assert manager.grid.export_to_txt() == manager.make_grid().export_to_txt()
@@ -0,0 +1,43 @@
+import random
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+from src.classes.cell import CellType, Direction
+
+def scan_clonable(grid, rows: bool) -> list[int]:
+    # What the counters have to agree with: check every cell of every line
+    across = {Direction.N, Direction.S} if rows else {Direction.E, Direction.W}
+    clonable = []
+    for line in range(grid.height if rows else grid.width):
+        cells = [grid.get_cell(line, i) if rows else grid.get_cell(i, line) for i in range(grid.width if rows else grid.height)]
+        if all(
+            cell.cell_type != CellType.EDGE or (
+                not cell.has_arrow_to_previous and not cell.has_arrow_to_next
+                and {cell.connects_to_previous_in_direction, cell.connects_to_next_in_direction} == across
+            )
+            for cell in cells
+        ):
+            clonable.append(line)
+    return clonable
+
+def test_counters_follow_edits():
+    obj_manager = ObjectManager.create_from_JSON(generate_canvas(30, layout="sparse", edge_length="mixed", seed=3))
+    rng = random.Random(3)
+    for _ in range(40):
+        assert obj_manager.get_clonable_rows() == scan_clonable(obj_manager.grid, rows=True)
+        assert obj_manager.get_clonable_columns() == scan_clonable(obj_manager.grid, rows=False)
+        action = rng.choice(["clone_row", "clone_column", "delete_row", "delete_column", "add_row_to_start", "add_col_to_start"])
+        if action.startswith("add"):
+            getattr(obj_manager, action)()
+            continue
+        lines = obj_manager.get_clonable_rows() if action.endswith("row") else obj_manager.get_clonable_columns()
+        try:
+            getattr(obj_manager, action)(rng.choice(lines))
+        except ValueError:
+            pass  # delete refused: a node or edge would vanish
+    assert obj_manager.grid.export_to_txt() == obj_manager.make_grid().export_to_txt()
+
+def test_counters_of_standalone_grid():
+    obj_manager = ObjectManager.create_from_JSON(generate_canvas(20, layout="dense", edge_length="short", seed=5))
+    grid = obj_manager.make_grid()
+    assert grid.get_clonable_rows() == scan_clonable(grid, rows=True)
+    assert grid.get_clonable_cols() == scan_clonable(grid, rows=False)
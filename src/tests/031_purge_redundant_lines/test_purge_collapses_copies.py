@@ -0,0 +1,60 @@
+import random
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+
+def test_purge_collapses_repeated_rows_and_cols():
+    # a a · b b b b
+    # a a · b b b b
+    # a a · b b b b
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 0, "col": 0, "width": 2, "height": 3},
+            {"id": "b", "row": 0, "col": 3, "width": 4, "height": 3}
+        ],
+        "edges": []
+    })
+    assert obj_manager.purge_redundant_rows() == 2
+    assert obj_manager.purge_redundant_columns() == 4
+    assert obj_manager.grid.export_to_txt() == "a · b"
+    assert obj_manager.export_to_JSON()["nodes"] == [
+        {"id": "a", "row": 0, "col": 0, "width": 1, "height": 1},
+        {"id": "b", "row": 0, "col": 2, "width": 1, "height": 1}
+    ]
+
+def test_purge_undoes_clones():
+    obj_manager = ObjectManager.create_from_JSON(generate_canvas(25, layout="sparse", edge_length="mixed", seed=11))
+    obj_manager.purge_redundant_rows()
+    obj_manager.purge_redundant_columns()
+    purged = obj_manager.export_to_JSON()
+    rng = random.Random(11)
+    for _ in range(20):
+        if rng.random() < 0.5:
+            obj_manager.clone_row(rng.choice(obj_manager.get_clonable_rows()))
+        else:
+            obj_manager.clone_column(rng.choice(obj_manager.get_clonable_columns()))
+    obj_manager.purge_redundant_rows()
+    obj_manager.purge_redundant_columns()
+    assert obj_manager.export_to_JSON() == purged
+    assert obj_manager.grid.render_to_flow_txt() == obj_manager.make_grid().render_to_flow_txt()
+    assert obj_manager.get_clonable_rows() == obj_manager.make_grid().get_clonable_rows()
+    assert obj_manager.get_clonable_columns() == obj_manager.make_grid().get_clonable_cols()
+
+def test_purge_keeps_both_ends_of_short_edges():
+    # a     a
+    # 0     0
+    # 0  -> 0
+    # 0     0
+    # b     b
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 0, "col": 0, "width": 1, "height": 1},
+            {"id": "b", "row": 4, "col": 0, "width": 1, "height": 1}
+        ],
+        "edges": []
+    })
+    obj_manager.draw_edge(obj_manager.get_node("a"), obj_manager.get_node("b"), (1, 0), (3, 0))
+    assert obj_manager.grid.get_redundant_rows() == [2, 3]
+    assert obj_manager.purge_redundant_rows() == 1
+    assert obj_manager.edges[0].cells.to_pairs() == [[1, 0], [2, 0]]
+    assert obj_manager.grid.export_to_txt() == obj_manager.make_grid().export_to_txt()
+    assert ObjectManager.create_from_JSON(obj_manager.export_to_JSON()).export_to_JSON() == obj_manager.export_to_JSON()
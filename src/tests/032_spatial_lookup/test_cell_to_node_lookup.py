@@ -0,0 +1,24 @@
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+
+def contains(node, row, col):
+    return node.row <= row < node.row + node.height and node.col <= col < node.col + node.width
+
+def test_lookups_match_scanning_nodes():
+    obj_manager = ObjectManager.create_from_JSON(generate_canvas(40, layout="dense", edge_length="mixed", seed=2))
+    obj_manager.clone_row(obj_manager.get_clonable_rows()[1])
+    grid = obj_manager.grid
+    for row in range(-1, grid.height + 1):
+        for col in range(-1, grid.width + 1):
+            expected = next((node for node in obj_manager.nodes if contains(node, row, col)), None)
+            assert obj_manager.get_node_at(row, col) is expected
+            edge = obj_manager.get_edge_at(row, col)
+            assert edge is None or (row, col) in set(edge.cells.iter_pairs())
+
+    rect = (2, 3, 6, 5)
+    expected = [
+        node for node in obj_manager.nodes
+        if any(contains(node, r, c) for r in range(2, 8) for c in range(3, 8))
+    ]
+    assert sorted(node.id for node in obj_manager.get_nodes_in_rect(*rect)) == sorted(node.id for node in expected)
+    assert obj_manager.get_nodes_in_rect(-5, -5, 2, 2) == []
@@ -0,0 +1,49 @@
+import pytest
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+
+def make_manager():
+    return ObjectManager.create_from_JSON(generate_canvas(30, layout="dense", edge_length="short", seed=4))
+
+def test_lookup_by_id_and_adjacency():
+    obj_manager = make_manager()
+    node = obj_manager.nodes[5]
+    assert obj_manager.get_node(node.id) is node
+    assert obj_manager.get_node("not there") is None
+    touching = [
+        edge for edge in obj_manager.edges
+        if node.id in (edge.sender_attachment.node_id, edge.receiver_attachment.node_id)
+    ]
+    assert obj_manager.get_edges_of_node(node.id) == touching
+    with pytest.raises(ValueError):
+        obj_manager.add_node_at_coordinate(node.id, 0, 0)
+
+def test_removal_frees_cells_and_keeps_ids_monotonic():
+    obj_manager = make_manager()
+    edge_count = len(obj_manager.edges)
+    removed = obj_manager.remove_edge(obj_manager.edges[-1].id)
+    assert len(obj_manager.edges) == edge_count - 1
+    assert obj_manager.get_edge(removed.id) is None
+    assert all(obj_manager.grid.is_cell_empty(row, col) for row, col in removed.cells.iter_pairs()
+               if row < obj_manager.grid.height and col < obj_manager.grid.width)
+
+    node = next(node for node in obj_manager.nodes if obj_manager.get_edges_of_node(node.id))
+    obj_manager.remove_node(node.id)
+    assert obj_manager.get_edges_of_node(node.id) == []
+    assert all(node.id not in (edge.sender_attachment.node_id, edge.receiver_attachment.node_id) for edge in obj_manager.edges)
+
+    # The live grid shrinks along with the content
+    assert obj_manager.grid.export_to_txt() == obj_manager.make_grid().export_to_txt()
+
+    # New edges never reuse an id
+    obj_manager.add_node_at_coordinate("new1", obj_manager.grid.height + 2, 0)
+    obj_manager.add_node_at_coordinate("new2", obj_manager.grid.height + 2, 6)
+    obj_manager.draw_edge(obj_manager.get_node("new1"), obj_manager.get_node("new2"), (obj_manager.get_node("new1").row, 1), (obj_manager.get_node("new2").row, 5))
+    assert obj_manager.edges[-1].id == str(edge_count)
+
+def test_removing_everything_empties_the_grid():
+    obj_manager = make_manager()
+    for node in list(obj_manager.nodes):
+        obj_manager.remove_node(node.id)
+    assert len(obj_manager.edges) == 0
+    assert (obj_manager.grid.height, obj_manager.grid.width) == (0, 0)
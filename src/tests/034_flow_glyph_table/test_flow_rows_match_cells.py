@@ -0,0 +1,28 @@
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+from src.classes.cell import Cell, CellType, Direction
+
+def render_cell_by_cell(grid):
+    return '\n'.join(' '.join(cell.render_flow() for cell in row) for row in grid.cells)
+
+def test_table_rendering_matches_cells():
+    canvas = generate_canvas(80, layout="dense", edge_length="mixed", seed=9)
+    for edge in canvas["edges"][::2]:
+        edge["receiverAttachment"]["hasArrow"] = True
+    obj_manager = ObjectManager.create_from_JSON(canvas)
+    # Columns appended at the end leave unused stride behind the last column
+    obj_manager.grid.add_col_to_end()
+    obj_manager.grid.add_row_to_start()
+    assert obj_manager.grid.render_to_flow_txt() == render_cell_by_cell(obj_manager.grid)
+    assert "→" in obj_manager.grid.render_to_flow_txt() or "↓" in obj_manager.grid.render_to_flow_txt()
+
+def test_cell_glyphs():
+    def edge(previous, next, arrow_to_previous=False, arrow_to_next=False):
+        return Cell(0, 0, CellType.EDGE, previous, next, arrow_to_previous, arrow_to_next).render_flow()
+    assert edge(Direction.W, Direction.E) == "─"
+    assert edge(Direction.S, Direction.N) == "│"
+    assert edge(Direction.E, Direction.N) == "└"
+    assert edge(Direction.S, Direction.W) == "┐"
+    assert edge(Direction.N, Direction.S, arrow_to_previous=True) == "↑"
+    assert edge(Direction.N, Direction.E, arrow_to_next=True) == "→"
+    assert edge(Direction.N, Direction.N) == "X"
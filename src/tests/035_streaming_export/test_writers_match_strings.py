@@ -0,0 +1,43 @@
+import gzip
+import io
+import socket
+import pytest
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+
+@pytest.fixture
+def grid():
+    return ObjectManager.create_from_JSON(generate_canvas(50, layout="dense", edge_length="mixed", seed=6)).grid
+
+@pytest.mark.parametrize("buffer_size", [0, 10, 1 << 20])
+def test_text_and_binary_targets(grid, buffer_size):
+    text = io.StringIO()
+    grid.write_txt(text, buffer_size=buffer_size)
+    assert text.getvalue() == grid.export_to_txt()
+
+    binary = io.BytesIO()
+    grid.write_flow_txt(binary, buffer_size=buffer_size)
+    assert binary.getvalue().decode("utf-8") == grid.render_to_flow_txt()
+
+def test_gzip(grid):
+    compressed = io.BytesIO()
+    grid.write_flow_txt(compressed, compress=True)
+    assert gzip.decompress(compressed.getvalue()).decode("utf-8") == grid.render_to_flow_txt()
+    with pytest.raises(ValueError):
+        grid.write_txt(io.StringIO(), compress=True)
+
+def test_socket(grid):
+    sender, receiver = socket.socketpair()
+    with sender, receiver:
+        grid.write_txt(sender)
+        sender.shutdown(socket.SHUT_WR)
+        received = b""
+        while chunk := receiver.recv(65536):
+            received += chunk
+    assert received.decode("utf-8") == grid.export_to_txt()
+
+def test_flow_lines_across_blocks(grid, monkeypatch):
+    import src.classes.grid as grid_module
+    expected = grid.render_to_flow_txt()
+    monkeypatch.setattr(grid_module, "_FLOW_BLOCK_CELLS", 7)
+    assert grid.render_to_flow_txt() == expected
@@ -0,0 +1,56 @@
+import io
+import mmap
+import os
+import pytest
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+from src.classes.grid import Grid
+from src.classes.cell import CellType, Direction
+
+def simplegrid_path():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(os.path.dirname(current_dir), 'data', 'simplegrid.txt')
+
+def test_all_sources_parse_the_same():
+    with open(simplegrid_path(), 'r') as f:
+        txt_data = f.read()
+    expected = Grid.create_from_txt(txt_data).export_to_txt()
+    assert expected == txt_data.strip()
+
+    with open(simplegrid_path(), 'r') as f:
+        assert Grid.create_from_txt(f).export_to_txt() == expected
+    with open(simplegrid_path(), 'rb') as f:
+        assert Grid.create_from_txt(f).export_to_txt() == expected
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert Grid.create_from_txt(mapped).export_to_txt() == expected
+    assert Grid.create_from_txt(txt_data.encode('utf-8')).export_to_txt() == expected
+    assert Grid.create_from_txt(io.StringIO(txt_data)).export_to_txt() == expected
+
+def test_tokens():
+    grid = Grid.create_from_txt("a · 7\n\n→ │ b\n")
+    assert (grid.width, grid.height) == (3, 2)
+    assert grid.get_cell(0, 0).cell_type == CellType.NODE and grid.get_cell(0, 0).occupant_id == "a"
+    assert grid.get_cell(0, 1).cell_type == CellType.EMPTY
+    assert grid.get_cell(0, 2).cell_type == CellType.EDGE and grid.get_cell(0, 2).occupant_id == "7"
+    arrow = grid.get_cell(1, 0)
+    assert arrow.cell_type == CellType.EDGE and arrow.occupant_id is None
+    assert (arrow.connects_to_previous_in_direction, arrow.connects_to_next_in_direction, arrow.has_arrow_to_next) == (Direction.W, Direction.E, True)
+    assert not grid.is_row_clonable(1) and not grid.is_col_clonable(0)
+    assert not grid.is_col_clonable(1)  # "│" runs along the col
+    assert Grid.create_from_txt("│ ·\n│ ·").get_clonable_rows() == [0, 1]
+
+def test_ragged_rows_are_rejected():
+    with pytest.raises(ValueError):
+        Grid.create_from_txt("a a\nb")
+
+def test_flow_rendering_round_trips():
+    canvas = generate_canvas(40, layout="dense", edge_length="mixed", seed=3)
+    for edge in canvas["edges"][::2]:
+        edge["receiverAttachment"]["hasArrow"] = True
+    live = ObjectManager.create_from_JSON(canvas).grid
+    flow = live.render_to_flow_txt()
+    parsed = Grid.create_from_txt(flow)
+    assert parsed.render_to_flow_txt() == flow
+    # Connections are recovered up to the order of their ends, so clonability is too
+    assert parsed.get_clonable_rows() == live.get_clonable_rows()
+    assert parsed.get_clonable_cols() == live.get_clonable_cols()
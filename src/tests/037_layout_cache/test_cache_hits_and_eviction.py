@@ -0,0 +1,51 @@
+import json
+import os
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+from src.classes.layout_cache import LayoutCache
+
+def test_key_is_canonical():
+    canvas = generate_canvas(10, seed=1)
+    key = LayoutCache.key(canvas, {"gap": 1}, seed=3)
+    assert LayoutCache.key(json.dumps(canvas, indent=4), {"gap": 1}, seed=3) == key
+    reordered = dict(reversed(list(canvas.items())))
+    assert LayoutCache.key(reordered, {"gap": 1}, seed=3) == key
+    assert LayoutCache.key(canvas, {"gap": 2}, seed=3) != key
+    assert LayoutCache.key(canvas, {"gap": 1}, seed=4) != key
+
+def test_unchanged_canvas_is_served_from_cache(tmp_path):
+    cache = LayoutCache(str(tmp_path))
+    canvas = generate_canvas(20, layout="dense", edge_length="short", seed=2)
+    calls = []
+
+    def convert():
+        calls.append(1)
+        obj_manager = ObjectManager.create_from_JSON(canvas)
+        return obj_manager.export_to_JSON(), "<pre>" + obj_manager.grid.export_to_txt() + "</pre>"
+
+    key = LayoutCache.key(canvas, seed=2)
+    first = cache.get_or_create(key, convert)
+    second = LayoutCache(str(tmp_path)).get_or_create(key, convert)
+    assert len(calls) == 1
+    assert second == first
+    assert ObjectManager.create_from_JSON(second.layout).export_to_JSON() == first.layout
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    html = "x" * 1000
+    cache = LayoutCache(str(tmp_path), max_bytes=3500)
+    for key in ["a", "b", "c"]:
+        cache.put(key, None, html)
+    # Make the order of use unambiguous regardless of timestamp resolution, then use "a"
+    for age, key in enumerate(["c", "b", "a"], start=1):
+        os.utime(tmp_path / f"{key}.json", ns=(0, 10**9 * (100 - age)))
+    assert cache.get("a").html == html
+    cache.put("d", None, html)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None and cache.get("d") is not None
+    assert cache.size() <= 3500
+
+def test_corrupt_entries_are_misses(tmp_path):
+    cache = LayoutCache(str(tmp_path))
+    (tmp_path / "broken.json").write_text("{not json")
+    assert cache.get("broken") is None
+    assert not (tmp_path / "broken.json").exists()
@@ -0,0 +1,122 @@
+from src.classes.object_manager import ObjectManager
+from src.classes.grid import Grid
+
+def make_walled_diagram():
+    # A vertical edge from "top" to "bottom" splits the grid, "a" and "b" are on either side of it
+    return ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "top", "row": 0, "col": 3, "width": 3, "height": 1},
+            {"id": "bottom", "row": 8, "col": 3, "width": 3, "height": 1},
+            {"id": "a", "row": 4, "col": 0, "width": 1, "height": 1},
+            {"id": "b", "row": 4, "col": 8, "width": 1, "height": 1},
+        ],
+        "edges": [{
+            "id": "0",
+            "senderAttachment": {"nodeId": "top", "hasArrow": False, "nodeInDirection": "N"},
+            "receiverAttachment": {"nodeId": "bottom", "hasArrow": False, "nodeInDirection": "S"},
+            "cells": [[row, 4] for row in range(1, 8)],
+        }],
+    })
+
+def test_no_insertions_when_routable():
+    grid = Grid.create_from_txt("· · · ·\n· · · ·")
+    assert grid.plan_line_insertions((0, 0), (0, 3), 'E', 'W') == ([], [])
+
+def test_second_corridor_is_cloned():
+    # Going from (1, 1) east and into (1, 3) from the east needs a way around the end point,
+    # which only a copy of the empty middle row gives
+    grid = Grid.create_from_txt("x x x x x x\n· · · · · ·\ny y y y y y")
+    assert grid.find_manhattan_path_with_forced_ends((1, 1), (1, 3), 'E', 'E') == []
+    assert grid.plan_line_insertions((1, 1), (1, 3), 'E', 'E') == ([2], [])
+    grid.clone_row(1)
+    assert grid.find_manhattan_path_with_forced_ends((1, 1), (1, 3), 'E', 'E')
+
+def test_fixed_gaps_are_never_used():
+    grid = Grid.create_from_txt("x x x x x x\n· · · · · ·\ny y y y y y")
+    assert grid.plan_line_insertions((1, 1), (1, 3), 'E', 'E', fixed_row_gaps={2}) is None
+
+def test_make_space_adds_a_row_around_the_wall():
+    obj_manager = make_walled_diagram()
+    height = obj_manager.grid.height
+    obj_manager.draw_edge(obj_manager.get_node("a"), obj_manager.get_node("b"), (4, 1), (4, 7), make_space=True)
+    assert obj_manager.grid.height == height + 1
+    edge = obj_manager.edges[-1]
+    assert edge.cells[0].row == 4 and edge.cells[-1].row == 4
+    assert max(row for row, _ in edge.cells.iter_pairs()) == height
+    assert obj_manager.make_grid().export_to_txt() == obj_manager.grid.export_to_txt()
+
+def test_points_move_with_inserted_lines():
+    # Both points face up out of the grid, so a row has to go in before the first one
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 1, "col": 0, "width": 1, "height": 1},
+            {"id": "b", "row": 1, "col": 2, "width": 1, "height": 1},
+        ],
+        "edges": [],
+    })
+    a, b = obj_manager.get_node("a"), obj_manager.get_node("b")
+    assert obj_manager.make_space_for_edge(a, b, (0, 0), (0, 2)) == ((1, 0), (1, 2))
+    assert (a.row, b.row) == (2, 2)
+    obj_manager.draw_edge(a, b, (1, 0), (1, 2))
+    assert obj_manager.edges[-1].cells.to_pairs() == [[1, 0], [0, 0], [0, 1], [0, 2], [1, 2]]
+
+def test_clone_of_an_edge_end_can_be_crossed():
+    # The edge between t and b is only its two end cells, which can't be crossed. A copy of
+    # either row puts a middle cell between them, which can.
+    grid = Grid.create_from_txt("t t t t t\n· · │ · ·\n· · │ · ·\nb b b b b")
+    assert grid.find_manhattan_path_with_forced_ends((1, 0), (1, 4), 'S', 'S', crossing_cost=1) == []
+    assert grid.plan_line_insertions((1, 0), (1, 4), 'S', 'S', crossing_cost=1) == ([2], [])
+
+def test_unused_inserted_lines_are_deleted():
+    obj_manager = make_walled_diagram()
+    obj_manager.clone_row(2)
+    obj_manager.add_col_to_start()
+    path = [(5, 2), (5, 3), (5, 4)]
+    assert obj_manager._delete_unused_lines(path, [3], [0]) == [(4, 1), (4, 2), (4, 3)]
+    assert obj_manager.export_to_JSON() == make_walled_diagram().export_to_JSON()
+    assert (obj_manager.grid.height, obj_manager.grid.width) == obj_manager.create_needed_grid_format()
+
+def test_make_space_skips_a_cell_both_nodes_attach_to():
+    # · b · ·
+    # a · · x
+    # · · y ·
+    # (1, 1) is the only attachment point of a, and one of b
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 1, "col": 0, "width": 1, "height": 1},
+            {"id": "b", "row": 0, "col": 1, "width": 1, "height": 1},
+            {"id": "x", "row": 1, "col": 3, "width": 1, "height": 1},
+            {"id": "y", "row": 2, "col": 2, "width": 1, "height": 1},
+        ],
+        "edges": [],
+    })
+    a, b = obj_manager.get_node("a"), obj_manager.get_node("b")
+    assert obj_manager.get_valid_attachment_points(b) == [(1, 1), (0, 2)]
+    obj_manager.draw_edge(a, b, make_space=True)
+    cells = obj_manager.edges[-1].cells.to_pairs()
+    assert cells[0] == [1, 1] and cells[-1] != [1, 1]
+    assert obj_manager.grid.render_to_flow_txt() == obj_manager.make_grid().render_to_flow_txt()
+
+def test_make_space_for_a_boxed_in_node():
+    # · · n · · · ·
+    # · · · · · · ·
+    # w · x · e · ·
+    # · · · · · · ·
+    # · · s · · · ·
+    # · · · · · · ·
+    # · · · · · · z
+    # x has no valid attachment point, every side lacks its breathing space
+    def node(id, row, col):
+        return {"id": id, "row": row, "col": col, "width": 1, "height": 1}
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [node("x", 2, 2), node("n", 0, 2), node("s", 4, 2), node("w", 2, 0), node("e", 2, 4), node("z", 6, 6)],
+        "edges": [],
+    })
+    x, z = obj_manager.get_node("x"), obj_manager.get_node("z")
+    assert obj_manager.get_valid_attachment_points(x) == []
+    obj_manager.draw_edge(x, z, make_space=True)
+    cells = obj_manager.edges[-1].cells.to_pairs()
+    # One line inserted next to x gives its attachment point the breathing space
+    assert (obj_manager.grid.height, obj_manager.grid.width) in ((8, 7), (7, 8))
+    assert tuple(cells[0]) in obj_manager.get_neighboring_cell_coords(x)
+    assert obj_manager.grid.render_to_flow_txt() == obj_manager.make_grid().render_to_flow_txt()
@@ -0,0 +1,114 @@
+import random
+from itertools import product
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+from src.classes.edge import EdgeSpec
+from src.classes.grid import Grid
+
+def path_cost(path, bend_cost=1):
+    directions = [(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:])]
+    return len(path) - 1 + bend_cost * sum(1 for d1, d2 in zip(directions, directions[1:]) if d1 != d2)
+
+def test_one_search_finds_the_best_pair():
+    obj_manager = ObjectManager.create_from_JSON(generate_canvas(60, layout="dense", edge_length="short", seed=5))
+    rng = random.Random(5)
+    checked = 0
+    for _ in range(30):
+        sender, receiver = rng.sample(list(obj_manager.nodes), 2)
+        sender_points = obj_manager.get_valid_attachment_points(sender)
+        receiver_points = obj_manager.get_valid_attachment_points(receiver)
+        path = obj_manager._route_between_points(sender, receiver, sender_points, receiver_points, None)
+        pair_costs = []
+        for sender_point, receiver_point in product(sender_points, receiver_points):
+            pair_path = obj_manager._route_between_points(sender, receiver, [sender_point], [receiver_point], None)
+            if pair_path:
+                pair_costs.append(path_cost(pair_path))
+        assert bool(path) == bool(pair_costs)
+        if path:
+            checked += 1
+            assert path[0] in sender_points and path[-1] in receiver_points
+            # Cheapest over all pairs (the path cost counts the forced first move, like every pair)
+            assert path_cost(path) == min(pair_costs)
+    assert checked
+
+def test_draw_edge_picks_the_points():
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 2, "col": 2, "width": 1, "height": 1},
+            {"id": "b", "row": 2, "col": 8, "width": 1, "height": 1},
+        ],
+        "edges": [],
+    })
+    obj_manager._grow_grid_to(5, 11)
+    a, b = obj_manager.get_node("a"), obj_manager.get_node("b")
+    obj_manager.draw_edge(a, b, has_arrow_receiver=True)
+    edge = obj_manager.edges[-1]
+    # Facing each other is the only straight way
+    assert edge.cells.to_pairs() == [[2, col] for col in range(3, 8)]
+    assert (edge.sender_attachment.node_in_direction, edge.receiver_attachment.node_in_direction) == ("W", "E")
+
+def test_batch_specs_without_points():
+    obj_manager = ObjectManager.create_from_JSON(generate_canvas(30, layout="sparse", edge_length="short", seed=2))
+    nodes = list(obj_manager.nodes)
+    specs = [EdgeSpec(nodes[i], nodes[i + 1], None, None) for i in range(0, 10, 2)]
+    results = obj_manager.draw_edges(specs, order="shortest_first")
+    assert any(result.success for result in results)
+    assert obj_manager.make_grid().render_to_flow_txt() == obj_manager.grid.render_to_flow_txt()
+
+def test_no_path_between_any():
+    grid = Grid.create_from_txt("· · x · ·\n· · x · ·\n· · x · ·")
+    assert grid.find_manhattan_path_between_any([((0, 0), 'S'), ((2, 0), 'N')], [((0, 4), 'S'), ((2, 4), 'N')]) == []
+
+def test_other_candidates_are_not_walls():
+    # · t t t t t · ·
+    # · l · · · r · ·
+    # · · · · · · · a
+    # w · b b b · e ·
+    # b can only be reached from the north, and only along its own north attachment points
+    def node(id, row, col, width=1):
+        return {"id": id, "row": row, "col": col, "width": width, "height": 1}
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [node("t", 0, 1, 5), node("l", 1, 1), node("r", 1, 5), node("w", 3, 0), node("b", 3, 2, 3), node("e", 3, 6), node("a", 2, 7)],
+        "edges": [],
+    })
+    a, b = obj_manager.get_node("a"), obj_manager.get_node("b")
+    assert obj_manager.get_valid_attachment_points(a) == [(1, 7), (2, 6)]
+    assert obj_manager.get_valid_attachment_points(b) == [(2, 4), (2, 3), (2, 2)]
+    obj_manager.draw_edge(a, b)
+    assert obj_manager.edges[-1].cells.to_pairs() == [[2, 6], [2, 5], [2, 4], [1, 4], [1, 3], [2, 3]]
+
+def test_adjacent_points_beat_any_other_pair():
+    # Sender point (0, 1) leads straight into receiver point (0, 2), for no more than the forced move
+    grid = Grid.create_from_txt("a · · b\n· · · ·\n· · · ·")
+    path = grid.find_manhattan_path_between_any([((0, 1), 'E'), ((1, 0), 'S')], [((0, 2), 'W'), ((1, 3), 'S')])
+    assert path == [(0, 1), (0, 2)]
+
+def test_passing_an_end_keeps_it_reachable():
+    # The only way to (3, 5) goes through the other candidate end (1, 5), from the north
+    grid = Grid.create_from_txt(
+        "· · · · · ·\n"
+        "· · · x · ·\n"
+        "x · · · · ·\n"
+        "x x x x · ·\n"
+        "x x · · · ·\n"
+        "x · · · x ·\n"
+        "· · · · · ·"
+    )
+    path = grid.find_manhattan_path_between_any([((0, 4), 'E')], [((1, 5), 'W'), ((6, 2), 'S'), ((3, 5), 'S')])
+    assert path == grid.find_manhattan_path_between_any([((0, 4), 'E')], [((3, 5), 'S')])
+    assert path == [(0, 4), (0, 5), (1, 5), (2, 5), (2, 4), (3, 4), (4, 4), (4, 5), (3, 5)]
+
+def test_goal_reached_again_after_passing_it():
+    # The cheapest ways into f pass its other attachment points first
+    def node(id, row, col):
+        return {"id": id, "row": row, "col": col, "width": 1, "height": 1}
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [node("a", 0, 0), node("zz", 5, 5), node("b", 4, 0), node("c", 3, 4), node("d", 4, 2),
+                  node("e", 0, 3), node("f", 2, 2), node("g", 1, 5), node("h", 2, 0)],
+        "edges": [],
+    })
+    obj_manager.draw_edge(obj_manager.get_node("g"), obj_manager.get_node("f"))
+    path = obj_manager.edges[-1].cells.to_pairs()
+    assert path[0] == [1, 4] and path[-1] in ([1, 2], [2, 1], [2, 3], [3, 2])
+    assert len(set(map(tuple, path))) == len(path)
+    assert obj_manager.make_grid().render_to_flow_txt() == obj_manager.grid.render_to_flow_txt()
@@ -0,0 +1,73 @@
+import random
+import pytest
+from src.classes.cell import CellType
+from src.classes.grid import Grid, ROUTING_BACKENDS
+
+def random_grid(rng, height, width, density):
+    grid = Grid(width, height)
+    for r in range(height):
+        for c in range(width):
+            if rng.random() < density:
+                grid.set_cell(r, c, CellType.NODE, occupant_id="x")
+    return grid
+
+def is_valid_path(grid, path, start, end):
+    steps = zip(path, path[1:])
+    return (
+        path[0] == start and path[-1] == end
+        and all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in steps)
+        and all(grid.is_cell_empty(r, c) for r, c in path[1:-1])
+        and len(set(path)) == len(path)
+    )
+
+@pytest.mark.parametrize("backend", ["bidirectional", "jump_point"])
+def test_as_short_as_astar_without_bend_costs(backend):
+    rng = random.Random(11)
+    found = 0
+    for _ in range(300):
+        grid = random_grid(rng, rng.randint(3, 12), rng.randint(3, 12), rng.random() * 0.4)
+        empty = grid.get_all_empty_cells()
+        if len(empty) < 2:
+            continue
+        start, end = rng.sample(empty, 2)
+        start_dir, end_dir = rng.choice("NSEW"), rng.choice("NSEW")
+        expected = grid.find_manhattan_path_with_forced_ends(start, end, start_dir, end_dir, bend_cost=0)
+        path = grid.find_manhattan_path_with_forced_ends(start, end, start_dir, end_dir, backend=backend)
+        assert len(path) == len(expected)
+        if path:
+            found += 1
+            assert is_valid_path(grid, path, start, end)
+    assert found
+
+@pytest.mark.parametrize("backend", ROUTING_BACKENDS)
+def test_forced_ends_and_walls(backend):
+    grid = Grid.create_from_txt(
+        "· · · · · · ·\n"
+        "· a · x · b ·\n"
+        "· · · x · · ·\n"
+        "· · · · · · ·"
+    )
+    # Leave a to the south, enter b from its south side, around the wall
+    path = grid.find_manhattan_path_with_forced_ends((2, 1), (2, 5), 'S', 'S', backend=backend)
+    assert path == [(2, 1), (3, 1), (3, 2), (3, 3), (3, 4), (3, 5), (2, 5)]
+
+def test_long_corridor_on_large_grid():
+    rng = random.Random(3)
+    grid = random_grid(rng, 120, 120, 0.15)
+    empty = grid.get_all_empty_cells()
+    checked = 0
+    for _ in range(5):
+        start, end = rng.sample(empty, 2)
+        expected = grid.find_manhattan_path_with_forced_ends(start, end, 'E', 'W', bend_cost=0)
+        for backend in ("bidirectional", "jump_point"):
+            path = grid.find_manhattan_path_with_forced_ends(start, end, 'E', 'W', backend=backend)
+            assert len(path) == len(expected)
+        checked += bool(expected)
+    assert checked
+
+def test_unknown_backend_and_crossings():
+    grid = Grid(5, 5)
+    with pytest.raises(ValueError):
+        grid.find_manhattan_path_with_forced_ends((0, 0), (4, 4), 'E', 'W', backend="dijkstra")
+    with pytest.raises(ValueError):
+        grid.find_manhattan_path_with_forced_ends((0, 0), (4, 4), 'E', 'W', crossing_cost=3, backend="jump_point")
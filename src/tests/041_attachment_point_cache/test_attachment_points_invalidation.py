@@ -0,0 +1,61 @@
+import random
+from src.benchmarks.canvas_generator import generate_canvas
+from src.classes.object_manager import ObjectManager
+from src.classes.cell import CellType
+
+def make_two_nodes():
+    obj_manager = ObjectManager.create_from_JSON({
+        "nodes": [
+            {"id": "a", "row": 2, "col": 2, "width": 1, "height": 1},
+            {"id": "b", "row": 2, "col": 10, "width": 1, "height": 1},
+        ],
+        "edges": [],
+    })
+    obj_manager._grow_grid_to(5, 13)
+    return obj_manager
+
+def test_only_nodes_near_a_change_are_dropped():
+    obj_manager = make_two_nodes()
+    a, b = obj_manager.get_node("a"), obj_manager.get_node("b")
+    assert sorted(obj_manager.get_valid_attachment_points(a)) == [(1, 2), (2, 1), (2, 3), (3, 2)]
+    obj_manager.get_valid_attachment_points(b)
+    cache = obj_manager._attachment_points
+    assert "a" in cache and "b" in cache
+
+    # Breathing space of a's east point
+    obj_manager.grid.set_cell(2, 4, CellType.EDGE)
+    assert "a" not in cache and "b" in cache
+    assert sorted(obj_manager.get_valid_attachment_points(a)) == [(1, 2), (2, 1), (3, 2)]
+
+    # Three cells away from both nodes
+    obj_manager.grid.set_cell(2, 6, CellType.EDGE)
+    assert "a" in cache and "b" in cache
+
+def test_line_insertions_clear_everything():
+    obj_manager = make_two_nodes()
+    for node in obj_manager.nodes:
+        obj_manager.get_valid_attachment_points(node)
+    obj_manager.add_row_to_start()
+    assert "a" not in obj_manager._attachment_points
+    assert sorted(obj_manager.get_valid_attachment_points(obj_manager.get_node("a"))) == [(2, 2), (3, 1), (3, 3), (4, 2)]
+
+def test_removed_node_is_dropped():
+    obj_manager = make_two_nodes()
+    obj_manager.get_valid_attachment_points(obj_manager.get_node("a"))
+    obj_manager.remove_node("a")
+    assert "a" not in obj_manager._attachment_points
+
+def test_cache_matches_recomputation_while_editing():
+    obj_manager = ObjectManager.create_from_JSON(generate_canvas(20, layout="dense", edge_length="short", seed=4))
+    rng = random.Random(4)
+    for _ in range(30):
+        for node in obj_manager.nodes:
+            assert obj_manager.get_valid_attachment_points(node) == obj_manager._find_valid_attachment_points(node)
+        nodes = list(obj_manager.nodes)
+        try:
+            if rng.random() < 0.6:
+                obj_manager.draw_edge(*rng.sample(nodes, 2), crossing_cost=3, make_space=rng.random() < 0.3)
+            elif obj_manager.edges:
+                obj_manager.remove_edge(rng.choice(list(obj_manager.edges)).id)
+        except ValueError:
+            pass